@@ -1,5 +1,14 @@
-from typing import List, Dict
-from trees.heap import Heap
+from typing import Any, Callable, List, Dict
+from trees.indexed_heap import IndexedHeap
+from trees.radix_heap import RadixHeap
+
+
+# graphs whose weights are all ints up to this are searched with a
+# RadixHeap, unless a queue is given. The graphs benchmark's --crossover
+# test has a RadixHeap take 0.6-0.8x the time of an IndexedHeap for max
+# weights up to 2^16, about the same at 2^20 to 2^24, and 1.5-1.8x from
+# 2^32 up, as entries move through more buckets the wider the keys are.
+RADIX_MAX_WEIGHT = 2**16
 
 
 def adj(E: List[List[int]], u: str) -> List[int]:
@@ -19,40 +28,74 @@ def adj(E: List[List[int]], u: str) -> List[int]:
     return res
 
 
-def dijkstra(V: List[str], E: List[List[int]], start: int) -> Dict:
+def dijkstra(V: List[str], E: List[List[int]], start: int,
+             queue: Callable[[], Any] | None = None,
+             radix_max_weight: int = RADIX_MAX_WEIGHT) -> Dict:
     """
     Dijkstra's algorithm implemented with a priority queue.
 
     Time:
-        O(E*insert + V*pop)
-        -> O(ElogV + VlogV) using basic binary heap
-        -> O(E + VlogV) with a fibonacci heap
+        O(V*push + E*decrease_key + V*pop)
+        -> O(ElogV + VlogV) using an indexed binary heap
+        -> O(E + VlogV) with a fibonacci heap, which a pairing heap's
+           cheap decrease_key gets close to in practice
+        -> O(E + VlogC) with a radix heap, for int weights up to C
 
     Args:
         V: A list of vertex labels.
         E: An adjacency matrix stored as a nested list.
         start: The index of the node to search from.
+        queue: Makes the priority queue, e.g. IndexedHeap, PairingHeap,
+            or lambda: DaryHeap(4, indexed=True). The queue must support
+            len, push(vertex, cost) returning a handle, pop() returning
+            (cost, vertex), and decrease_key(handle, cost). Defaults to a
+            RadixHeap if every weight is an int up to radix_max_weight,
+            and to an IndexedHeap otherwise.
+        radix_max_weight: The largest weight to use a RadixHeap for.
     """
-    Q = Heap([(0, start)])  # (cost, vertex)
+    if queue is None:
+        queue = choose_queue(E, radix_max_weight)
+
+    Q = queue()  # at most one entry per vertex
+    handles = {start: Q.push(start, 0)}  # vertex -> handle in Q
+    cost = {start: 0}  # vertex -> cost so far
     fin = {}  # vertex -> min cost
 
-    # iterations equal to no. of possible fin states
-    # V iterations for the standard algorithm
+    # V iterations, as every vertex is popped at most once
     while Q:
         uc, u = Q.pop()
-
-        if V[u] in fin:
-            continue
-
         fin[V[u]] = uc
 
         for v in adj(E, u):
+            if V[v] in fin:
+                continue
             du = uc + E[u][v]
-            Q.insert((du, v))
+            if v not in handles:
+                handles[v] = Q.push(v, du)
+                cost[v] = du
+            elif du < cost[v]:
+                Q.decrease_key(handles[v], du)
+                cost[v] = du
 
     return fin
 
 
+def choose_queue(E: List[List[int]],
+                 radix_max_weight: int = RADIX_MAX_WEIGHT) -> Callable:
+    """
+    Picks the priority queue for dijkstra: a RadixHeap if every weight is
+    an int up to radix_max_weight, as costs then only ever grow by small
+    integer steps, and an IndexedHeap otherwise.
+
+    Time: O(V^2)
+    """
+    for row in E:
+        for w in row:
+            if type(w) is not int or not 0 <= w <= radix_max_weight:
+                return IndexedHeap
+    return RadixHeap
+
+
 if __name__ == "__main__":
 
     V = ["a", "b", "c", "d"]
@@ -1,5 +1,5 @@
 from typing import List, Tuple, Dict
-from heapq import heappush, heappop
+from trees.indexed_heap import IndexedHeap
 
 
 def min_cut(V: List[int], E: List[List[int]], a: int) -> int:
@@ -20,7 +20,7 @@ def min_cut(V: List[int], E: List[List[int]], a: int) -> int:
     for s in V:
         merges[s] = [s]
     for i in range(len(V)-1):
-        V, E, cut, merges, size = min_cut_phase(V, E, a, merges)
+        V, E, cut, merges = min_cut_phase(V, E, a, merges)
         s, t, wt = cut
         print(f"iter {i}/{len(E)}: s={s} t={t} cut={wt}")
         if mincut == -1 or wt < mincut:
@@ -34,7 +34,7 @@ def min_cut_phase(V: List[int], E: List[List[int]],
     Time: O(E+VlogV)
     """
     A = [a]
-    H = []
+    H = IndexedHeap()  # vertex -> -(weight of edges into A)
 
     # initialise heap
     for v in V:
@@ -42,23 +42,21 @@ def min_cut_phase(V: List[int], E: List[List[int]],
             continue
         w = E[v][a]
         if w > 0:
-            heappush(H, (-w, v))
+            H.push(v, -w)
 
     while set(A) != set(V):
         # add the most "tightly connected" node to A
-        w, u = heappop(H)
+        w, u = H.pop()
         A += [u]
 
         # update weights in heap to include edges going to u
         for v, wv in enumerate(E[u]):
             if wv == 0 or v in A:
                 continue
-            wh = 0
-            for wt, k in H:
-                if k == v:
-                    wh = wt
-                    break
-            heappush(H, (wh-E[u][v], v))
+            if v in H:
+                H.decrease_key(v, H.key(v) - wv)
+            else:
+                H.push(v, -wv)
 
     s, t = A[-2], A[-1]  # cut of the phase
 
@@ -0,0 +1,80 @@
+import pytest
+import random
+from graphs.dijkstra import RADIX_MAX_WEIGHT, choose_queue, dijkstra
+from graphs.stoer_wagner import min_cut
+from trees.dary_heap import DaryHeap
+from trees.indexed_heap import IndexedHeap
+from trees.pairing_heap import PairingHeap
+from trees.radix_heap import RadixHeap
+
+
+def reference_costs(V, E, start):
+    """
+    Dijkstra's algorithm with a linear scan for the closest vertex.
+    """
+    dist = {start: 0}
+    fin = {}
+    while dist:
+        u = min(dist, key=dist.get)
+        fin[V[u]] = dist.pop(u)
+        for v, w in enumerate(E[u]):
+            if w > 0 and V[v] not in fin:
+                if v not in dist or fin[V[u]] + w < dist[v]:
+                    dist[v] = fin[V[u]] + w
+    return fin
+
+
+def random_graph(v, p, max_weight):
+    V = [f"v{i}" for i in range(v)]
+    E = [[random.randint(1, max_weight) if i != j and random.random() < p
+          else 0 for j in range(v)] for i in range(v)]
+    return V, E
+
+
+@pytest.mark.parametrize("queue", [
+    None,
+    IndexedHeap,
+    PairingHeap,
+    RadixHeap,
+    lambda: DaryHeap(4, "q", indexed=True)
+], ids=["default", "indexed", "pairing", "radix", "dary"])
+def test_dijkstra(queue):
+    for p in [0.05, 0.3, 1.0]:
+        V, E = random_graph(100, p, 50)
+        start = random.randrange(100)
+        assert dijkstra(V, E, start, queue) == reference_costs(V, E, start)
+
+
+def test_dijkstra_float_weights():
+    V, E = random_graph(100, 0.2, 50)
+    E = [[w / 7 for w in row] for row in E]
+    expected = reference_costs(V, E, 0)
+    result = dijkstra(V, E, 0)
+    assert result.keys() == expected.keys()
+    assert all(result[v] == pytest.approx(expected[v]) for v in expected)
+
+
+def test_choose_queue():
+    assert choose_queue([[0, 1], [RADIX_MAX_WEIGHT, 0]]) is RadixHeap
+    assert choose_queue([[0, 1], [RADIX_MAX_WEIGHT + 1, 0]]) is IndexedHeap
+    assert choose_queue([[0, 1.0], [1, 0]]) is IndexedHeap
+    assert choose_queue([[0, 2**20]], radix_max_weight=2**20) is RadixHeap
+
+
+def test_min_cut():
+    V = [0, 1, 2, 3]
+    E = [[0, 0, 0, 0] for _ in V]
+    for u, v, w in [(0, 1, 3), (0, 2, 1), (1, 2, 1), (2, 3, 5)]:
+        E[u][v] = E[v][u] = w
+    assert min_cut(V, E, 0) == 2
+
+
+def test_min_cut_two_cliques():
+    # two triangles of heavy edges, joined by two light ones
+    V = list(range(6))
+    E = [[0] * 6 for _ in V]
+    edges = [(0, 1, 10), (1, 2, 10), (0, 2, 10), (3, 4, 10), (4, 5, 10),
+             (3, 5, 10), (2, 3, 1), (0, 5, 2)]
+    for u, v, w in edges:
+        E[u][v] = E[v][u] = w
+    assert min_cut(V, E, 0) == 3
@@ -0,0 +1,233 @@
+"""
+Graphs benchmark suite.
+
+Times Dijkstra's algorithm with each of the priority queues it can be
+given, on dense graphs where most edges relax a vertex which is already
+queued, so that decrease-keys dominate.
+
+    python -m graphs.test_graphs_performance
+    python -m graphs.test_graphs_performance --sizes 250 1000
+    python -m graphs.test_graphs_performance --radix --edges 100000
+    python -m graphs.test_graphs_performance --crossover
+"""
+
+import argparse
+import math
+import random
+import sys
+import timeit
+from graphs.dijkstra import adj, dijkstra
+from trees.dary_heap import DaryHeap
+from trees.heap import Heap
+from trees.indexed_heap import IndexedHeap
+from trees.pairing_heap import PairingHeap
+from trees.radix_heap import RadixHeap
+
+
+DEFAULT_SIZES = [250, 500, 1000]
+DEFAULT_EDGES = [10**5, 10**6]
+CROSSOVER_BITS = [4, 8, 12, 16, 20, 24, 32, 48, 62]
+CROSSOVER_VERTICES = 50000
+CROSSOVER_DEGREE = 8
+
+
+def queues():
+    return [
+        ("IndexedHeap", IndexedHeap),
+        ("DaryHeap (d=4)", lambda: DaryHeap(4, "q", indexed=True)),
+        ("DaryHeap (d=8)", lambda: DaryHeap(8, "q", indexed=True)),
+        ("PairingHeap", PairingHeap),
+        ("RadixHeap", RadixHeap)
+    ]
+
+
+def dense_graph(v, max_weight=1000):
+    """
+    A complete directed graph on v vertices, as an adjacency matrix with
+    random weights in [1, max_weight].
+    """
+    return [[random.randint(1, max_weight) if i != j else 0
+             for j in range(v)] for i in range(v)]
+
+
+def decrease_key_graph(v):
+    """
+    A complete directed graph on v vertices, as an adjacency matrix, in
+    which vertex i is settled at cost i through the edge i-1 -> i, and
+    every vertex settled lowers the cost of all the vertices after it.
+    """
+    E = [[0] * v for _ in range(v)]
+    for i in range(v):
+        for j in range(v):
+            if j == i + 1:
+                E[i][j] = 1
+            elif j != i:
+                E[i][j] = 2 * v - 2 * i + random.randint(0, 1)
+    return E
+
+
+GRAPHS = {
+    "random": dense_graph,
+    "decrease-key": decrease_key_graph,
+}
+
+
+class CountingHeap(IndexedHeap):
+
+    def __init__(self):
+        super().__init__()
+        self.decrease_keys = 0
+
+    def decrease_key(self, item, key):
+        self.decrease_keys += 1
+        super().decrease_key(item, key)
+
+
+def run_dijkstra(sizes, graphs):
+    print("\nBegin Dijkstra test on dense graphs (best time of three)\n")
+    print("Queue".ljust(20), "Graph".ljust(14), "Vertices".ljust(10),
+          "Edges".ljust(10), "Decrease-keys".ljust(15), "Time (s)")
+    for graph, n in ((g, n) for g in graphs for n in sizes):
+        V = list(range(n))
+        E = GRAPHS[graph](n)
+
+        counter = []
+
+        def counting_queue():
+            counter.append(CountingHeap())
+            return counter[-1]
+
+        expected = dijkstra(V, E, 0, counting_queue)
+        decrease_keys = counter[-1].decrease_keys
+
+        for name, queue in queues():
+            assert dijkstra(V, E, 0, queue) == expected
+            ti = min(timeit.repeat(lambda: dijkstra(V, E, 0, queue),
+                                   number=1, repeat=3))
+            print(name.ljust(20), graph.ljust(14), str(n).ljust(10),
+                  str(n * (n - 1)).ljust(10), str(decrease_keys).ljust(15),
+                  round(ti, 6))
+
+
+def lazy_heap_dijkstra(V, E, start):
+    """
+    Dijkstra's algorithm with trees.heap.Heap, which can't decrease keys,
+    so a vertex is pushed again every time its cost improves.
+    """
+    Q = Heap([(0, start)])
+    fin = {}
+    while Q:
+        uc, u = Q.pop()
+        if V[u] in fin:
+            continue
+        fin[V[u]] = uc
+        for v in adj(E, u):
+            if V[v] not in fin:
+                Q.insert((uc + E[u][v], v))
+    return fin
+
+
+def run_radix(edge_counts, max_weight):
+    print("\nBegin integer weights test (best time of three)")
+    print(f"Weights: 1 to {max_weight}\n")
+    print("Queue".ljust(28), "Vertices".ljust(10), "Edges".ljust(10),
+          "Time (s)")
+    for e in edge_counts:
+        n = math.isqrt(e) + 1
+        V = list(range(n))
+        E = dense_graph(n, max_weight)
+
+        runs = [
+            ("trees.heap.Heap (lazy)", lambda: lazy_heap_dijkstra(V, E, 0)),
+            ("IndexedHeap", lambda: dijkstra(V, E, 0, IndexedHeap)),
+            ("RadixHeap", lambda: dijkstra(V, E, 0, RadixHeap)),
+            ("default (choose_queue)", lambda: dijkstra(V, E, 0))
+        ]
+        expected = lazy_heap_dijkstra(V, E, 0)
+        for name, f in runs:
+            assert f() == expected
+            ti = min(timeit.repeat(f, number=1, repeat=3))
+            print(name.ljust(28), str(n).ljust(10), str(n * (n - 1)).ljust(10),
+                  round(ti, 6))
+
+
+def queue_workload(queue, max_weight, targets, fracs, degree):
+    """
+    The queue operations of Dijkstra's algorithm on a random sparse
+    graph, without the adjacency matrix scans which dominate dijkstra
+    itself: every vertex popped relaxes degree random vertices, over
+    edges with weights in [1, max_weight].
+    """
+    Q = queue()
+    Q.push(0, 0)
+    cost = {0: 0}
+    fin = set()
+    i = 0
+    while Q:
+        c, u = Q.pop()
+        fin.add(u)
+        for j in range(i, i + degree):
+            v = targets[j]
+            if v in fin:
+                continue
+            d = c + 1 + int(fracs[j] * max_weight)
+            if v not in cost:
+                Q.push(v, d)
+                cost[v] = d
+            elif d < cost[v]:
+                Q.decrease_key(v, d)
+                cost[v] = d
+        i += degree
+
+
+def run_crossover(bits_list, n=CROSSOVER_VERTICES,
+                  degree=CROSSOVER_DEGREE):
+    """
+    Finds the largest weight for which a RadixHeap beats an IndexedHeap,
+    which sets dijkstra's RADIX_MAX_WEIGHT.
+    """
+    print("\nBegin radix heap crossover test (best time of five)")
+    print(f"Vertices: {n}, each relaxing {degree} random vertices\n")
+    print("Max weight".ljust(14), "IndexedHeap (s)".ljust(18),
+          "RadixHeap (s)".ljust(16), "Ratio")
+    targets = [random.randrange(n) for _ in range(n * degree)]
+    fracs = [random.random() for _ in range(n * degree)]
+    for bits in bits_list:
+        times = [min(timeit.repeat(
+            lambda: queue_workload(queue, 2**bits, targets, fracs, degree),
+            number=1, repeat=5)) for queue in (IndexedHeap, RadixHeap)]
+        print(f"2^{bits}".ljust(14), str(round(times[0], 6)).ljust(18),
+              str(round(times[1], 6)).ljust(16),
+              round(times[1] / times[0], 2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Graphs benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="numbers of vertices to run")
+    parser.add_argument("--graphs", nargs="+", choices=list(GRAPHS),
+                        default=list(GRAPHS))
+    parser.add_argument("--radix", action="store_true",
+                        help="run only the integer weights test")
+    parser.add_argument("--edges", type=int, nargs="+", default=DEFAULT_EDGES,
+                        help="numbers of edges for the integer weights test")
+    parser.add_argument("--max-weight", type=int, default=100,
+                        help="largest weight for the integer weights test")
+    parser.add_argument("--crossover", action="store_true",
+                        help="run only the radix heap crossover test")
+    parser.add_argument("--crossover-bits", type=int, nargs="+",
+                        default=CROSSOVER_BITS,
+                        help="log2 of the max weights for the crossover test")
+    args = parser.parse_args(argv)
+
+    if args.crossover:
+        run_crossover(args.crossover_bits)
+        return 0
+    if not args.radix:
+        run_dijkstra(args.sizes, args.graphs)
+    run_radix(args.edges, args.max_weight)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
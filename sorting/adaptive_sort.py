@@ -0,0 +1,195 @@
+"""
+An adaptive sort which looks at a cheap sample of its input before
+deciding which of the sorting engines to hand it to.
+"""
+
+import math
+import random
+from typing import Any, Callable, List, NamedTuple, Tuple
+from sorting.merge_sort import merge_sort_bottom_up
+from sorting.quicksort import introsort
+from sorting.radix_sort import np, radix_sort_numpy, radix_sort_vectorized
+
+
+# number of items (and adjacent pairs) looked at to profile the input
+SAMPLE_SIZE = 256
+
+# inputs up to this size are merge sorted, which insertion sorts them
+SMALL_INPUT = 64
+
+# above this fraction of ordered adjacent pairs, the input is taken to be
+# made of a few long runs
+PRESORTED_RATIO = 0.95
+
+# at most this fraction of distinct values in the sample means there
+# are few unique values, which three-way partitioning handles in O(n)
+FEW_UNIQUE_RATIO = 1 / 8
+
+# cost of one radix pass per item, relative to one level of a comparison
+# sort per item, as measured on the pure-Python engines
+RADIX_PASS_COST = 4
+
+
+class SortDecision(NamedTuple):
+    """
+    The profile of an input to `sort`, and the algorithm it was sent to.
+    lo and hi are None when the decision didn't need the input's range.
+    fallback is the reason the profile's first choice of a radix sort
+    couldn't sort the input, which then went to introsort instead.
+    """
+    algorithm: str
+    n: int
+    lo: Any
+    hi: Any
+    runs: int
+    duplicate_ratio: float
+    fallback: str | None = None
+
+
+def sort(lst: List[Any],
+         hook: Callable[[SortDecision], None] | None = None) -> List[Any]:
+    """
+    Sorts lst with whichever engine should suit it best:
+        * merge_sort_bottom_up for small inputs, and inputs that are a
+          single sorted or reversed run;
+        * radix_sort_numpy for any other integers, if NumPy is
+          available;
+        * merge_sort_bottom_up for inputs made of at most about log(n)
+          runs, or mostly of sorted or reversed runs;
+        * introsort for inputs with few unique values, or which are not
+          all integers;
+        * radix sort for integers whose range needs few digit passes
+          compared to log(n), with base 64 or 256, whichever needs
+          fewer passes;
+        * introsort otherwise, or when the radix sort picked from the
+          sample finds items which aren't (64-bit, for NumPy) integers.
+
+    The profile looks at a random sample of SAMPLE_SIZE items and
+    adjacent triples, plus the min and max of the input when it comes
+    down to the pure-Python radix sort.
+
+    Time: O(nlogn)
+
+    Args:
+        hook: Called once the input is sorted, with the SortDecision of
+            the engine that actually sorted it, e.g. to log or audit it.
+
+    Returns:
+        The sorted list. This may be lst itself, sorted in place.
+    """
+    n = len(lst)
+    if n <= 1:
+        return lst
+
+    decision = choose_algorithm(lst)
+    res, fallback = run_algorithm(lst, decision.algorithm)
+    if fallback is not None:
+        decision = decision._replace(algorithm="introsort",
+                                     fallback=fallback)
+    if hook:
+        hook(decision)
+    return res
+
+
+def run_algorithm(lst: List[Any], algorithm: str) -> Tuple[List[Any],
+                                                           str | None]:
+    """
+    Sorts lst with the engine named by algorithm, or with introsort if
+    it is a radix sort and lst turns out not to suit it.
+
+    Returns:
+        (the sorted list, the reason for falling back, or None)
+    """
+    if algorithm == "merge_sort_bottom_up":
+        return merge_sort_bottom_up(lst), None
+    if algorithm == "introsort":
+        return introsort(lst), None
+
+    if algorithm == "radix_sort_numpy":
+        try:
+            arr = np.asarray(lst)
+        except ValueError:
+            arr = None
+        if arr is not None and arr.dtype.kind in "iu" and arr.ndim == 1:
+            return radix_sort_numpy(arr).tolist(), None
+        # the sample was all ints, but the rest of the input isn't, or
+        # doesn't fit in 64 bits
+        return introsort(lst), "not all 64-bit ints"
+
+    b = 64 if algorithm == "radix_sort_base_64" else 256
+    try:
+        return radix_sort_vectorized(lst, b), None
+    except TypeError:
+        # the sample was all ints, but the rest of the input isn't
+        return introsort(lst), "not all ints"
+
+
+def choose_algorithm(lst: List[Any]) -> SortDecision:
+    """
+    Profiles lst and picks the algorithm `sort` should use for it.
+
+    Time: O(SAMPLE_SIZE), or O(n) when integers need their min and max
+    """
+    n = len(lst)
+
+    # estimate the number of runs from the changes of direction over a
+    # sample of adjacent triples, and count the directions of its pairs
+    triples = random.sample(range(max(n - 2, 0)), min(max(n - 2, 0),
+                                                      SAMPLE_SIZE))
+    descending = changes = 0
+    for i in triples:
+        a, b, c = lst[i], lst[i + 1], lst[i + 2]
+        descent = b < a
+        descending += descent
+        changes += (c < b) != descent
+    ascending = len(triples) - descending
+    runs = 1 + round((n - 2) * changes / len(triples)) if triples else 1
+
+    # the first item of each triple is a random sample of the items
+    sample = [lst[i] for i in triples] or lst
+    duplicate_ratio = 1 - len(set(sample)) / len(sample)
+
+    def decide(algorithm: str, lo: Any = None,
+               hi: Any = None) -> SortDecision:
+        return SortDecision(algorithm, n, lo, hi, runs, duplicate_ratio)
+
+    if n <= SMALL_INPUT:
+        return decide("merge_sort_bottom_up")
+    if changes == 0 and max(ascending, descending) == len(triples):
+        # a single sorted or reversed run, which merge sort just scans
+        return decide("merge_sort_bottom_up")
+
+    all_ints = all(type(x) is int for x in sample)
+    if np is not None and all_ints:
+        # the NumPy radix sort is O(n) in C, which beats merging any
+        # number of runs, and three-way partitioning few unique values.
+        # Whether the input fits in 64 bits is only found out when it is
+        # converted.
+        return decide("radix_sort_numpy")
+
+    if runs <= n.bit_length() \
+            or max(ascending, descending) >= PRESORTED_RATIO * len(triples):
+        return decide("merge_sort_bottom_up")
+    if 1 - duplicate_ratio <= FEW_UNIQUE_RATIO or not all_ints:
+        return decide("introsort")
+
+    # only the radix sorts need the range, which takes a full pass
+    lo, hi = min(lst), max(lst)
+    if type(lo) is int and type(hi) is int:
+        bits = (hi - lo).bit_length()
+        passes = min(math.ceil(bits / 6), math.ceil(bits / 8))
+        if RADIX_PASS_COST * passes < n.bit_length():
+            return decide(radix_base(lo, hi), lo, hi)
+
+    return decide("introsort", lo, hi)
+
+
+def radix_base(lo: int, hi: int) -> str:
+    """
+    The radix sort, base 64 or 256, which needs fewer passes over the
+    range [lo, hi].
+    """
+    bits = (hi - lo).bit_length()
+    if math.ceil(bits / 6) <= math.ceil(bits / 8):
+        return "radix_sort_base_64"
+    return "radix_sort_base_256"
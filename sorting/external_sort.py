@@ -0,0 +1,243 @@
+"""
+External merge sort, for files of integers too large to sort in memory.
+
+The input is read in chunks that fit in the memory budget, each chunk is
+sorted with one of the in-memory algorithms and written to a temporary
+run file. Runs are then k-way merged through a heap, at most fan_in at a
+time, pass after pass, until a single sorted output remains.
+"""
+
+import itertools
+import mmap
+import os
+import tempfile
+from array import array
+from typing import Callable, Iterator, List, NamedTuple
+from trees.heap import Heap
+from sorting.radix_sort import radix_sort_base_256
+
+
+# rough number of bytes a single int costs while a chunk is being sorted:
+# the int object, its slot in the list and the sort's own buffers
+ITEM_MEMORY_COST = 96
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 64
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# text files are sorted through runs of 64-bit binary integers
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+class PassStats(NamedTuple):
+    """
+    I/O done by a single pass of the external sort. Pass 0 is the run
+    formation pass, every later pass is a merge pass.
+    """
+    pass_no: int
+    runs_in: int
+    runs_out: int
+    bytes_read: int
+    bytes_written: int
+
+
+def external_sort(in_path: str, out_path: str, typecode: str | None = "q",
+                  memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                  fan_in: int = DEFAULT_FAN_IN,
+                  sort_fn: Callable[[List[int]], List[int]] = radix_sort_base_256,
+                  tmp_dir: str | None = None) -> List[PassStats]:
+    """
+    Sorts the integers in the file at in_path into out_path, using
+    roughly memory_budget bytes of memory.
+
+    Time: O(nlogn) comparisons, and O(n*log_f(n/m)) I/O, where m is the
+        number of items per chunk and f is the fan-in.
+    Space: O(memory_budget) memory, O(n) temporary disk space
+
+    Args:
+        in_path: The file to sort.
+        out_path: Where to write the sorted file, in the same format.
+        typecode: An `array` typecode for files of fixed-width binary
+            integers in native byte order, or None for files with one
+            integer per line, which must fit in 64 bits.
+        memory_budget: The approximate number of bytes of memory to use.
+        fan_in: The maximum number of runs merged together at once.
+        sort_fn: The in-memory sort used on each chunk.
+        tmp_dir: Where to put the temporary run files.
+
+    Returns:
+        The bytes read and written by each pass.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+
+    run_typecode = typecode or "q"
+    itemsize = array(run_typecode).itemsize
+    chunk_items = max(1, memory_budget // (ITEM_MEMORY_COST + itemsize))
+    # each merge holds a read buffer per input run, plus one output buffer
+    buffer_size = max(itemsize, min(DEFAULT_BUFFER_SIZE,
+                                    memory_budget // (fan_in + 1)))
+
+    stats = []
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        names = (os.path.join(tmp, f"run{i}") for i in itertools.count())
+
+        # pass 0: sort chunks of the input into runs
+        runs = []
+        bytes_read = bytes_written = 0
+        with open(in_path, "rb") as f:
+            if typecode is None:
+                chunks = read_text_chunks(f, chunk_items)
+            else:
+                chunks = read_binary_chunks(f, typecode, chunk_items)
+            for chunk, n_bytes in chunks:
+                bytes_read += n_bytes
+                chunk = sort_fn(chunk)
+                # binary chunks already fit their own typecode
+                if typecode is None and chunk and not (
+                        INT64_MIN <= chunk[0] <= chunk[-1] <= INT64_MAX):
+                    raise ValueError("integers must fit in 64 bits")
+                run = next(names)
+                with open(run, "wb") as out:
+                    array(run_typecode, chunk).tofile(out)
+                bytes_written += os.path.getsize(run)
+                runs += [run]
+        stats += [PassStats(0, 1, len(runs), bytes_read, bytes_written)]
+
+        # merge passes: merge groups of up to fan_in runs into new runs,
+        # until they can all be merged straight into the output
+        pass_no = 1
+        while True:
+            final = len(runs) <= fan_in
+            bytes_read = bytes_written = 0
+            merged = []
+            for g in range(0, max(len(runs), 1), fan_in):
+                group = runs[g:g + fan_in]
+                dest = out_path if final else next(names)
+                with open(dest, "wb") as out:
+                    n_read, n_written = merge_runs(
+                        group, out, run_typecode, buffer_size,
+                        text=final and typecode is None)
+                bytes_read += n_read
+                bytes_written += n_written
+                for run in group:
+                    os.remove(run)
+                merged += [dest]
+
+            stats += [PassStats(pass_no, len(runs), len(merged),
+                                bytes_read, bytes_written)]
+            if final:
+                return stats
+            runs = merged
+            pass_no += 1
+
+
+def read_binary_chunks(f, typecode: str,
+                       chunk_items: int) -> Iterator[tuple]:
+    """
+    Reads a file of fixed-width binary integers in chunks of chunk_items.
+
+    Yields:
+        (chunk, bytes read) pairs, where chunk is a list of ints.
+    """
+    itemsize = array(typecode).itemsize
+    while True:
+        data = f.read(chunk_items * itemsize)
+        if not data:
+            return
+        if len(data) % itemsize:
+            raise ValueError("file size is not a multiple of the item size")
+        chunk = array(typecode)
+        chunk.frombytes(data)
+        yield chunk.tolist(), len(data)
+
+
+def read_text_chunks(f, chunk_items: int) -> Iterator[tuple]:
+    """
+    Reads a file with one integer per line in chunks of chunk_items.
+    Blank lines are skipped.
+
+    Yields:
+        (chunk, bytes read) pairs, where chunk is a list of ints.
+    """
+    while True:
+        lines = list(itertools.islice(f, chunk_items))
+        if not lines:
+            return
+        chunk = [int(line) for line in lines if not line.isspace()]
+        yield chunk, sum(map(len, lines))
+
+
+def read_run(path: str, typecode: str, buffer_size: int,
+             counter: List[int]) -> Iterator[int]:
+    """
+    Iterates over the integers in a binary run file, which is memory
+    mapped and decoded buffer_size bytes at a time. The number of bytes
+    read is added to counter[0].
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    step = buffer_size - buffer_size % array(typecode).itemsize
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for off in range(0, size, step):
+            block = array(typecode)
+            block.frombytes(mm[off:off + step])
+            counter[0] += len(block) * block.itemsize
+            yield from block
+
+
+def merge_runs(runs: List[str], out, typecode: str, buffer_size: int,
+               text: bool = False) -> tuple:
+    """
+    k-way merges sorted run files into the open file out, using a heap
+    holding the next item of each run. Output is buffered, and written
+    as binary integers or, if text is set, one integer per line.
+
+    Time: O(nlogk), where n is the total number of items and k = len(runs)
+
+    Returns:
+        (bytes read, bytes written)
+    """
+    counter = [0]
+    readers = [read_run(run, typecode, buffer_size, counter) for run in runs]
+
+    heap = Heap()
+    for i, reader in enumerate(readers):
+        for x in reader:
+            heap.insert((x, i))
+            break
+
+    itemsize = array(typecode).itemsize
+    flush_at = max(1, buffer_size // itemsize)
+    written = 0
+    buf = array(typecode)
+    while heap:
+        x, i = heap.pop()
+        buf.append(x)
+        for nxt in readers[i]:
+            heap.insert((nxt, i))
+            break
+
+        if len(buf) >= flush_at:
+            written += write_block(out, buf, text)
+            buf = array(typecode)
+    written += write_block(out, buf, text)
+
+    return counter[0], written
+
+
+def write_block(out, block: array, text: bool) -> int:
+    """
+    Writes a block of integers to out, returning the number of bytes.
+    """
+    if not block:
+        return 0
+    if text:
+        data = ("\n".join(map(str, block)) + "\n").encode()
+    else:
+        data = block.tobytes()
+    out.write(data)
+    return len(data)
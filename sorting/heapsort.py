@@ -1,8 +1,8 @@
-from typing import List
-from trees.heap import Heap
+from typing import Any, Callable, List
 
 
-def heapsort(lst: List[int]) -> List[int]:
+def heapsort(lst: List[Any],
+             key: Callable[[Any], Any] | None = None) -> List[Any]:
     """
     Heapsort sorts a list by first turning into a Max-heap. It then
     swaps the largest element with the last in the heap, meaning it
@@ -10,17 +10,116 @@ def heapsort(lst: List[int]) -> List[int]:
     is then restored, and this routine is repeated until all elements
     have been processed.
 
+    The heap is built in place over the list itself, so no memory is
+    allocated beyond a few variables. If key is given, it is called once
+    per item, and the keys are sorted alongside the items.
+
     Time: O(nlogn)
-    Space: O(1) auxiliary
-    """
-    heap = Heap(lst, lambda a, b: a > b)
-    back = len(heap) - 1
-    while back > 0:
-        # swap the first (largest) element with the last in the heap
-        heap.heap[back], heap.heap[0] = heap.heap[0], heap.heap[back]
-        # sink the new first element until heap invariant is restored
-        heap.sink(0, back)
-        # decrease the back counter, as we are done with this element
-        back -= 1
-
-    return heap.heap
+    Space: O(1) auxiliary, O(n) with a key
+
+    Returns:
+        lst, sorted in place.
+    """
+    heapsort_range(lst, 0, len(lst), key)
+    return lst
+
+
+def heapsort_range(lst: List[Any], lo: int, hi: int,
+                   key: Callable[[Any], Any] | None = None) -> None:
+    """
+    Sorts lst[lo:hi] in place by building a Max-heap over that range of
+    the list. Used by heapsort, and by introsort as its worst-case
+    fallback.
+
+    The heap is built bottom-up (Floyd's method), sinking each internal
+    node from the last one up to the root, which takes O(k) rather than
+    the O(klogk) of k inserts. Each extracted maximum is replaced by
+    sift_down, which needs about half the comparisons of a plain sink.
+
+    With a key, the range is copied out into a list of items and a
+    parallel list of their keys, which are sifted together, so key is
+    called once per item rather than on every comparison.
+
+    Time: O(klogk), where k = hi - lo
+    Space: O(1) auxiliary, O(k) with a key
+    """
+    n = hi - lo
+    if key is not None:
+        vals = lst[lo:hi]
+        keys = [key(x) for x in vals]
+        for i in range(n // 2 - 1, -1, -1):
+            sift_down_key(keys, vals, i, n)
+        for back in range(n - 1, 0, -1):
+            keys[0], keys[back] = keys[back], keys[0]
+            vals[0], vals[back] = vals[back], vals[0]
+            sift_down_key(keys, vals, 0, back)
+        lst[lo:hi] = vals
+        return
+
+    for i in range(n // 2 - 1, -1, -1):
+        sift_down(lst, lo, i, n)
+
+    for back in range(n - 1, 0, -1):
+        # swap the largest element with the last in the heap, then restore
+        lst[lo], lst[lo + back] = lst[lo + back], lst[lo]
+        sift_down(lst, lo, 0, back)
+
+
+def sift_down(lst: List[Any], lo: int, idx: int, end: int) -> None:
+    """
+    Restores the Max-heap stored in lst[lo:lo+end] below heap index idx,
+    given that only the item at idx may be out of place.
+
+    Rather than comparing the item against both children at every level
+    (two comparisons per level), it first moves the hole at idx all the
+    way down to a leaf, promoting the larger child each time (one
+    comparison per level). The item, usually small since it came from
+    the bottom of the heap, is then raised back up from that leaf, which
+    rarely takes more than a level or two.
+
+    Time: O(logn)
+    """
+    item = lst[lo + idx]
+    start = idx
+
+    child = 2 * idx + 1
+    while child < end:
+        if child + 1 < end and lst[lo + child] < lst[lo + child + 1]:
+            child += 1
+        lst[lo + idx] = lst[lo + child]
+        idx = child
+        child = 2 * idx + 1
+
+    parent = (idx - 1) // 2
+    while idx > start and lst[lo + parent] < item:
+        lst[lo + idx] = lst[lo + parent]
+        idx = parent
+        parent = (idx - 1) // 2
+    lst[lo + idx] = item
+
+
+def sift_down_key(keys: List[Any], vals: List[Any], idx: int,
+                  end: int) -> None:
+    """
+    sift_down over a Max-heap of keys[:end], moving each item of vals
+    along with its key.
+
+    Time: O(logn)
+    """
+    item_key, item = keys[idx], vals[idx]
+    start = idx
+
+    child = 2 * idx + 1
+    while child < end:
+        if child + 1 < end and keys[child] < keys[child + 1]:
+            child += 1
+        keys[idx], vals[idx] = keys[child], vals[child]
+        idx = child
+        child = 2 * idx + 1
+
+    parent = (idx - 1) // 2
+    while idx > start and keys[parent] < item_key:
+        keys[idx], vals[idx] = keys[parent], vals[parent]
+        idx = parent
+        parent = (idx - 1) // 2
+    keys[idx], vals[idx] = item_key, item
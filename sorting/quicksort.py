@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Tuple
+from sorting.heapsort import heapsort_range
 
 
-def quicksort(lst: List[int]) -> List[int]:
+def quicksort(lst: List[int], in_place: bool = True) -> List[int]:
     """
     Quicksort sorts the list by repeatedly picking a 'pivot', and
     moving items less than the pivot to its left, and greater to the
@@ -9,17 +10,26 @@ def quicksort(lst: List[int]) -> List[int]:
     position. This procedure is then repeated recursively on the items
     to the left and right of it.
 
+    By default the list is sorted in place by introsort, which keeps
+    sorted, reversed and all-equal input at O(nlogn) time and O(logn)
+    stack. With in_place=False, the original version runs instead: it
+    pivots on the first item and copies both sides into new lists at
+    every level, so sorted input takes O(n^2) time and n levels of
+    recursion.
+
     Time (best/average case): O(nlogn)
-    Time (worst case): O(n^2)
-    Space: O(n)
+    Time (worst case): O(nlogn), or O(n^2) if not in_place
+    Space: O(logn), or O(n) if not in_place
     """
+    if in_place:
+        return introsort(lst)
     if len(lst) <= 1:
         return lst
 
     start_pivot_pos = pivot(lst)
     start_pivot = lst[start_pivot_pos]
-    sort_l = quicksort(lst[:start_pivot_pos])
-    sort_r = quicksort(lst[start_pivot_pos + 1:])
+    sort_l = quicksort(lst[:start_pivot_pos], in_place=False)
+    sort_r = quicksort(lst[start_pivot_pos + 1:], in_place=False)
     return sort_l + [start_pivot] + sort_r
 
 
@@ -44,3 +54,137 @@ def pivot(lst: List[int]) -> int:
     # so that it's now in the correct position
     lst[0], lst[swap_pos - 1] = lst[swap_pos - 1], lst[0]
     return swap_pos - 1
+
+
+INSERTION_SORT_CUTOFF = 16
+NINTHER_CUTOFF = 128
+
+
+def introsort(lst: List[int], lo: int = 0,
+              hi: int | None = None) -> List[int]:
+    """
+    In-place introsort of lst, or of lst[lo:hi] if given. Like
+    quicksort, it partitions around a pivot, but:
+        * the pivot is a median-of-three (or a ninther, for large
+          ranges), so sorted and reversed input stay O(nlogn);
+        * partitioning is three-way, so items equal to the pivot are
+          done with in a single pass, which handles many duplicates;
+        * small ranges are finished with insertion sort; and
+        * once the recursion goes deeper than 2*log2(n), the range is
+          handed over to heapsort, which bounds the worst case.
+    Only the smaller side of each partition is recursed on, and the
+    larger side is looped on, so the stack never exceeds O(logn).
+
+    Time: O(nlogn)
+    Space: O(logn)
+
+    Returns:
+        lst, sorted in place.
+    """
+    if hi is None:
+        hi = len(lst)
+    n = hi - lo
+    if n > 1:
+        _introsort(lst, lo, hi, 2 * n.bit_length())
+    return lst
+
+
+def _introsort(lst: List[int], lo: int, hi: int, depth: int) -> None:
+    """
+    Sorts lst[lo:hi] in place, switching to heapsort after depth more
+    levels of partitioning.
+    """
+    while hi - lo > INSERTION_SORT_CUTOFF:
+        if depth == 0:
+            heapsort_range(lst, lo, hi)
+            return
+        depth -= 1
+
+        p = lst[choose_pivot(lst, lo, hi)]
+        lt, gt = partition3(lst, lo, hi, p)
+
+        # recurse on the smaller side, loop on the larger one
+        if lt - lo < hi - gt:
+            _introsort(lst, lo, lt, depth)
+            lo = gt
+        else:
+            _introsort(lst, gt, hi, depth)
+            hi = lt
+
+    insertion_sort(lst, lo, hi)
+
+
+def choose_pivot(lst: List[int], lo: int, hi: int) -> int:
+    """
+    Picks the index of a pivot for lst[lo:hi]: the median of the first,
+    middle and last items, or for large ranges Tukey's ninther (the
+    median of three such medians).
+
+    Time: O(1)
+    """
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo < NINTHER_CUTOFF:
+        return median_of_three(lst, lo, mid, last)
+
+    step = (hi - lo) // 8
+    return median_of_three(
+        lst,
+        median_of_three(lst, lo, lo + step, lo + 2 * step),
+        median_of_three(lst, mid - step, mid, mid + step),
+        median_of_three(lst, last - 2 * step, last - step, last))
+
+
+def median_of_three(lst: List[int], i: int, j: int, k: int) -> int:
+    """
+    Returns whichever of the indices i, j and k holds the median value.
+    """
+    a, b, c = lst[i], lst[j], lst[k]
+    if a < b:
+        if b < c:
+            return j
+        return k if a < c else i
+    if a < c:
+        return i
+    return k if b < c else j
+
+
+def partition3(lst: List[int], lo: int, hi: int, p: int) -> Tuple[int, int]:
+    """
+    Three-way (Dutch national flag) partition of lst[lo:hi] around the
+    value p, so that items less than p come first, then items equal to
+    p, then items greater than p.
+
+    Time: O(n)
+
+    Returns:
+        (lt, gt) such that lst[lt:gt] holds exactly the items equal to p.
+    """
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        x = lst[i]
+        if x < p:
+            lst[lt], lst[i] = x, lst[lt]
+            lt += 1
+            i += 1
+        elif p < x:
+            gt -= 1
+            lst[gt], lst[i] = x, lst[gt]
+        else:
+            i += 1
+    return lt, gt
+
+
+def insertion_sort(lst: List[int], lo: int, hi: int) -> None:
+    """
+    Sorts lst[lo:hi] in place with insertion sort. Fast for small ranges.
+
+    Time: O(k^2), where k = hi - lo
+    """
+    for i in range(lo + 1, hi):
+        x = lst[i]
+        j = i - 1
+        while j >= lo and x < lst[j]:
+            lst[j + 1] = lst[j]
+            j -= 1
+        lst[j + 1] = x
@@ -1,16 +1,139 @@
 import math
+from array import array
 from typing import List
 
+try:
+    import numpy as np
+except ImportError:  # the vectorized backend is optional
+    np = None
+
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# ranges up to this size are counted directly rather than radix sorted
+NUMPY_COUNTING_SORT_MAX_RANGE = 1 << 16
+
+# digit width of the NumPy backend: its scatter costs a pass over the
+# keys per digit value, and 3 bits measured fastest at 1e5 to 1e6 keys
+NUMPY_DIGIT_BITS = 3
+
 
 def radix_sort_base_64(lst: List[int]) -> List[int]:
-    return radix_sort(lst, 64)
+    return radix_sort_vectorized(lst, 64)
 
 
 def radix_sort_base_256(lst: List[int]) -> List[int]:
-    return radix_sort(lst, 256)
+    return radix_sort_vectorized(lst, 256)
+
+
+def radix_sort_vectorized(lst, b: int):
+    """
+    Sorts with the NumPy backend (radix_sort_numpy) when NumPy is
+    installed and the values fit in a NumPy integer dtype, otherwise
+    falls back to the pure-Python radix_sort.
+
+    Lists are returned as lists. Other integer buffers (`array.array`,
+    `memoryview`, NumPy arrays) are returned as a NumPy array of the same
+    dtype when NumPy is available, and as a list when it isn't. The
+    NumPy backend always uses NUMPY_DIGIT_BITS wide digits, so b only
+    picks the base of the fallback.
+    """
+    if np is not None:
+        arr = np.asarray(lst)
+        if arr.dtype.kind in "iu" and arr.ndim == 1:
+            res = radix_sort_numpy(arr)
+            return res.tolist() if isinstance(lst, list) else res
+
+    if not isinstance(lst, list):
+        lst = lst.tolist()
+    return radix_sort(lst, b)
 
 
 def radix_sort(lst: List[int], b: int) -> List[int]:
+    """
+    Sorts a list of integers with LSD radix sort in base b.
+
+    Power-of-two bases whose values fit in a signed 64-bit integer go
+    through the array-backed engine (radix_sort_array). Any other base,
+    or values outside that range, go through the digit-list engine
+    (radix_sort_digits).
+
+    Time: O((n+b)*log_b(M)), where M is the range of the values
+    """
+    if len(lst) <= 1:
+        return lst
+
+    lo, hi = min(lst), max(lst)
+    if b & (b - 1) == 0 and lo >= INT64_MIN and hi <= INT64_MAX:
+        return radix_sort_array(lst, b.bit_length() - 1, lo, hi)
+    return radix_sort_digits(lst, b)
+
+
+def radix_sort_array(lst: List[int], bits: int,
+                     lo: int | None = None,
+                     hi: int | None = None) -> List[int]:
+    """
+    LSD radix sort over digits of `bits` bits each, i.e. base 2**bits.
+
+    Digits are pulled out of each key with a shift and a mask instead of
+    being converted into a list of digits. Keys are biased by the minimum
+    value, so negative numbers sort correctly and the number of passes
+    only depends on the range of the values. The values are moved between
+    two `array('q')` buffers which are reused across every pass, and a
+    pass is skipped entirely when all keys share the same digit.
+
+    Time: O((n+2^bits)*passes), where passes = ceil(log2(hi-lo+1)/bits)
+    Space: O(n+2^bits)
+
+    Args:
+        bits: The number of bits per digit.
+        lo: The minimum value of the list, if already known.
+        hi: The maximum value of the list, if already known.
+    """
+    n = len(lst)
+    if n <= 1:
+        return list(lst)
+
+    if lo is None or hi is None:
+        lo, hi = min(lst), max(lst)
+
+    src = array("q", lst)
+    dst = array("q", bytes(8 * n))
+    radix = 1 << bits
+    mask = radix - 1
+    span = hi - lo
+
+    shift = 0
+    while span >> shift:
+        count = [0] * radix
+        for x in src:
+            count[((x - lo) >> shift) & mask] += 1
+
+        if n in count:
+            # every key has the same digit, so this pass would be a no-op
+            shift += bits
+            continue
+
+        # turn the counts into the start position of each digit
+        pos = 0
+        for d in range(radix):
+            c = count[d]
+            count[d] = pos
+            pos += c
+
+        for x in src:
+            d = ((x - lo) >> shift) & mask
+            dst[count[d]] = x
+            count[d] += 1
+
+        src, dst = dst, src
+        shift += bits
+
+    return src.tolist()
+
+
+def radix_sort_digits(lst: List[int], b: int) -> List[int]:
     """
     Converts elements in the list into base b, then calls count sort on
     each digit of these elements until the list is sorted.
@@ -35,6 +158,9 @@ def radix_sort(lst: List[int], b: int) -> List[int]:
         # need to convert all numbers to positive
         offset = -1 * min(lst)
         lst = list(map(lambda x: x + offset, lst))
+    else:
+        # convert_list works in place, so don't clobber the caller's list
+        lst = list(lst)
 
     max_num = max(lst)
 
@@ -137,3 +263,109 @@ def convert_out(num: list, b: int) -> int:
         res += num[i]*(b**exp)
 
     return res
+
+
+def radix_sort_numpy(arr, bits: int = NUMPY_DIGIT_BITS):
+    """
+    Vectorized LSD radix sort of a 1-d integer buffer in base 2**bits.
+
+    Keys are biased by the minimum in unsigned arithmetic once, up front,
+    so signed and unsigned dtypes of any width sort correctly, and small
+    ranges are handed to counting_sort_numpy instead. Each pass extracts
+    the digits into a reused byte buffer, builds the start offset of
+    every digit with `np.bincount` and `np.cumsum`, skips the pass when
+    every key shares the same digit, and scatters each digit's keys, in
+    order, into its slice of a single auxiliary buffer, which is then
+    swapped with the output.
+
+    NumPy has no stable scatter by digit, so each digit's keys are
+    gathered with a compress on a reused mask. That costs O(n) per digit
+    value, so narrow digits are fastest, hence the 3-bit default.
+
+    Time: O(n*2^bits*passes), where passes = ceil(log2(hi-lo+1)/bits)
+    Space: O(n), one auxiliary buffer plus two bytes per key
+
+    Args:
+        arr: Any object supporting the buffer protocol with an integer
+            format, e.g. `array.array`, `memoryview` or a NumPy array.
+        bits: The number of bits per digit, at most 8.
+
+    Returns:
+        A new NumPy array of the same dtype as arr.
+    """
+    if np is None:
+        raise ImportError("radix_sort_numpy requires NumPy")
+
+    src = np.asarray(arr)
+    if src.dtype.kind not in "iu" or src.ndim != 1:
+        raise TypeError(f"expected a 1-d integer array, got {src.dtype}")
+    if not 1 <= bits <= 8:
+        raise ValueError("bits must be between 1 and 8")
+
+    n = len(src)
+    if n <= 1:
+        return src.copy()
+
+    lo, hi = int(src.min()), int(src.max())
+    span = hi - lo
+    if span < NUMPY_COUNTING_SORT_MAX_RANGE:
+        return counting_sort_numpy(src, lo, hi)
+
+    # (x - lo) computed modulo 2^w in the unsigned type of the same width
+    udtype = np.dtype(f"u{src.dtype.itemsize}")
+    ulo = np.array(lo).astype(src.dtype).view(udtype)
+    radix = 1 << bits
+
+    out = src.view(udtype) - ulo
+    aux = np.empty_like(out)
+    digits = np.empty(n, dtype=np.uint8)
+    mask = np.empty(n, dtype=bool)
+    for shift in range(0, span.bit_length(), bits):
+        np.right_shift(out, udtype.type(shift), out=digits, casting="unsafe")
+        np.bitwise_and(digits, radix - 1, out=digits)
+
+        count = np.bincount(digits, minlength=radix)
+        if count.max() == n:
+            # every key has the same digit, so this pass would be a no-op
+            continue
+
+        ends = np.cumsum(count).tolist()
+        start = 0
+        for d, end in enumerate(ends):
+            if end > start:
+                np.equal(digits, d, out=mask)
+                np.compress(mask, out, out=aux[start:end])
+            start = end
+        out, aux = aux, out
+
+    out += ulo
+    return out.view(src.dtype)
+
+
+def counting_sort_numpy(arr, lo: int | None = None, hi: int | None = None):
+    """
+    Vectorized counting sort of a 1-d integer NumPy array, for when the
+    range of the values is small: one `np.bincount` histogram, then the
+    output is written out directly with `np.repeat`.
+
+    Time: O(n+k), where k is the range of the values
+    Space: O(k)
+
+    Returns:
+        A new NumPy array of the same dtype as arr.
+    """
+    if np is None:
+        raise ImportError("counting_sort_numpy requires NumPy")
+
+    src = np.asarray(arr)
+    if len(src) == 0:
+        return src.copy()
+    if lo is None or hi is None:
+        lo, hi = int(src.min()), int(src.max())
+
+    udtype = np.dtype(f"u{src.dtype.itemsize}")
+    ulo = np.array(lo).astype(src.dtype).view(udtype)
+    offsets = (src.view(udtype) - ulo).astype(np.intp)
+    count = np.bincount(offsets, minlength=hi - lo + 1)
+    values = (np.arange(hi - lo + 1, dtype=udtype) + ulo).view(src.dtype)
+    return np.repeat(values, count)
@@ -0,0 +1,169 @@
+"""
+Parallel sample sort.
+
+A random sample of the input picks splitters which divide the items
+into one bucket per worker, such that every item of a bucket is less
+than or equal to every item of the next. The input is copied into a
+shared memory block and handed out to the workers in equal slices.
+Each worker partitions its slice by the splitters in place and reports
+how many items fell into each bucket. Every worker then gathers one
+bucket from all the slices, sorts it, and writes it into a second
+shared block, which ends up holding the sorted result.
+"""
+
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import accumulate
+from multiprocessing import shared_memory
+from typing import Callable, List, Tuple
+from sorting.merge_sort import merge_sort
+
+
+# sample size per bucket; larger samples give more even buckets
+OVERSAMPLING = 32
+
+# below this many items, a single process sorts faster than a pool
+PARALLEL_CUTOFF = 10000
+
+
+def sample_sort(lst: List[int], workers: int | None = None,
+                sort_fn: Callable[[List[int]], List[int]] = merge_sort,
+                typecode: str = "q",
+                executor: Executor | None = None) -> List[int]:
+    """
+    Sorts lst by splitting it into buckets which are sorted in parallel,
+    one per worker process. Both the partitioning and the sorting run in
+    the workers, and items are passed to and from them through shared
+    memory as raw `array` data, rather than as pickled lists.
+
+    Time: O(n + (n/p)logn) with p workers, given even buckets, where the
+        O(n) is the parent copying items in and out of shared memory
+    Space: O(n)
+
+    Args:
+        workers: The number of worker processes, by default one per CPU.
+        sort_fn: The sort run on each bucket. It must be a module level
+            function, so that it can be sent to the workers.
+        typecode: An `array` typecode wide enough to hold every item.
+        executor: A process pool to reuse, rather than starting one.
+    """
+    n = len(lst)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n < PARALLEL_CUTOFF:
+        return sort_fn(list(lst))
+
+    splitters = choose_splitters(lst, workers)
+    k = len(splitters) + 1
+    slices = [(i * n // workers, (i + 1) * n // workers)
+              for i in range(workers)]
+
+    itemsize = array(typecode).itemsize
+    src = shared_memory.SharedMemory(create=True, size=n * itemsize)
+    try:
+        dst = shared_memory.SharedMemory(create=True, size=n * itemsize)
+        try:
+            src.buf[:n * itemsize] = memoryview(array(typecode, lst)).cast("B")
+
+            pool = executor or ProcessPoolExecutor(max_workers=workers)
+            try:
+                # counts[i][j]: the number of items of slice i in bucket j
+                counts = list(pool.map(
+                    partition_slice, [src.name] * workers,
+                    [typecode] * workers, *zip(*slices),
+                    [splitters] * workers))
+
+                # pieces[j]: where bucket j lies in each slice
+                pieces = [[] for _ in range(k)]
+                for (start, _), row in zip(slices, counts):
+                    offsets = accumulate(row, initial=start)
+                    for j, (lo, c) in enumerate(zip(offsets, row)):
+                        if c:
+                            pieces[j] += [(lo, lo + c)]
+                sizes = [sum(row[j] for row in counts) for j in range(k)]
+                bounds = list(accumulate(sizes, initial=0))
+
+                futures = [
+                    pool.submit(sort_bucket, src.name, dst.name, typecode,
+                                pieces[j], bounds[j], sort_fn)
+                    for j in range(k) if sizes[j]
+                ]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+            view = dst.buf[:n * itemsize].cast(typecode)
+            res = view.tolist()
+            view.release()
+            return res
+        finally:
+            dst.close()
+            dst.unlink()
+    finally:
+        src.close()
+        src.unlink()
+
+
+def choose_splitters(lst: List[int], buckets: int) -> List[int]:
+    """
+    Picks buckets - 1 splitters from a sorted random sample of lst.
+
+    Time: O(slogs), where s = buckets * OVERSAMPLING
+    """
+    k = min(len(lst), buckets * OVERSAMPLING)
+    sample = sorted(random.sample(lst, k))
+    step = k / buckets
+    return [sample[int(i * step)] for i in range(1, buckets)]
+
+
+def partition_slice(name: str, typecode: str, start: int, end: int,
+                    splitters: List[int]) -> List[int]:
+    """
+    Runs in a worker: reorders items start..end of the shared memory
+    block called name in place, so that they are grouped by bucket.
+
+    Time: O(mlogk) for m items and k buckets
+
+    Returns:
+        The number of items in each bucket.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        itemsize = array(typecode).itemsize
+        view = shm.buf[start * itemsize:end * itemsize].cast(typecode)
+        buckets = [[] for _ in range(len(splitters) + 1)]
+        for x in view.tolist():
+            buckets[bisect_right(splitters, x)].append(x)
+        view[:] = array(typecode, [x for bucket in buckets for x in bucket])
+        view.release()
+        return [len(bucket) for bucket in buckets]
+    finally:
+        shm.close()
+
+
+def sort_bucket(src_name: str, dst_name: str, typecode: str,
+                pieces: List[Tuple[int, int]], start: int,
+                sort_fn: Callable[[List[int]], List[int]]) -> None:
+    """
+    Runs in a worker: gathers the pieces of a bucket from the shared
+    memory block called src_name, sorts them, and writes the result to
+    the block called dst_name from item start on.
+    """
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        itemsize = array(typecode).itemsize
+        bucket = array(typecode)
+        for lo, hi in pieces:
+            bucket.frombytes(src.buf[lo * itemsize:hi * itemsize])
+        end = start + len(bucket)
+        view = dst.buf[start * itemsize:end * itemsize].cast(typecode)
+        view[:] = array(typecode, sort_fn(bucket.tolist()))
+        view.release()
+    finally:
+        src.close()
+        dst.close()
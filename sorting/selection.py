@@ -0,0 +1,138 @@
+"""
+Selection: finding the k-th smallest items without fully sorting.
+"""
+
+import itertools
+from typing import Any, Callable, Iterable, List
+from trees.heap import Heap
+from sorting.quicksort import (INSERTION_SORT_CUTOFF, choose_pivot,
+                               insertion_sort, introsort, partition3)
+
+
+def nth_element(lst: List[Any], k: int) -> List[Any]:
+    """
+    Rearranges lst in place so that lst[k] is the item which would be
+    there if lst were sorted, with every item before it less than or
+    equal to it, and every item after it greater than or equal to it.
+
+    Uses introselect: quickselect with median-of-three or ninther pivots
+    and three-way partitioning, which switches to median-of-medians
+    pivots if partitioning goes deeper than 2*log2(n) without finishing,
+    bounding the worst case to linear time.
+
+    Time: O(n)
+    Space: O(1) auxiliary, or O(n) once median-of-medians kicks in
+
+    Returns:
+        lst, partitioned in place.
+    """
+    n = len(lst)
+    if not 0 <= k < n:
+        raise IndexError("k out of range")
+
+    lo, hi = 0, n
+    depth = 2 * n.bit_length()
+    while hi - lo > INSERTION_SORT_CUTOFF:
+        if depth > 0:
+            depth -= 1
+            p = lst[choose_pivot(lst, lo, hi)]
+        else:
+            p = median_of_medians(lst, lo, hi)
+
+        lt, gt = partition3(lst, lo, hi, p)
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
+        else:
+            return lst  # lst[k] equals the pivot, which is now in place
+
+    insertion_sort(lst, lo, hi)
+    return lst
+
+
+def median_of_medians(lst: List[Any], lo: int, hi: int) -> Any:
+    """
+    Picks a pivot value for lst[lo:hi] which is guaranteed to have at
+    least 30% of the items on each side of it: the median of the medians
+    of groups of five items.
+
+    Time: O(n)
+    """
+    medians = []
+    for start in range(lo, hi, 5):
+        group = sorted(lst[start:min(start + 5, hi)])
+        medians += [group[(len(group) - 1) // 2]]
+    return select(medians, (len(medians) - 1) // 2)
+
+
+def select(lst: List[Any], k: int) -> Any:
+    """
+    Returns the k-th smallest item of lst (counting from 0), leaving lst
+    unchanged.
+
+    Time: O(n)
+    Space: O(n)
+    """
+    res = list(lst)
+    return nth_element(res, k)[k]
+
+
+def partial_sort(lst: List[Any], k: int) -> List[Any]:
+    """
+    Rearranges lst in place so that lst[:k] holds its k smallest items in
+    sorted order. The order of the remaining items is unspecified.
+
+    Time: O(n + klogk)
+
+    Returns:
+        lst, partially sorted in place.
+    """
+    k = min(k, len(lst))
+    if k <= 0:
+        return lst
+    if k < len(lst):
+        nth_element(lst, k)
+    return introsort(lst, 0, k)
+
+
+def top_k(iterable: Iterable[Any], k: int,
+          key: Callable[[Any], Any] | None = None,
+          largest: bool = True) -> List[Any]:
+    """
+    Returns the k largest (or smallest) items of an iterable, in order
+    from the largest (or smallest). Items are streamed through a heap
+    bounded to k items, whose root is the worst of the best k seen so far,
+    so the iterable is never materialized.
+
+    Ties are broken by order of appearance, so items themselves are never
+    compared and don't need to be.
+
+    Time: O(nlogk)
+    Space: O(k)
+    """
+    if k <= 0:
+        return []
+
+    if largest:
+        # root is the smallest key, or the latest among equal keys
+        invariant = lambda a, b: a[0] < b[0] or a[0] == b[0] and a[1] > b[1]
+    else:
+        # root is the largest key, or the latest among equal keys
+        invariant = lambda a, b: a[0] > b[0] or a[0] == b[0] and a[1] > b[1]
+
+    it = iter(iterable)
+    heap = Heap([(key(x) if key else x, i, x)
+                 for i, x in enumerate(itertools.islice(it, k))], invariant)
+
+    for i, x in enumerate(it, k):
+        entry = (key(x) if key else x, i, x)
+        # replace the root if the new item beats it
+        if invariant(heap.heap[0], entry):
+            heap.heap[0] = entry
+            heap.sink(0, len(heap))
+
+    res = []
+    while heap:
+        res += [heap.pop()]
+    return [x for _, _, x in reversed(res)]
@@ -0,0 +1,193 @@
+"""
+MSD (most significant digit first) sorting of string keys, with
+multikey quicksort.
+"""
+
+from array import array
+from typing import Any, Callable, List
+
+
+# ranges up to this size are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+
+
+def string_sort(lst: List[Any],
+                key: Callable[[Any], Any] | None = None) -> List[Any]:
+    """
+    Sorts a list of `str`, `bytes` or `memoryview` keys (or of records,
+    by such a key) with multikey quicksort, a three-way radix quicksort:
+    items are three-way partitioned on their character at the current
+    depth, then the items less and greater than the pivot character are
+    sorted at the same depth, and the items equal to it at the next depth.
+    Each character is looked at about once per level, rather than
+    comparing whole keys over and over as comparison sorts do, which pays
+    off on keys with long common prefixes.
+
+    Keys are read where they are: key(record) is evaluated once per
+    record, and the object it returns is used as is, so memoryview keys,
+    e.g. slices of one shared buffer, are never copied. Ranges are kept
+    on an explicit stack, so long common prefixes can't hit the recursion
+    limit. The sort is not stable.
+
+    Time: O(nlogn + D), where D is the total length of the distinguishing
+        prefixes of the keys
+    Space: O(n) for the keys, O(logn + max key length) for the stack
+
+    Returns:
+        lst, sorted in place.
+    """
+    n = len(lst)
+    if n <= 1:
+        return lst
+
+    if key is None:
+        keys, vals = lst, None
+    else:
+        keys, vals = [key(x) for x in lst], lst
+
+    if isinstance(keys[0], str):
+        char_at = str_char_at
+    else:
+        char_at = bytes_char_at
+
+    stack = [(0, n, 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo <= INSERTION_SORT_CUTOFF:
+            suffix_insertion_sort(keys, vals, lo, hi, d)
+            continue
+
+        p = median_char(keys, lo, hi, d, char_at)
+        lt, gt = partition_chars(keys, vals, lo, hi, d, p, char_at)
+
+        stack += [(lo, lt, d), (gt, hi, d)]
+        if p >= 0:
+            # keys equal up to here which haven't ended yet
+            stack += [(lt, gt, d + 1)]
+
+    return lst
+
+
+def str_char_at(s: str, d: int) -> int:
+    """
+    The code point at index d of s, or -1 past its end, so that a key
+    sorts before any key it is a prefix of.
+    """
+    return ord(s[d]) if d < len(s) else -1
+
+
+def bytes_char_at(s: bytes | memoryview, d: int) -> int:
+    """
+    The byte (or item) at index d of s, or -1 past its end.
+    """
+    return s[d] if d < len(s) else -1
+
+
+def median_char(keys: List[Any], lo: int, hi: int, d: int,
+                char_at: Callable) -> int:
+    """
+    The median of the characters at depth d of the first, middle and
+    last keys of keys[lo:hi].
+    """
+    a = char_at(keys[lo], d)
+    b = char_at(keys[(lo + hi) // 2], d)
+    c = char_at(keys[hi - 1], d)
+    return sorted((a, b, c))[1]
+
+
+def partition_chars(keys: List[Any], vals: List[Any] | None, lo: int, hi: int,
+                    d: int, p: int, char_at: Callable) -> tuple:
+    """
+    Three-way partitions keys[lo:hi] (and vals alongside) by their
+    character at depth d against the pivot character p.
+
+    Returns:
+        (lt, gt) such that keys[lt:gt] have character p at depth d.
+    """
+    is_str = char_at is str_char_at
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        # inlined char_at, as this is the innermost loop of the sort
+        k = keys[i]
+        if d >= len(k):
+            c = -1
+        elif is_str:
+            c = ord(k[d])
+        else:
+            c = k[d]
+
+        if c < p:
+            keys[lt], keys[i] = k, keys[lt]
+            if vals is not None:
+                vals[lt], vals[i] = vals[i], vals[lt]
+            lt += 1
+            i += 1
+        elif c > p:
+            gt -= 1
+            keys[gt], keys[i] = k, keys[gt]
+            if vals is not None:
+                vals[gt], vals[i] = vals[i], vals[gt]
+        else:
+            i += 1
+    return lt, gt
+
+
+def suffix_less(a: Any, b: Any, d: int) -> bool:
+    """
+    Whether key a sorts before key b, given that they share their first
+    d characters.
+    """
+    if isinstance(a, (str, bytes)):
+        return a < b  # compares in C, the shared prefix costs little
+
+    n = min(len(a), len(b))
+    while d < n:
+        ca, cb = a[d], b[d]
+        if ca != cb:
+            return ca < cb
+        d += 1
+    return len(a) < len(b)
+
+
+def suffix_insertion_sort(keys: List[Any], vals: List[Any] | None,
+                          lo: int, hi: int, d: int) -> None:
+    """
+    Insertion sorts keys[lo:hi] (and vals alongside), which all share
+    their first d characters.
+
+    Time: O(k^2) comparisons, where k = hi - lo
+    """
+    for i in range(lo + 1, hi):
+        k = keys[i]
+        v = vals[i] if vals is not None else None
+        j = i - 1
+        while j >= lo and suffix_less(k, keys[j], d):
+            keys[j + 1] = keys[j]
+            if vals is not None:
+                vals[j + 1] = vals[j]
+            j -= 1
+        keys[j + 1] = k
+        if vals is not None:
+            vals[j + 1] = v
+
+
+def suffix_array(text: str | bytes) -> List[int]:
+    """
+    Builds the suffix array of text: the starting indices of its suffixes
+    in sorted order.
+
+    The suffixes are memoryview slices of a single buffer holding the
+    text (the bytes themselves, or the code points of a str), so no
+    suffix is ever copied, and they are sorted with string_sort.
+
+    Time: O(nlogn + D), where D is the total length of the distinguishing
+        prefixes of the suffixes, so O(n^2) for highly repetitive text
+    Space: O(n)
+    """
+    if isinstance(text, str):
+        buf = memoryview(array("I", map(ord, text)))
+    else:
+        buf = memoryview(text)
+
+    suffixes = list(range(len(text)))
+    return string_sort(suffixes, key=lambda i: buf[i:])
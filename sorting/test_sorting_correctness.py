@@ -1,5 +1,14 @@
+import heapq
 import pytest
+import random
+from array import array
+from functools import partial
+import adaptive_sort
+import external_sort
 import merge_sort
+import sample_sort
+import selection
+import string_sort
 import quicksort
 import heapsort
 import radix_sort
@@ -8,14 +17,24 @@ import radix_sort
 def sorting_algorithms():
     algos = [
         merge_sort.merge_sort,
+        merge_sort.merge_sort_bottom_up,
         quicksort.quicksort,
+        partial(quicksort.quicksort, in_place=False),
+        quicksort.introsort,
         heapsort.heapsort,
         radix_sort.radix_sort_base_64,
-        radix_sort.radix_sort_base_256
+        radix_sort.radix_sort_base_256,
+        partial(radix_sort.radix_sort, b=64),
+        partial(radix_sort.radix_sort, b=256),
+        adaptive_sort.sort
     ]
     return algos
 
 
+requires_numpy = pytest.mark.skipif(radix_sort.np is None,
+                                    reason="NumPy is not installed")
+
+
 @pytest.mark.parametrize("sorting_algorithm", sorting_algorithms())
 def test_sorting_empty_list(sorting_algorithm):
     input = []
@@ -89,3 +108,309 @@ def test_sorting_negative_numbers(sorting_algorithm):
     for input, expected in cases:
         result = sorting_algorithm(input)
         assert result == expected
+
+
+@pytest.mark.parametrize("sorting_algorithm", sorting_algorithms())
+def test_sorting_wide_range_numbers(sorting_algorithm):
+    cases = [
+        ([2**62, -2**63, 0, 2**63 - 1, -1, 2**32],
+         [-2**63, -1, 0, 2**32, 2**62, 2**63 - 1]),
+
+        ([2**70, 5, -2**70, 5],
+         [-2**70, 5, 5, 2**70])
+    ]
+
+    for input, expected in cases:
+        result = sorting_algorithm(input)
+        assert result == expected
+
+
+@requires_numpy
+@pytest.mark.parametrize("dtype", ["i1", "u1", "i2", "u2", "i4", "u4",
+                                   "i8", "u8"])
+@pytest.mark.parametrize("bits", [1, 3, 6, 8])
+def test_radix_sort_numpy_dtypes(dtype, bits):
+    np = radix_sort.np
+    info = np.iinfo(dtype)
+    rng = np.random.default_rng(0)
+    for lo, hi in [(info.min, info.max), (0, 10)]:
+        arr = rng.integers(lo, hi, size=5000, dtype=dtype, endpoint=True)
+        result = radix_sort.radix_sort_numpy(arr, bits)
+        assert result.dtype == arr.dtype
+        assert (result == np.sort(arr)).all()
+
+
+@requires_numpy
+def test_radix_sort_numpy_buffer_protocol():
+    input = array("q", [5, -2**63, 3, 2**63 - 1, -1, 0])
+    expected = sorted(input)
+    for buf in [input, memoryview(input)]:
+        result = radix_sort.radix_sort_base_256(buf)
+        assert result.dtype == radix_sort.np.int64
+        assert result.tolist() == expected
+
+
+@requires_numpy
+@pytest.mark.parametrize("values", [[], [7]])
+def test_radix_sort_vectorized_short_buffer(values):
+    result = radix_sort.radix_sort_base_64(array("i", values))
+    assert result.dtype == radix_sort.np.int32
+    assert result.tolist() == values
+
+
+@pytest.mark.parametrize("input", [
+    list(range(10**6)),
+    list(range(10**6, 0, -1)),
+    [7] * 10**6,
+], ids=["sorted", "reversed", "all-equal"])
+@pytest.mark.parametrize("sort_fn", [quicksort.quicksort, quicksort.introsort])
+def test_introsort_large_adversarial_input(input, sort_fn):
+    expected = sorted(input)
+    result = sort_fn(list(input))
+    assert result == expected
+
+
+def test_merge_sort_bottom_up_key_is_stable():
+    input = [(i % 7, i) for i in range(500)]
+    input = input[::-1] + input[100:200] + input[:300]
+    expected = sorted(input, key=lambda x: x[0])
+    result = merge_sort.merge_sort_bottom_up(input, key=lambda x: x[0])
+    assert result == expected
+
+
+@pytest.mark.parametrize("sorting_algorithm", sorting_algorithms())
+def test_external_sort_binary_multi_pass(tmp_path, sorting_algorithm):
+    input = [random.randint(-10**12, 10**12) for _ in range(5000)]
+    in_path, out_path = tmp_path / "in.bin", tmp_path / "out.bin"
+    in_path.write_bytes(array("q", input).tobytes())
+
+    stats = external_sort.external_sort(
+        in_path, out_path, "q", memory_budget=20000, fan_in=3,
+        sort_fn=sorting_algorithm)
+
+    result = array("q", out_path.read_bytes()).tolist()
+    assert result == sorted(input)
+    assert len(stats) > 2  # needed more than one merge pass
+    assert stats[0].bytes_read == 8 * len(input)
+    assert stats[-1].runs_out == 1
+    for prev, cur in zip(stats, stats[1:]):
+        assert cur.bytes_read == prev.bytes_written
+        assert cur.runs_in == prev.runs_out
+
+
+def test_external_sort_binary_unsigned(tmp_path):
+    input = [random.randint(0, 2**64 - 1) for _ in range(1000)]
+    input += [2**63, 2**64 - 1]
+    in_path, out_path = tmp_path / "in.bin", tmp_path / "out.bin"
+    in_path.write_bytes(array("Q", input).tobytes())
+
+    external_sort.external_sort(in_path, out_path, "Q",
+                                memory_budget=20000, fan_in=3)
+
+    assert array("Q", out_path.read_bytes()).tolist() == sorted(input)
+
+
+@pytest.mark.parametrize("input", [[], [3], [5, -1, 5, 0, 12, -7]])
+def test_external_sort_text(tmp_path, input):
+    in_path, out_path = tmp_path / "in.txt", tmp_path / "out.txt"
+    in_path.write_text("".join(f"{x}\n" for x in input))
+
+    external_sort.external_sort(in_path, out_path, None,
+                                memory_budget=300, fan_in=2)
+
+    result = [int(line) for line in out_path.read_text().split()]
+    assert result == sorted(input)
+
+
+@pytest.mark.parametrize("big", [2**63, -2**63 - 1, 10**30])
+def test_external_sort_text_big_ints(tmp_path, big):
+    in_path, out_path = tmp_path / "in.txt", tmp_path / "out.txt"
+    in_path.write_text(f"1\n{big}\n-4\n")
+
+    with pytest.raises(ValueError, match="64 bits"):
+        external_sort.external_sort(in_path, out_path, None)
+
+
+@pytest.mark.parametrize("sort_fn", [merge_sort.merge_sort,
+                                     radix_sort.radix_sort_base_256,
+                                     heapsort.heapsort])
+def test_sample_sort_parallel(sort_fn):
+    n = 2 * sample_sort.PARALLEL_CUTOFF
+    for input in [[random.randint(-10**9, 10**9) for _ in range(n)],
+                  [random.randint(0, 3) for _ in range(n)]]:
+        result = sample_sort.sample_sort(input, workers=3, sort_fn=sort_fn)
+        assert result == sorted(input)
+
+
+@pytest.mark.parametrize("input, algorithm", [
+    (list(range(10000)), "merge_sort_bottom_up"),
+    (list(range(10000, 0, -1)), "merge_sort_bottom_up"),
+    ([random.randint(0, 3) for _ in range(10000)],
+     "introsort" if radix_sort.np is None else "radix_sort_numpy"),
+    ([random.random() for _ in range(10000)], "introsort"),
+    ([random.randint(0, 1000) for _ in range(10000)], "radix_sort_base_64"
+     if radix_sort.np is None else "radix_sort_numpy"),
+    (list(range(5000)) + list(range(5000, 0, -1)), "merge_sort_bottom_up"
+     if radix_sort.np is None else "radix_sort_numpy"),
+], ids=["sorted", "reversed", "few-unique", "floats", "small-range",
+        "organ-pipe"])
+def test_adaptive_sort_decision(input, algorithm):
+    decisions = []
+    expected = sorted(input)
+    result = adaptive_sort.sort(input, hook=decisions.append)
+    assert result == expected
+    assert [d.algorithm for d in decisions] == [algorithm]
+    assert decisions[0].n == len(input)
+
+
+@pytest.mark.parametrize("extra", [0.5, 2**80], ids=["float", "big-int"])
+def test_adaptive_sort_fallback(monkeypatch, extra):
+    # keep the extra item out of the sample, so that a radix sort is
+    # picked and only finds out about it when sorting
+    input = [random.randint(0, 100) for _ in range(5000)] + [extra]
+    monkeypatch.setattr(random, "sample",
+                        lambda population, k: list(population)[:k])
+    ran = []
+    for name in ["merge_sort_bottom_up", "introsort", "radix_sort_numpy",
+                 "radix_sort_vectorized"]:
+        f = getattr(adaptive_sort, name)
+        monkeypatch.setattr(adaptive_sort, name,
+                            lambda *args, f=f, name=name:
+                            ran.append(name) or f(*args))
+    decisions = []
+    expected = sorted(input)
+    result = adaptive_sort.sort(input, hook=decisions.append)
+    assert result == expected
+    assert len(decisions) == 1
+    assert decisions[0].algorithm == ran[-1] == "introsort"
+    # without NumPy, 2**80 widens the range of the input so much that
+    # introsort is picked up front, rather than fallen back to
+    fallback = radix_sort.np is not None or type(extra) is float
+    assert (decisions[0].fallback is not None) == fallback
+
+
+@pytest.mark.parametrize("input", [
+    [random.randint(-100, 100) for _ in range(1000)],
+    list(range(1000)),
+    [3] * 1000,
+], ids=["random", "sorted", "all-equal"])
+def test_selection(input):
+    expected = sorted(input)
+    for k in [0, 1, 17, 500, 998, 999]:
+        assert selection.select(input, k) == expected[k]
+
+        lst = list(input)
+        selection.nth_element(lst, k)
+        assert lst[k] == expected[k]
+        assert max(lst[:k], default=lst[k]) <= lst[k] <= min(lst[k:])
+
+        lst = list(input)
+        selection.partial_sort(lst, k)
+        assert lst[:k] == expected[:k]
+        assert sorted(lst) == expected
+
+
+def test_selection_median_of_medians():
+    input = [random.randint(0, 10**6) for _ in range(5000)]
+    expected = sorted(input)
+    for k in [0, 2500, 4999]:
+        lst = list(input)
+        assert selection.median_of_medians(lst, 0, len(lst)) in input
+        assert selection.select(input, k) == expected[k]
+
+
+def test_top_k():
+    input = [(random.randint(0, 50), i) for i in range(2000)]
+    key = lambda x: x[0]
+    assert selection.top_k(iter(input), 100, key=key) == \
+        sorted(input, key=key, reverse=True)[:100]
+    assert selection.top_k(iter(input), 100, key=key, largest=False) == \
+        sorted(input, key=key)[:100]
+    assert selection.top_k(range(5), 10) == [4, 3, 2, 1, 0]
+    assert selection.top_k(range(5), 0) == []
+
+
+def test_heapsort_key():
+    input = [(random.randint(0, 100), random.random()) for _ in range(1000)]
+    expected = sorted(x[0] for x in input)
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return x[0]
+
+    result = heapsort.heapsort(input, key=key)
+    assert result is input
+    assert [x[0] for x in result] == expected
+    assert len(calls) == len(input)
+
+
+def test_string_sort():
+    words = ["", "a", "ab", "abc", "b", "ba", "abd", "zz", "a",
+             "\u00e9t\u00e9", "\u00e9"]
+    words += ["".join(random.choice("acgt")
+                      for _ in range(random.randint(0, 12)))
+              for _ in range(500)]
+    expected = sorted(words)
+    assert string_sort.string_sort(list(words)) == expected
+
+    data = [w.encode() for w in words]
+    assert string_sort.string_sort(list(data)) == sorted(data)
+
+    views = [memoryview(b) for b in data]
+    result = string_sort.string_sort(views)
+    assert [bytes(v) for v in result] == sorted(data)
+
+
+def test_string_sort_key():
+    records = [{"id": i, "key": str(random.randint(0, 10**6))}
+               for i in range(1000)]
+    result = string_sort.string_sort(list(records), key=lambda r: r["key"])
+    assert [r["key"] for r in result] == sorted(r["key"] for r in records)
+
+
+@pytest.mark.parametrize("text", ["banana", "mississippi$", "aaaaaaaaaa",
+                                  "h\u00e9ll\u00f6 w\u00f6rld", ""])
+def test_suffix_array(text):
+    expected = sorted(range(len(text)), key=lambda i: text[i:])
+    assert string_sort.suffix_array(text) == expected
+    assert string_sort.suffix_array(text.encode("latin-1")) == expected
+
+
+def test_merge_many():
+    inputs = [sorted(random.randint(0, 50)
+                     for _ in range(random.randint(0, 40)))
+              for _ in range(30)]
+    expected = sorted(sum(inputs, []))
+    assert list(merge_sort.merge_many(*inputs)) == expected
+    assert list(merge_sort.merge_many(*map(iter, inputs), unique=True)) == \
+        sorted(set(expected))
+    assert list(merge_sort.merge_many(*[x[::-1] for x in inputs],
+                                      reverse=True)) == expected[::-1]
+    assert list(merge_sort.merge_many()) == []
+
+    # ties come out in the order of the inputs, as with heapq.merge
+    records = [[(x, i, j) for j, x in enumerate(lst)]
+               for i, lst in enumerate(inputs)]
+    key = lambda r: r[0]
+    assert list(merge_sort.merge_many(*records, key=key)) == \
+        list(heapq.merge(*records, key=key))
+    records = [lst[::-1] for lst in records]
+    assert list(merge_sort.merge_many(*records, key=key, reverse=True)) == \
+        list(heapq.merge(*records, key=key, reverse=True))
+
+
+def test_merge_many_two_inputs():
+    a = sorted(random.randint(0, 20) for _ in range(200))
+    b = sorted(random.randint(0, 20) for _ in range(150))
+    assert list(merge_sort.merge_many(a, b)) == sorted(a + b)
+
+    # 1.0 == 1, so ties have to come out of the first input first
+    result = list(merge_sort.merge_many([1.0, 2.0, 2.0], [1, 2, 3]))
+    assert result == [1, 1, 2, 2, 2, 3]
+    assert [type(x) for x in result] == [float, int, float, float, int, int]
+
+    assert list(merge_sort.merge_many([], [1, 2])) == [1, 2]
+    assert list(merge_sort.merge_many(iter([1, 3]), [])) == [1, 3]
+    assert list(merge_sort.merge_many([1, 1, 2], [1, 3], unique=True)) == \
+        [1, 2, 3]
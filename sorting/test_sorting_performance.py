@@ -1,40 +1,355 @@
-import timeit
+"""
+Sorting benchmark suite.
+
+Times every algorithm over a sweep of input sizes and distributions,
+records the peak memory each one allocates, and can write the results
+to JSON and compare them against a stored baseline to flag regressions.
+
+    python -m sorting.test_sorting_performance
+    python -m sorting.test_sorting_performance --sizes 1000 1000000 \
+        --distributions sorted zipf --output results.json
+    python -m sorting.test_sorting_performance --compare baseline.json
+"""
+
+import argparse
+import heapq
+import json
+import os
+import platform
 import random
-from sorting import (merge_sort,
+import sys
+import time
+import timeit
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from sorting import (adaptive_sort,
+                     merge_sort,
                      quicksort,
                      heapsort,
-                     radix_sort)
+                     radix_sort,
+                     sample_sort)
+
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5]
+SWEEP_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+# a result is a regression when it is this much slower than its baseline
+DEFAULT_TOLERANCE = 0.2
+
+# timings below this are too noisy to flag as regressions
+NOISE_FLOOR = 0.001
+
+# the adaptive sort fails the dispatcher test when it is this many times
+# slower than the best engine for an input
+DISPATCHER_MAX_RATIO = 1.5
+DISPATCHER_ATTEMPTS = 3
 
 
 def sorting_algorithms():
     algos = [
         ("Python `sorted`", sorted),
         ("Merge Sort", merge_sort.merge_sort),
-        ("Quicksort", quicksort.quicksort),
+        ("Merge Sort (bottom-up)", merge_sort.merge_sort_bottom_up),
+        ("Quicksort (slice-copying)",
+         lambda lst: quicksort.quicksort(lst, in_place=False)),
+        ("Introsort", quicksort.introsort),
         ("Heapsort", heapsort.heapsort),
         ("Radix Sort (base 64)", radix_sort.radix_sort_base_64),
-        ("Radix Sort (base 256)", radix_sort.radix_sort_base_256)
+        ("Radix Sort (base 256)", radix_sort.radix_sort_base_256),
+        ("Radix Sort (array engine, base 64)",
+         lambda lst: radix_sort.radix_sort(lst, 64)),
+        ("Radix Sort (array engine, base 256)",
+         lambda lst: radix_sort.radix_sort(lst, 256)),
+        ("Radix Sort (digit lists, base 64)",
+         lambda lst: radix_sort.radix_sort_digits(lst, 64)),
+        ("Radix Sort (digit lists, base 256)",
+         lambda lst: radix_sort.radix_sort_digits(lst, 256)),
+        ("Adaptive Sort", adaptive_sort.sort)
     ]
     return algos
 
 
-def run(n, k):
-    print("\nBegin performance test (best time of five)")
-    print(f"Array size: {n}")
-    print(f"Array items: 1..{k}\n")
+def organ_pipe(n):
+    half = n // 2
+    return list(range(half)) + list(range(n - half - 1, -1, -1))
+
+
+def zipf(n, s=2.0):
+    # Pareto samples rounded down follow a Zipf-like power law
+    return [int(random.paretovariate(s - 1)) for _ in range(n)]
+
+
+def nearly_sorted(n):
+    lst = list(range(n))
+    for _ in range(n // 100):
+        lst[random.randrange(n)] = random.randrange(n)
+    return lst
+
+
+DISTRIBUTIONS = {
+    "uniform": lambda n: [random.randint(0, n) for _ in range(n)],
+    "sorted": lambda n: list(range(n)),
+    "reversed": lambda n: list(range(n, 0, -1)),
+    "nearly-sorted": nearly_sorted,
+    "organ-pipe": organ_pipe,
+    "few-unique": lambda n: [random.randint(0, 7) for _ in range(n)],
+    "zipf": zipf,
+    "wide-64-bit": lambda n: [random.randint(-2**63, 2**63 - 1)
+                              for _ in range(n)],
+    "negative": lambda n: [random.randint(-n, -1) for _ in range(n)],
+}
+
+
+def best_time(f, arr, repeat):
+    """
+    Returns the best time of repeat runs of f, each on a fresh copy of
+    arr, as some of the algorithms sort in place.
+    """
+    times = []
+    for _ in range(repeat):
+        lst = list(arr)
+        start = time.perf_counter()
+        f(lst)
+        times += [time.perf_counter() - start]
+    return min(times)
+
+
+def peak_memory(f, arr):
+    """
+    Runs f on a copy of arr and returns the peak memory it allocated,
+    in KiB. Kept separate from the timing runs, as tracing slows them down.
+    """
+    arr = list(arr)
+    tracemalloc.start()
+    f(arr)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def run(sizes, dists, algos, repeat=3, max_seconds=10.0):
+    """
+    Benchmarks every algorithm on every distribution and size. Once an
+    algorithm takes longer than max_seconds on some input, or fails on
+    it, it is skipped for the larger sizes of that distribution.
+
+    Returns:
+        A list of results, one dict per (algorithm, distribution, size).
+    """
+    print(f"\nBegin performance test (best time of {repeat})\n")
+    print("Algorithm".ljust(36), "Distribution".ljust(14), "Size".ljust(10),
+          "Time (s)".ljust(14), "Peak mem (KiB)")
+
+    results = []
+    for dist in dists:
+        too_slow = set()
+        for n in sorted(sizes):
+            arr = DISTRIBUTIONS[dist](n)
+            for name, f in algos:
+                if name in too_slow:
+                    continue
+                try:
+                    ti = best_time(f, arr, repeat)
+                except RecursionError as e:
+                    # e.g. the original quicksort on sorted input
+                    results += [{"algorithm": name, "distribution": dist,
+                                 "n": n, "error": type(e).__name__}]
+                    print(name.ljust(36), dist.ljust(14), str(n).ljust(10),
+                          f"failed ({type(e).__name__})")
+                    too_slow.add(name)
+                    continue
+                mem = peak_memory(f, arr)
+                results += [{"algorithm": name, "distribution": dist,
+                             "n": n, "time": ti, "peak_kib": mem}]
+                print(name.ljust(36), dist.ljust(14), str(n).ljust(10),
+                      str(round(ti, 6)).ljust(14), mem)
+                if ti > max_seconds:
+                    too_slow.add(name)
+    return results
+
+
+def write_results(path, results):
+    doc = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+
+
+def compare(results, baseline_path, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares results against the results stored at baseline_path, and
+    prints every pair of matching results, flagging those which are more
+    than tolerance slower (or allocate more than tolerance more memory).
 
-    print("Algorithm".ljust(25), "Time (s)")
-    for name, f in sorting_algorithms():
+    Returns:
+        The number of regressions found.
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["algorithm"], r["distribution"], r["n"]): r
+                    for r in json.load(f)["results"]}
+
+    print(f"\nComparison against {baseline_path} "
+          f"(tolerance {tolerance:.0%})\n")
+    print("Algorithm".ljust(36), "Distribution".ljust(14), "Size".ljust(10),
+          "Time".ljust(8), "Memory".ljust(8), "Status")
+
+    regressions = 0
+    for r in results:
+        base = baseline.get((r["algorithm"], r["distribution"], r["n"]))
+        if not base or "error" in r or "error" in base:
+            continue
+        time_ratio = r["time"] / max(base["time"], 1e-9)
+        mem_ratio = r["peak_kib"] / max(base["peak_kib"], 1e-9)
+        slower = time_ratio > 1 + tolerance and r["time"] > NOISE_FLOOR
+        bigger = mem_ratio > 1 + tolerance
+        status = "REGRESSION" if slower or bigger else "ok"
+        regressions += slower or bigger
+        print(r["algorithm"].ljust(36), r["distribution"].ljust(14),
+              str(r["n"]).ljust(10), f"{time_ratio:.2f}x".ljust(8),
+              f"{mem_ratio:.2f}x".ljust(8), status)
+
+    print(f"\n{regressions} regression(s)")
+    return regressions
+
+
+def run_dispatcher(n):
+    print("\nBegin dispatcher test (best time of five)")
+    print(f"Array size: {n}\n")
+
+    engines = [
+        ("Merge Sort (bottom-up)", merge_sort.merge_sort_bottom_up),
+        ("Introsort", quicksort.introsort),
+        ("Heapsort", heapsort.heapsort),
+        ("Radix Sort (base 64)", radix_sort.radix_sort_base_64),
+        ("Radix Sort (base 256)", radix_sort.radix_sort_base_256)
+    ]
+    dists = dict(DISTRIBUTIONS)
+    dists["floats"] = lambda n: [random.random() for _ in range(n)]
+
+    print("Distribution".ljust(20), "Dispatcher (s)".ljust(16),
+          "Best engine".ljust(24), "Best (s)".ljust(14), "Ratio")
+    slow = []
+    for dist, gen in dists.items():
+        arr = gen(n)
         times = []
-        for _ in range(5):
-            arr = [random.randint(1, k) for _ in range(n)]
-            ti = timeit.timeit(lambda: f(arr), number=1)
-            times += [round(ti, 10)]
-        best = min(times)
-        print(name.ljust(25), best)
+        for name, f in engines:
+            try:
+                times += [(best_time(f, arr, 5), name)]
+            except TypeError:  # radix sort on floats
+                pass
+        best, best_name = min(times)
+        bound = max(DISPATCHER_MAX_RATIO * best, NOISE_FLOOR)
+        for _ in range(DISPATCHER_ATTEMPTS):
+            # a slow run is timed again before it counts as a failure
+            ti = best_time(adaptive_sort.sort, arr, 5)
+            if ti <= bound:
+                break
+        print(dist.ljust(20), str(round(ti, 6)).ljust(16),
+              best_name.ljust(24), str(round(best, 6)).ljust(14),
+              round(ti / best, 2))
+        if ti > bound:
+            slow += [dist]
+
+    assert not slow, f"adaptive sort is over {DISPATCHER_MAX_RATIO}x " \
+        f"slower than the best engine on: {', '.join(slow)}"
+
+
+def run_merge_many(k, n):
+    print("\nBegin k-way merge test (best time of three)")
+    print(f"Inputs: {k}")
+    print(f"Items per input: {n}\n")
+
+    inputs = [sorted(random.random() for _ in range(n)) for _ in range(k)]
+    merges = [
+        ("heapq.merge", heapq.merge),
+        ("merge_many", merge_sort.merge_many),
+        ("merge_many (unique)",
+         lambda *its: merge_sort.merge_many(*its, unique=True))
+    ]
+    print("Merge".ljust(25), "Time (s)")
+    for name, f in merges:
+        ti = min(timeit.repeat(lambda: sum(1 for _ in f(*inputs)),
+                               number=1, repeat=3))
+        print(name.ljust(25), round(ti, 6))
+
+
+def run_scaling(n, max_workers):
+    print("\nBegin sample sort scaling test (best time of three)")
+    print(f"Array size: {n}")
+    print(f"CPUs: {os.cpu_count()}\n")
+
+    algos = [
+        ("Merge Sort", merge_sort.merge_sort),
+        ("Heapsort", heapsort.heapsort),
+        ("Radix Sort (base 256)", radix_sort.radix_sort_base_256)
+    ]
+    print("Algorithm".ljust(25), "Workers".ljust(10), "Time (s)")
+    for name, f in algos:
+        for workers in range(1, max_workers + 1):
+            # start the pool up front, so that only the sort is timed
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                times = []
+                for _ in range(3):
+                    arr = [random.randint(-2**62, 2**62) for _ in range(n)]
+                    ti = timeit.timeit(
+                        lambda: sample_sort.sample_sort(arr, workers, f,
+                                                        executor=pool),
+                        number=1)
+                    times += [round(ti, 10)]
+            print(name.ljust(25), str(workers).ljust(10), min(times))
+
+
+def main(argv=None):
+    algo_names = [name for name, _ in sorting_algorithms()]
+    parser = argparse.ArgumentParser(description="Sorting benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="input sizes to run")
+    parser.add_argument("--sweep", action="store_true",
+                        help=f"run the full size sweep {SWEEP_SIZES}")
+    parser.add_argument("--distributions", nargs="+",
+                        choices=list(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument("--algorithms", nargs="+", metavar="NAME",
+                        help=f"run only these, out of: {algo_names}")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timing runs per input, best one is kept")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="skip larger sizes once a run takes this long")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="flag regressions against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--dispatcher", action="store_true",
+                        help="also run the adaptive sort dispatcher test")
+    parser.add_argument("--scaling", action="store_true",
+                        help="also run the sample sort scaling test")
+    parser.add_argument("--merge", action="store_true",
+                        help="also run the k-way merge test on 1000 inputs")
+    args = parser.parse_args(argv)
+
+    algos = sorting_algorithms()
+    if args.algorithms:
+        algos = [(name, f) for name, f in algos if name in args.algorithms]
+    sizes = SWEEP_SIZES if args.sweep else args.sizes
+
+    results = run(sizes, args.distributions, algos, args.repeat,
+                  args.max_seconds)
+    if args.output:
+        write_results(args.output, results)
+    if args.dispatcher:
+        run_dispatcher(max(sizes))
+    if args.scaling:
+        run_scaling(max(sizes), os.cpu_count() or 1)
+    if args.merge:
+        run_merge_many(1000, max(1, max(sizes) // 1000))
+    if args.compare and compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    n = 100000
-    k = 10000
-    run(n, k)
+    sys.exit(main())
@@ -0,0 +1,345 @@
+from typing import Any, Iterable, Iterator, List, Tuple
+from trees.search_tree import ceiling, floor, iter_nodes
+
+
+class AVLNode:
+    """
+    A node of an AVL tree, holding a key, its value, and the height of
+    the subtree rooted at it (1 for a leaf).
+    """
+    __slots__ = ("key", "value", "left", "right", "height")
+
+    def __init__(self, key: Any, value: Any = None) -> None:
+        self.key = key
+        self.value = value
+        self.left: AVLNode | None = None
+        self.right: AVLNode | None = None
+        self.height = 1
+
+
+class AVLTree:
+    """
+    A sorted map, as an AVL tree: a binary search tree in which the
+    heights of the two subtrees of every node differ by at most one,
+    which keeps its height under 1.44log2(n), whatever order keys are
+    inserted in. Insert, delete and search walk the tree with loops, and
+    rebalance along the path they walked, so they never recurse.
+
+    A drop-in alternative to BinarySearchTree, storing a value with
+    each key.
+    """
+
+    def __init__(self) -> None:
+        self.root: AVLNode | None = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, key: Any) -> bool:
+        return self.search(key)
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[Tuple[Any, Any]]) -> 'AVLTree':
+        """
+        Builds a tree from (key, value) pairs in strictly increasing key
+        order, as a complete binary tree, without any comparisons or
+        rotations.
+
+        Time: O(n)
+        """
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError("keys must be strictly increasing")
+        tree = cls()
+        tree.size = len(items)
+        nodes = [AVLNode(k, v) for k, v in items]
+
+        # build bottom-up: each (lo, hi) range is rooted at its middle
+        # node, and the ranges are visited children first
+        stack: List[Tuple[int, int, bool]] = [(0, len(nodes), False)]
+        while stack:
+            lo, hi, expanded = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if not expanded:
+                stack += [(lo, hi, True), (lo, mid, False),
+                          (mid + 1, hi, False)]
+                continue
+            node = nodes[mid]
+            node.left = nodes[(lo + mid) // 2] if lo < mid else None
+            node.right = nodes[(mid + 1 + hi) // 2] if mid + 1 < hi else None
+            node.height = 1 + max(node.left.height if node.left else 0,
+                                  node.right.height if node.right else 0)
+
+        tree.root = nodes[len(nodes) // 2] if nodes else None
+        return tree
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the search tree order, the stored heights, the balance of
+        every node and the size.
+        """
+        size = 0
+        stack = [(self.root, None, None)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node is None:
+                continue
+            size += 1
+            assert lo is None or lo < node.key
+            assert hi is None or node.key < hi
+            lh = node.left.height if node.left else 0
+            rh = node.right.height if node.right else 0
+            assert node.height == 1 + max(lh, rh)
+            assert abs(lh - rh) <= 1
+            stack += [(node.left, lo, node.key), (node.right, node.key, hi)]
+        assert size == self.size
+
+    def search(self, key: Any) -> bool:
+        """
+        Searches for a key in the tree.
+
+        Time: O(logn)
+        """
+        return self._find(key) is not None
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        The value of key, or default if key isn't in the tree.
+
+        Time: O(logn)
+        """
+        node = self._find(key)
+        return default if node is None else node.value
+
+    def iter_range(self, lo: Any = None, hi: Any = None,
+                   reverse: bool = False) -> Iterator[Any]:
+        """
+        Yields the keys in [lo, hi] in order, or in reverse order. None
+        means unbounded. Keys are produced lazily, with an explicit stack.
+
+        Time: O(logn + k) for k keys
+        """
+        for node in iter_nodes(self.root, lo, hi, reverse):
+            yield node.key
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_range(reverse=True)
+
+    def floor(self, key: Any) -> Any:
+        """
+        The greatest key less than or equal to key, or None.
+
+        Time: O(logn)
+        """
+        node = floor(self.root, key)
+        return node.key if node else None
+
+    def ceiling(self, key: Any) -> Any:
+        """
+        The least key greater than or equal to key, or None.
+
+        Time: O(logn)
+        """
+        node = ceiling(self.root, key)
+        return node.key if node else None
+
+    def predecessor(self, key: Any) -> Any:
+        """
+        The greatest key less than key, or None.
+
+        Time: O(logn)
+        """
+        node = floor(self.root, key, strict=True)
+        return node.key if node else None
+
+    def successor(self, key: Any) -> Any:
+        """
+        The least key greater than key, or None.
+
+        Time: O(logn)
+        """
+        node = ceiling(self.root, key, strict=True)
+        return node.key if node else None
+
+    def items(self, lo: Any = None, hi: Any = None,
+              reverse: bool = False) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yields the (key, value) pairs with keys in [lo, hi], in order, or
+        in reverse order.
+
+        Time: O(logn + k) for k pairs
+        """
+        for node in iter_nodes(self.root, lo, hi, reverse):
+            yield node.key, node.value
+
+    def _find(self, key: Any) -> AVLNode | None:
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def insert(self, key: Any, value: Any = None) -> None:
+        """
+        Inserts a key into the tree with a value, or replaces the value of
+        the key if it is in the tree already.
+
+        Time: O(logn)
+        """
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path += [node]
+                node = node.left
+            elif node.key < key:
+                path += [node]
+                node = node.right
+            else:
+                node.value = value
+                return
+
+        new = AVLNode(key, value)
+        self.size += 1
+        if not path:
+            self.root = new
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new
+        else:
+            parent.right = new
+        self._rebalance(path)
+
+    def delete(self, key: Any) -> None:
+        """
+        Deletes a key from the tree, if found.
+
+        Time: O(logn)
+        """
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path += [node]
+            node = node.left if key < node.key else node.right
+        if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            # swap in the successor, and delete its node instead
+            path += [node]
+            succ = node.right
+            while succ.left is not None:
+                path += [succ]
+                succ = succ.left
+            node.key, node.value = succ.key, succ.value
+            node = succ
+
+        child = node.left if node.left is not None else node.right
+        self.size -= 1
+        if not path:
+            self.root = child
+            return
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        self._rebalance(path)
+
+    def _rebalance(self, path: List[AVLNode]) -> None:
+        """
+        Updates the heights of the nodes on path, from the bottom up, and
+        rotates any of them which became unbalanced. Stops as soon as a
+        subtree keeps its height, as nothing above it changes then.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            sub = self._balance(node)
+
+            if sub is not node:
+                if i == 0:
+                    self.root = sub
+                elif path[i - 1].left is node:
+                    path[i - 1].left = sub
+                else:
+                    path[i - 1].right = sub
+            if sub.height == old_height:
+                return
+
+    @staticmethod
+    def _update(node: AVLNode) -> None:
+        lh = node.left.height if node.left else 0
+        rh = node.right.height if node.right else 0
+        node.height = 1 + (lh if lh > rh else rh)
+
+    def _balance(self, node: AVLNode) -> AVLNode:
+        """
+        Restores the balance of node, whose subtrees are balanced and
+        differ in height by at most two, with one or two rotations.
+
+        Returns:
+            The new root of the subtree.
+        """
+        lh = node.left.height if node.left else 0
+        rh = node.right.height if node.right else 0
+        if lh > rh + 1:
+            left = node.left
+            llh = left.left.height if left.left else 0
+            lrh = left.right.height if left.right else 0
+            if llh < lrh:
+                node.left = self.rotate_left(left)
+            return self.rotate_right(node)
+        if rh > lh + 1:
+            right = node.right
+            rlh = right.left.height if right.left else 0
+            rrh = right.right.height if right.right else 0
+            if rrh < rlh:
+                node.right = self.rotate_right(right)
+            return self.rotate_left(node)
+        node.height = 1 + (lh if lh > rh else rh)
+        return node
+
+    def rotate_left(self, node: AVLNode) -> AVLNode:
+        """
+        Rotates the right child of node up into its place.
+
+        Time: O(1)
+
+        Returns:
+            The new root of the subtree.
+        """
+        r = node.right
+        node.right = r.left
+        r.left = node
+        self._update(node)
+        self._update(r)
+        return r
+
+    def rotate_right(self, node: AVLNode) -> AVLNode:
+        """
+        Rotates the left child of node up into its place.
+
+        Time: O(1)
+
+        Returns:
+            The new root of the subtree.
+        """
+        l = node.left
+        node.left = l.right
+        l.right = node
+        self._update(node)
+        self._update(l)
+        return l
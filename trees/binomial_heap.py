@@ -1,139 +1,325 @@
-import math
+from typing import Any, List
+
+
+class Entry():
+    """
+    A handle to a key (and item) in a BinomialHeap, as returned by
+    insert. Entries move between nodes as keys are swapped, so a handle
+    always finds its key.
+    """
+    __slots__ = ("key", "item", "node")
+
+    def __init__(self, key: Any, item: Any = None) -> None:
+        self.key = key
+        self.item = item
+        self.node: Node = None
 
 
 class Node():
+    """
+    A node of a binomial tree. Siblings form a circular doubly linked
+    list, as do the roots of the heap, so that lists can be spliced
+    together and nodes unlinked in O(1).
+    """
+    __slots__ = ("entry", "parent", "child", "left", "right", "degree")
 
-    def __init__(self, key: int) -> None:
+    def __init__(self, entry: Entry) -> None:
+        self.entry = entry
+        entry.node = self
         self.parent: Node = None
-        self.key: int = key
-        self.degree: int = None
-
-        self.left_child: Node = None
-        self.right_sibling: Node = None
+        self.child: Node = None
+        self.left: Node = self
+        self.right: Node = self
+        self.degree: int = 0
 
     def getOrder(self) -> int:
-        return math.log(self.degree, 2)
+        """
+        The order of the binomial tree rooted here, which has 2^order
+        nodes.
+        """
+        return self.degree
 
 
 class BinomialHeap():
+    """
+    A lazy binomial Min-heap. Insert and meld just add trees to the root
+    list, and the trees of equal order are only linked together
+    (consolidated) when the minimum is extracted, which pays for the
+    laziness. The minimum root is kept up to date throughout:
+        * insert: O(1)
+        * merge / meld: O(1)
+        * min: O(1)
+        * extractMin: O(logn) amortized
+        * decreaseKey: O(logn)
+        * delete: O(logn) amortized
+    """
 
     def __init__(self) -> None:
-        self.head: Node = None
+        self.head: Node = None  # the root with the minimum key
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
 
     @staticmethod
     def mergeTrees(a: Node, b: Node) -> Node:
-        if a.key < b.key:
-            r_small, r_big = a.root, b.root
+        """
+        Links two binomial trees of the same order into one of the next
+        order, with the smaller root on top.
+
+        Time: O(1)
+        """
+        if b.entry.key < a.entry.key:
+            a, b = b, a
+
+        b.parent = a
+        if a.child is None:
+            b.left = b.right = b
         else:
-            r_small, r_big = b.root, a.root
+            BinomialHeap._splice(a.child, b)
+        a.child = b
+        a.degree += 1
+        return a
 
-        r_big.parent = r_small
-        r_big.right_sibling = r_small.left_child
-        r_small.left_child = r_big
-        r_small.degree += 1
-        return r_small
+    @staticmethod
+    def _splice(a: Node, b: Node) -> None:
+        """
+        Joins the circular lists of a and b into one.
+
+        Time: O(1)
+        """
+        a_right, b_left = a.right, b.left
+        a.right, b.left = b, a
+        b_left.right, a_right.left = a_right, b_left
 
     @staticmethod
-    def merge(a: 'BinomialHeap', b: 'BinomialHeap') -> None:
+    def merge(a: 'BinomialHeap', b: 'BinomialHeap') -> 'BinomialHeap':
+        """
+        Merges two heaps into a new one, emptying both of them.
+
+        Time: O(1)
+        """
         result = BinomialHeap()
+        result.meld(a)
+        result.meld(b)
+        return result
 
-        if a.head and b.head and a.head.getOrder() < b.head.getOrder():
-            result.head = a.head
-            a.head = a.head.right_sibling
-        elif a.head and b.head:
-            result.head = b.head
-            b.head = b.head.right_sibling
+    def meld(self, other: 'BinomialHeap') -> None:
+        """
+        Moves every entry of other into this heap, emptying other.
 
-        next = result.head.right_sibling if result.head else result.head
+        Time: O(1)
+        """
+        if other is self or other.head is None:
+            return
+        if self.head is None:
+            self.head = other.head
+        else:
+            BinomialHeap._splice(self.head, other.head)
+            if other.head.entry.key < self.head.entry.key:
+                self.head = other.head
+        self.size += other.size
+        other.head, other.size = None, 0
 
-        # phase 1
-        while a.head and b.head:
-            if a.head.getOrder() < b.head.getOrder():
-                next = a.head
-                a.head = a.head.right_sibling
-            else:
-                next = b.head
-                b.head = b.head.right_sibling
-            next = next.right_sibling
+    def min(self) -> Any:
+        """
+        The minimum key.
+
+        Time: O(1)
+        """
+        return self.head.entry.key
+
+    def insert(self, key: Any, item: Any = None) -> Entry:
+        """
+        Adds key (with an item) to the heap, as a new tree of order 0.
 
-        if next:
-            next.right_sibling = a.head or b.head
+        Time: O(1)
+
+        Returns:
+            The handle of the new entry, for decreaseKey and delete.
+        """
+        entry = Entry(key, item)
+        node = Node(entry)
+        if self.head is None:
+            self.head = node
         else:
-            result.head = a.head or b.head
-
-        # phase 2
-        x = result.head
-        next_x = result.head.right_sibling
-        prev_x = None
-
-        while next_x:
-            order_x = x.getOrder()
-            if next_x.getOrder() != order_x:
-                x = x.right_sibling
-                next_x = next_x.right_sibling
-                prev_x = prev_x.right_sibling if prev_x else result.head
-            elif next_x.getOrder() == order_x and next_x.right_sibling.getOrder() != order_x:
-                x = BinomialHeap.mergeTrees(x, next_x)
-                if prev_x:
-                    prev_x.right_sibling = x
-                next_x = x.right_sibling
-            else:
-                x = x.right_sibling
-                next_x = next_x.right_sibling
-                prev_x = prev_x.right_sibling if prev_x else result.head
+            BinomialHeap._splice(self.head, node)
+            if key < self.head.entry.key:
+                self.head = node
+        self.size += 1
+        return entry
 
-        return result
+    def extractMinEntry(self) -> Entry:
+        """
+        Removes the entry with the minimum key from the heap.
+
+        Time: O(logn) amortized
+        """
+        if self.head is None:
+            raise IndexError("extract from an empty heap")
+        node = self.head
+        self._removeRoot(node)
+        node.entry.node = None
+        return node.entry
 
-    def min(self) -> int:
-        cur_min = self.head
-        current = self.head
-        while current:
-            if current.key < cur_min.key:
-                cur_min = current
-            current = current.right_sibling
-        return cur_min.key
-
-    def extractMin(self) -> int:
-        # find min node in root list
-        cur_min = self.head
-        current = self.head
-        prev = None
-        while current:
-            if current.key < cur_min.key:
-                cur_min = current
-            current = current.right_sibling
-            prev = current
-        if prev:
-            prev.right_sibling = None
-
-        # reverse children of min node
-        prev = None
-        current = cur_min.left_child
-        while current:
-            next = current.right_sibling
-            current.right_sibling = prev
-            prev = current
-            current = next
-        children_head = prev
-
-        # merge heaps
-        self = BinomialHeap.merge(self.head, children_head)
-
-        # return min
-        return cur_min.key
-
-    def insert(self, x: int) -> None:
-        new_item = BinomialHeap()
-        new_item.head = Node(x)
-        self = BinomialHeap.merge(self, new_item)
-
-    def decreaseKey(self, a: Node, new_key: int) -> None:
+    def extractMin(self) -> Any:
+        """
+        Removes the minimum key from the heap.
+
+        Time: O(logn) amortized
+        """
+        return self.extractMinEntry().key
+
+    def decreaseKey(self, a: Entry, new_key: Any) -> None:
+        """
+        Lowers the key of entry a, which must not become greater, by
+        swapping entries up the tree until its parent's key is no greater.
+
+        Time: O(logn)
+        """
+        if a.node is None:
+            raise KeyError("entry is not in the heap")
+        if a.key < new_key:
+            raise ValueError("new key is greater than the current key")
         a.key = new_key
-        while a.key < a.parent.key:
-            temp = a.key
-            a.key = a.parent.key
-            a.parent.key = temp
-
-    def delete(self, a: Node) -> None:
-        self.decreaseKey(a, -math.inf)
-        self.extractMin()
+        node = self._siftUp(a.node, new_key)
+        if node.parent is None and new_key < self.head.entry.key:
+            self.head = node
+
+    def delete(self, a: Entry) -> None:
+        """
+        Removes entry a from the heap, by moving it to the root of its
+        tree as if its key were -inf, then removing that root.
+
+        Time: O(logn) amortized
+        """
+        if a.node is None:
+            raise KeyError("entry is not in the heap")
+        node = self._siftUp(a.node, None)
+        self._removeRoot(node)
+        a.node = None
+
+    def _siftUp(self, node: Node, key: Any) -> Node:
+        """
+        Moves the entry of node up, while its key is less than its
+        parent's (always, if key is None).
+
+        Returns:
+            The node now holding the entry.
+        """
+        entry = node.entry
+        parent = node.parent
+        while parent is not None and (key is None or
+                                      key < parent.entry.key):
+            node.entry = parent.entry
+            node.entry.node = node
+            node = parent
+            parent = node.parent
+        node.entry = entry
+        entry.node = node
+        return node
+
+    def _removeRoot(self, node: Node) -> None:
+        """
+        Removes a root from the root list, moves its children up to the
+        root list and consolidates it.
+        """
+        children = node.child
+        if children is not None:
+            child = children
+            while True:
+                child.parent = None
+                child = child.right
+                if child is children:
+                    break
+
+        if node.right is node:
+            roots = children
+        else:
+            node.left.right, node.right.left = node.right, node.left
+            roots = node.right
+            if children is not None:
+                BinomialHeap._splice(roots, children)
+        node.child = None
+        node.left = node.right = node
+
+        self.size -= 1
+        self.head = roots
+        if roots is not None:
+            self._consolidate()
+
+    def _consolidate(self) -> None:
+        """
+        Links the trees of the root list until no two have the same
+        order, and finds the new minimum root.
+
+        Time: O(logn) amortized, as each link was paid for by the insert
+            or meld that added a tree
+        """
+        by_order: List[Node] = [None] * (self.size.bit_length() + 1)
+
+        # detach the roots first, as linking changes the list
+        roots = []
+        root = self.head
+        while True:
+            roots += [root]
+            root = root.right
+            if root is self.head:
+                break
+
+        for root in roots:
+            root.left = root.right = root
+            while by_order[root.degree] is not None:
+                other = by_order[root.degree]
+                by_order[root.degree] = None
+                root = BinomialHeap.mergeTrees(root, other)
+            by_order[root.degree] = root
+
+        self.head = None
+        for root in by_order:
+            if root is None:
+                continue
+            if self.head is None:
+                self.head = root
+            else:
+                BinomialHeap._splice(self.head, root)
+                if root.entry.key < self.head.entry.key:
+                    self.head = root
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the heap invariant, the shape of the binomial trees, the
+        links between nodes and entries, and the size and minimum.
+        """
+        def check(node: Node, parent: Node) -> int:
+            assert node.parent is parent
+            assert node.entry.node is node
+            if parent is not None:
+                assert not node.entry.key < parent.entry.key
+            size, orders = 1, []
+            if node.child is not None:
+                child = node.child
+                while True:
+                    assert child.right.left is child
+                    size += check(child, node)
+                    orders += [child.degree]
+                    child = child.right
+                    if child is node.child:
+                        break
+            assert sorted(orders) == list(range(node.degree))
+            assert size == 2 ** node.degree
+            return size
+
+        if self.head is None:
+            assert self.size == 0
+            return
+        size = 0
+        root = self.head
+        while True:
+            assert root.right.left is root
+            assert not root.entry.key < self.head.entry.key
+            size += check(root, None)
+            root = root.right
+            if root is self.head:
+                break
+        assert size == self.size
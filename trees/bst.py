@@ -1,4 +1,5 @@
-from typing import List
+from typing import Any, Iterator, List
+from trees.search_tree import ceiling, floor, iter_nodes
 
 
 class BSTNode:
@@ -46,6 +47,7 @@ class BinarySearchTree:
         """
         if not self.head:
             self.head = BSTNode(key)
+            return
         self.head.insert(key)
 
     def search(self, key: int) -> bool:
@@ -57,3 +59,61 @@ class BinarySearchTree:
         if not self.head:
             return False
         return self.head.search(key)
+
+    def iter_range(self, lo: Any = None, hi: Any = None,
+                   reverse: bool = False) -> Iterator[Any]:
+        """
+        Yields the keys in [lo, hi] in order, or in reverse order. None
+        means unbounded. Keys are produced lazily, with an explicit stack.
+
+        Time: O(h + k) for k keys, where h is the height, so O(n) at worst
+        """
+        for node in iter_nodes(self.head, lo, hi, reverse,
+                               left="left_child", right="right_child"):
+            yield node.key
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_range(reverse=True)
+
+    def floor(self, key: Any) -> Any:
+        """
+        The greatest key less than or equal to key, or None.
+
+        Time: O(n)
+        """
+        node = floor(self.head, key,
+                     left="left_child", right="right_child")
+        return node.key if node else None
+
+    def ceiling(self, key: Any) -> Any:
+        """
+        The least key greater than or equal to key, or None.
+
+        Time: O(n)
+        """
+        node = ceiling(self.head, key,
+                       left="left_child", right="right_child")
+        return node.key if node else None
+
+    def predecessor(self, key: Any) -> Any:
+        """
+        The greatest key less than key, or None.
+
+        Time: O(n)
+        """
+        node = floor(self.head, key, strict=True,
+                     left="left_child", right="right_child")
+        return node.key if node else None
+
+    def successor(self, key: Any) -> Any:
+        """
+        The least key greater than key, or None.
+
+        Time: O(n)
+        """
+        node = ceiling(self.head, key, strict=True,
+                       left="left_child", right="right_child")
+        return node.key if node else None
@@ -0,0 +1,198 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class DaryHeap():
+    """
+    A d-ary Min-heap, where every node has up to `arity` children, with
+    the following operations:
+        * push
+        * pop
+        * peek
+        * decrease_key (if indexed)
+        * contains (if indexed)
+
+    Keys and payloads live in parallel flat arrays: keys in a typed
+    `array`, so they are stored unboxed and next to each other, and
+    payloads in a list, so sifting moves two values rather than swapping
+    tuples. A wider heap is shallower, which makes pushes and
+    decrease_key cheaper, at the cost of comparing more children on pop.
+
+    Args:
+        arity: The number of children of each node.
+        typecode: The `array` typecode of the keys, e.g. "d" for float
+            priorities or "q" for 64-bit int ones.
+        items: (key, value) pairs to turn into a heap, in O(n).
+        indexed: Keep track of where each value is, for decrease_key and
+            contains. Values must then be hashable and unique.
+    """
+
+    def __init__(self, arity: int = 4, typecode: str = "d",
+                 items: Iterable[Tuple[Any, Any]] | None = None,
+                 indexed: bool = False):
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+
+        self.arity = arity
+        self.keys = array(typecode)
+        self.vals: List[Any] = []
+        self.pos: Dict[Any, int] | None = {} if indexed else None
+
+        for key, val in items or []:
+            self.keys.append(key)
+            self.vals.append(val)
+        if indexed:
+            self.pos = {val: i for i, val in enumerate(self.vals)}
+            if len(self.pos) != len(self.vals):
+                raise ValueError("values of an indexed heap must be unique")
+        for i in range((len(self.keys) - 2) // arity, -1, -1):
+            self.sink(i)
+
+    def __len__(self) -> int:
+        return len(self.vals)
+
+    def __contains__(self, val: Any) -> bool:
+        return self.contains(val)
+
+    def contains(self, val: Any) -> bool:
+        """
+        Whether val is in an indexed heap.
+
+        Time: O(1)
+        """
+        return val in self._index()
+
+    def key(self, val: Any) -> Any:
+        """
+        The current key of val, in an indexed heap.
+
+        Time: O(1)
+        """
+        return self.keys[self._index()[val]]
+
+    def _index(self) -> Dict[Any, int]:
+        if self.pos is None:
+            raise TypeError("heap is not indexed")
+        return self.pos
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the correctness of the heap invariant.
+        """
+        for i in range(1, len(self.keys)):
+            assert not self.keys[i] < self.keys[(i - 1) // self.arity]
+        if self.pos is not None:
+            assert len(self.pos) == len(self.vals)
+            for i, val in enumerate(self.vals):
+                assert self.pos[val] == i
+
+    def push(self, val: Any, key: Any) -> Any:
+        """
+        Adds val to the heap with priority key. The argument order
+        matches trees.indexed_heap.IndexedHeap.push.
+
+        Time: O(log_d(n))
+
+        Returns:
+            The handle of val, which is val itself.
+        """
+        if self.pos is not None:
+            if val in self.pos:
+                raise ValueError(f"{val!r} is already in the heap")
+            self.pos[val] = len(self.vals)
+        self.keys.append(key)
+        self.vals.append(val)
+        self.rise(len(self.vals) - 1)
+        return val
+
+    def peek(self) -> Tuple[Any, Any]:
+        """
+        Returns the minimum (key, value) without removing it.
+
+        Time: O(1)
+        """
+        return self.keys[0], self.vals[0]
+
+    def pop(self) -> Tuple[Any, Any]:
+        """
+        Pops the minimum (key, value) off of the heap.
+
+        Time: O(d*log_d(n))
+        """
+        keys, vals = self.keys, self.vals
+        key, val = keys[0], vals[0]
+        last_key, last_val = keys.pop(), vals.pop()
+        if self.pos is not None:
+            del self.pos[val]
+        if vals:
+            keys[0], vals[0] = last_key, last_val
+            if self.pos is not None:
+                self.pos[last_val] = 0
+            self.sink(0)
+        return key, val
+
+    def decrease_key(self, val: Any, key: Any) -> None:
+        """
+        Lowers the key of val, in an indexed heap. The new key must not
+        be greater than the current one.
+
+        Time: O(log_d(n))
+        """
+        idx = self._index()[val]
+        if self.keys[idx] < key:
+            raise ValueError("new key is greater than the current key")
+        self.keys[idx] = key
+        self.rise(idx)
+
+    def rise(self, idx: int) -> None:
+        """
+        Moves the element at idx up until the heap invariant is restored.
+
+        Time: O(log_d(n))
+        """
+        keys, vals, pos, d = self.keys, self.vals, self.pos, self.arity
+        key, val = keys[idx], vals[idx]
+        while idx > 0:
+            par = (idx - 1) // d
+            if not key < keys[par]:
+                break
+            keys[idx] = keys[par]
+            vals[idx] = vals[par]
+            if pos is not None:
+                pos[vals[idx]] = idx
+            idx = par
+        keys[idx] = key
+        vals[idx] = val
+        if pos is not None:
+            pos[val] = idx
+
+    def sink(self, idx: int) -> None:
+        """
+        Moves the element at idx down, swapping it with its lowest child,
+        until the heap invariant is restored.
+
+        Time: O(d*log_d(n))
+        """
+        keys, vals, pos, d = self.keys, self.vals, self.pos, self.arity
+        n = len(keys)
+        key, val = keys[idx], vals[idx]
+        first = d * idx + 1
+        while first < n:
+            # pick the lowest of the up to d children
+            child = first
+            min_key = keys[first]
+            for c in range(first + 1, min(first + d, n)):
+                if keys[c] < min_key:
+                    child, min_key = c, keys[c]
+            if not min_key < key:
+                break
+            keys[idx] = min_key
+            vals[idx] = vals[child]
+            if pos is not None:
+                pos[vals[idx]] = idx
+            idx = child
+            first = d * idx + 1
+        keys[idx] = key
+        vals[idx] = val
+        if pos is not None:
+            pos[val] = idx
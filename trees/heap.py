@@ -1,31 +1,72 @@
-from typing import List, TypeVar, Generic, Callable
+import itertools
+import math
+from typing import Any, Callable, Generic, Iterable, List, TypeVar
 
 
 T = TypeVar("T")
 
 
+def less_than(a, b) -> bool:
+    """
+    The default heap invariant, for a Min-heap. Heaps using it compare
+    their items directly with `<`, rather than calling the invariant.
+    """
+    return a < b
+
+
 class Heap(Generic[T]):
     """
     A basic, generic binary heap data structure with the following operations:
         * insert
         * pop
+        * replace
+        * pushpop
+        * peek
+        * extend
+        * nsmallest
 
     Args:
-        lst: A list to turn into a heap
+        lst: A list to turn into a heap, in O(n).
         invariant: The heap invariant (a comparison function).
             If not provided will default to `less than`.
+        key: Orders items by key(item) in a Min-heap, instead of using an
+            invariant. Each key is computed once, and stored next to its
+            item in `heap` as a (key, count, item) entry, where count
+            breaks ties in insertion order, so that items are never
+            compared and the invariant is never called.
     """
 
-    def __init__(self, lst: List[T] = [],
-                 invariant: Callable = lambda a, b: a < b):
-        self.heap: List[T] = []
+    def __init__(self, lst: Iterable[T] | None = None,
+                 invariant: Callable = less_than,
+                 key: Callable[[T], Any] | None = None):
+        if key is not None and invariant is not less_than:
+            raise ValueError("key and invariant can't both be given")
+
         self.invariant = invariant
-        for x in lst:
-            self.insert(x)
+        self.key = key
+        self._count = itertools.count()
+        items = [] if lst is None else lst
+        self.heap: List[T] = [self._entry(x) for x in items]
+        self.heapify()
 
     def __len__(self) -> int:
         return len(self.heap)
 
+    def _entry(self, item: T) -> Any:
+        """
+        What is stored in the heap for item: the item itself, or a
+        (key, count, item) entry in key mode.
+        """
+        if self.key is None:
+            return item
+        return (self.key(item), next(self._count), item)
+
+    def _item(self, entry: Any) -> T:
+        """
+        The item stored in a heap entry.
+        """
+        return entry if self.key is None else entry[2]
+
     def assert_correctness(self) -> None:
         """
         Asserts the correctness of the heap invariant.
@@ -35,9 +76,21 @@ class Heap(Generic[T]):
             left = 2 * i + 1
             right = 2 * i + 2
             if left in range(0, n):
-                assert self.invariant(self.heap[i], self.heap[left])
+                assert not self.invariant(self.heap[left], self.heap[i])
             if right in range(0, n):
-                assert not self.invariant(self.heap[i], self.heap[right])
+                assert not self.invariant(self.heap[right], self.heap[i])
+
+    def heapify(self) -> None:
+        """
+        Restores the heap invariant over the whole heap, by sinking every
+        internal node, from the last one up to the root (Floyd's method).
+        Most nodes are near the bottom and only sink a level or two.
+
+        Time: O(n)
+        """
+        n = len(self.heap)
+        for i in range(n // 2 - 1, -1, -1):
+            self.sink(i, n)
 
     def insert(self, item: T) -> None:
         """
@@ -46,10 +99,29 @@ class Heap(Generic[T]):
         Time: O(logn)
         """
         # add the item to the back of the heap
-        self.heap.append(item)
+        self.heap.append(self._entry(item))
         # rise the element until heap invariant is maintained
         self.rise(len(self.heap) - 1)
 
+    def extend(self, items: Iterable[T]) -> None:
+        """
+        Adds many elements to the heap. A batch which is large compared
+        to the heap is appended and the whole heap re-heapified, which is
+        cheaper than rising each element; smaller batches are inserted
+        one at a time.
+
+        Time: O(min(klogn, n+k)), where k is the number of new elements
+        """
+        entries = [self._entry(x) for x in items]
+        n = len(self.heap) + len(entries)
+        if len(entries) * math.log2(n + 1) > n:
+            self.heap += entries
+            self.heapify()
+        else:
+            for entry in entries:
+                self.heap.append(entry)
+                self.rise(len(self.heap) - 1)
+
     def pop(self) -> T:
         """
         Pops the minimum element off of the heap.
@@ -59,13 +131,78 @@ class Heap(Generic[T]):
         min = self.heap[0]
         if len(self.heap) == 1:
             self.heap.pop(0)
-            return min
+            return self._item(min)
 
         # replace the top (min) element with the last element in the heap
         self.heap[0] = self.heap.pop(-1)
         # sink the element down until heap invariant is maintained
         self.sink(0, len(self))
-        return min
+        return self._item(min)
+
+    def peek(self) -> T:
+        """
+        Returns the minimum element without removing it.
+
+        Time: O(1)
+        """
+        return self._item(self.heap[0])
+
+    def replace(self, item: T) -> T:
+        """
+        Pops the minimum element off of the heap and adds item, with a
+        single sink rather than a sink and a rise. The popped element may
+        be greater than item.
+
+        Time: O(logn)
+        """
+        min = self.heap[0]
+        self.heap[0] = self._entry(item)
+        self.sink(0, len(self))
+        return self._item(min)
+
+    def pushpop(self, item: T) -> T:
+        """
+        Adds item to the heap, then pops the minimum element off of it,
+        with at most a single sink. If item would be the minimum, it is
+        returned straight away without touching the heap.
+
+        Time: O(logn)
+        """
+        entry = self._entry(item)
+        if not self.heap or not self.invariant(self.heap[0], entry):
+            return item
+        min = self.heap[0]
+        self.heap[0] = entry
+        self.sink(0, len(self))
+        return self._item(min)
+
+    def nsmallest(self, n: int) -> List[T]:
+        """
+        Returns the first n elements in heap order (the n smallest, for a
+        Min-heap), without changing the heap. The candidates for the next
+        element are kept in a second heap, which starts from the root and
+        gains the two children of each element taken from it.
+
+        Time: O(nlogn), independent of the size of the heap
+        """
+        heap = self.heap
+        if n <= 0 or not heap:
+            return []
+
+        if self.invariant is less_than:
+            cand_invariant = less_than
+        else:
+            cand_invariant = lambda a, b: self.invariant(a[0], b[0])
+        candidates = Heap([(heap[0], 0)], cand_invariant)
+
+        res = []
+        while candidates and len(res) < n:
+            entry, i = candidates.pop()
+            res += [self._item(entry)]
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    candidates.insert((heap[child], child))
+        return res
 
     def sink(self, idx: int, end: int) -> None:
         """
@@ -78,13 +215,56 @@ class Heap(Generic[T]):
         Args:
             end: An index for when to swap until. Used by Heapsort.
         """
-        next = self.min_child_idx(idx, end)
-        while (next and next < end
-               and not self.invariant(self.heap[idx], self.heap[next])):
-            # swap the current element with the lower child
-            self.heap[idx], self.heap[next] = self.heap[next], self.heap[idx]
-            idx = next
-            next = self.min_child_idx(idx)
+        if self.invariant is less_than:
+            self._sift_down_lt(idx, end)
+            return
+
+        heap = self.heap
+        invariant = self.invariant
+        item = heap[idx]
+        child = 2 * idx + 1
+        while child < end:
+            # pick the lower child
+            right = child + 1
+            if right < end and invariant(heap[right], heap[child]):
+                child = right
+            if not invariant(heap[child], item):
+                break
+            heap[idx] = heap[child]
+            idx = child
+            child = 2 * idx + 1
+        heap[idx] = item
+
+    def _sift_down_lt(self, idx: int, end: int) -> None:
+        """
+        Restores a heap using the `less_than` invariant below idx, given
+        that only the element at idx may be out of place. The hole at idx
+        is moved down to a leaf, promoting the lower child each time, and
+        the element is then risen back up from there, which usually takes
+        a level or two. Compares with `<` directly.
+
+        Time: O(logn)
+        """
+        heap = self.heap
+        item = heap[idx]
+        start = idx
+
+        child = 2 * idx + 1
+        while child < end:
+            right = child + 1
+            if right < end and not heap[child] < heap[right]:
+                child = right
+            heap[idx] = heap[child]
+            idx = child
+            child = 2 * idx + 1
+
+        while idx > start:
+            par = (idx - 1) // 2
+            if not item < heap[par]:
+                break
+            heap[idx] = heap[par]
+            idx = par
+        heap[idx] = item
 
     def rise(self, idx: int) -> None:
         """
@@ -93,23 +273,37 @@ class Heap(Generic[T]):
 
         Time: O(logn)
         """
-        par = (idx - 1) // 2
-        while idx > 0 and not self.invariant(self.heap[par], self.heap[idx]):
-            # swap the current element with its parent
-            self.heap[idx], self.heap[par] = self.heap[par], self.heap[idx]
-            par, idx = (par - 1) // 2, par
-    
+        heap = self.heap
+        item = heap[idx]
+        if self.invariant is less_than:
+            while idx > 0:
+                par = (idx - 1) // 2
+                if not item < heap[par]:
+                    break
+                heap[idx] = heap[par]
+                idx = par
+        else:
+            invariant = self.invariant
+            while idx > 0:
+                par = (idx - 1) // 2
+                if invariant(heap[par], item):
+                    break
+                heap[idx] = heap[par]
+                idx = par
+        heap[idx] = item
+
     def update_key(self, idx: int, key: T) -> None:
         """
         Updates the value of the heap at index idx with the value key.
 
         Time: O(logn)
         """
-        if not self.invariant(key, self.heap[idx]):
-            self.heap[idx] = key
+        entry = self._entry(key)
+        if not self.invariant(entry, self.heap[idx]):
+            self.heap[idx] = entry
             self.sink(idx, len(self))
         else:
-            self.heap[idx] = key
+            self.heap[idx] = entry
             self.rise(idx)
 
     def min_child_idx(self, v: int, end: int | None = None) -> int | None:
@@ -121,11 +315,12 @@ class Heap(Generic[T]):
         Args:
             end: A max index to consider. Used by Heapsort.
         """
+        n = len(self.heap) if end is None else end
         left = 2 * v + 1
         right = 2 * v + 2
-        if left > len(self.heap) - 1:
+        if left >= n:
             return None
-        elif left == len(self.heap) - 1 or right == end:
+        elif right >= n:
             return left
         elif self.invariant(self.heap[left], self.heap[right]):
             return left
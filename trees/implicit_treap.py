@@ -0,0 +1,371 @@
+import random
+from typing import Any, Iterable, Iterator, List, Tuple
+
+
+class ImplicitTreapNode:
+    """
+    A node of an implicit treap. It has no key: its position is the
+    number of nodes before it in order, which is worked out from subtree
+    sizes on the way down.
+    """
+    __slots__ = ("value", "prio", "left", "right", "size", "rev",
+                 "sum", "min")
+
+    def __init__(self, value: Any, prio: float | None = None) -> None:
+        self.value = value
+        self.prio: float = random.random() if prio is None else prio
+        self.left: ImplicitTreapNode | None = None
+        self.right: ImplicitTreapNode | None = None
+        self.size = 1
+        self.rev = False  # the children of this subtree are to be swapped
+        self.sum = value
+        self.min = value
+
+
+class ImplicitTreap:
+    """
+    A sequence stored as a treap keyed by position: the randomized treap
+    of trees/treap.py, with a min-heap over random priorities, but
+    ordered by position instead of by key. Every edit is a few splits and
+    joins at positions, so inserting or deleting in the middle doesn't
+    shift the items after it, as it does in a list:
+        * insert_at, delete_at, __getitem__: O(logn)
+        * concat, cut, reverse: O(logn)
+        * slice: O(logn + k) for k items
+        * sum, min over a range: O(logn), if aggregates are kept
+
+    Reversing a range only flags the root of its subtree, and the flag is
+    pushed down to the children of a node whenever something passes
+    through it (lazy propagation). Splits and joins walk a single path
+    with loops, so nothing recurses.
+
+    Args:
+        items: The initial sequence, built in O(n).
+        aggregates: Keep the sum and min of every subtree, for range sum
+            and min queries. The items must then support + and <.
+    """
+
+    def __init__(self, items: Iterable[Any] = (),
+                 aggregates: bool = False) -> None:
+        self.aggregates = aggregates
+        self.root = self._build(items)
+
+    def __len__(self) -> int:
+        return self.root.size if self.root else 0
+
+    def _build(self, items: Iterable[Any]) -> ImplicitTreapNode | None:
+        """
+        Builds a treap over items in order, as a Cartesian tree on the
+        priorities, with the right spine on a stack.
+
+        Time: O(n)
+        """
+        spine: List[ImplicitTreapNode] = []
+        for value in items:
+            node = ImplicitTreapNode(value)
+            last = None
+            while spine and spine[-1].prio > node.prio:
+                last = spine.pop()
+                self._update(last)
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine += [node]
+        for node in reversed(spine):
+            self._update(node)
+        return spine[0] if spine else None
+
+    def _update(self, node: ImplicitTreapNode) -> None:
+        """
+        Recomputes the size (and aggregates) of node from its children.
+        """
+        left, right = node.left, node.right
+        size = 1
+        if left:
+            size += left.size
+        if right:
+            size += right.size
+        node.size = size
+
+        if self.aggregates:
+            total = low = node.value
+            if left:
+                total = left.sum + total
+                if left.min < low:
+                    low = left.min
+            if right:
+                total = total + right.sum
+                if right.min < low:
+                    low = right.min
+            node.sum, node.min = total, low
+
+    @staticmethod
+    def _push(node: ImplicitTreapNode) -> None:
+        """
+        Applies a pending reverse to node's children, and passes it on to
+        theirs.
+        """
+        if node.rev:
+            node.left, node.right = node.right, node.left
+            if node.left:
+                node.left.rev = not node.left.rev
+            if node.right:
+                node.right.rev = not node.right.rev
+            node.rev = False
+
+    def _split(self, node: ImplicitTreapNode | None, k: int) -> Tuple:
+        """
+        Splits the sub-treap rooted at node into its first k items and
+        the rest, hanging the nodes passed on the way down onto the right
+        spine of the first part or the left spine of the second.
+
+        Time: O(logn)
+        """
+        left_head = ImplicitTreapNode(None, 0.0)
+        right_head = ImplicitTreapNode(None, 0.0)
+        left_tail, right_tail = left_head, right_head
+        path = []
+        while node:
+            self._push(node)
+            path += [node]
+            left_size = node.left.size if node.left else 0
+            if k <= left_size:
+                right_tail.left = node
+                right_tail = node
+                node = node.left
+            else:
+                left_tail.right = node
+                left_tail = node
+                k -= left_size + 1
+                node = node.right
+        left_tail.right = None
+        right_tail.left = None
+        for node in reversed(path):
+            self._update(node)
+        return left_head.right, right_head.left
+
+    def _join(self, a: ImplicitTreapNode | None,
+              b: ImplicitTreapNode | None) -> ImplicitTreapNode | None:
+        """
+        Joins two sub-treaps, the items of a followed by those of b, by
+        merging the right spine of a with the left spine of b in priority
+        order.
+
+        Time: O(logn)
+        """
+        head = ImplicitTreapNode(None, 0.0)
+        tail, from_a = head, True
+        path = []
+        while a and b:
+            if a.prio < b.prio:
+                self._push(a)
+                child, a, next_from_a = a, a.right, True
+            else:
+                self._push(b)
+                child, b, next_from_a = b, b.left, False
+            if from_a:
+                tail.right = child
+            else:
+                tail.left = child
+            tail, from_a = child, next_from_a
+            path += [child]
+
+        if from_a:
+            tail.right = a or b
+        else:
+            tail.left = a or b
+        for node in reversed(path):
+            self._update(node)
+        return head.right
+
+    def _index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("index out of range")
+        return i
+
+    def _range(self, i: int, j: int) -> Tuple[int, int]:
+        """
+        Normalizes [i, j) like a slice of a list of the same length.
+        """
+        r = range(len(self))[i:j]
+        return r.start, max(r.start, r.stop)
+
+    def __getitem__(self, i: int) -> Any:
+        """
+        The item at position i.
+
+        Time: O(logn)
+        """
+        i = self._index(i)
+        node = self.root
+        while True:
+            self._push(node)
+            left_size = node.left.size if node.left else 0
+            if i < left_size:
+                node = node.left
+            elif i == left_size:
+                return node.value
+            else:
+                i -= left_size + 1
+                node = node.right
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the items in order, with an explicit stack.
+
+        Time: O(n)
+        """
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                self._push(node)
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+
+    def insert_at(self, i: int, value: Any) -> None:
+        """
+        Inserts value before position i (at the end, if i is the length).
+
+        Time: O(logn)
+        """
+        i = max(0, min(i + len(self) if i < 0 else i, len(self)))
+        left, right = self._split(self.root, i)
+        node = ImplicitTreapNode(value)
+        self.root = self._join(self._join(left, node), right)
+
+    def append(self, value: Any) -> None:
+        """
+        Adds value at the end.
+
+        Time: O(logn)
+        """
+        self.root = self._join(self.root, ImplicitTreapNode(value))
+
+    def delete_at(self, i: int) -> Any:
+        """
+        Removes the item at position i.
+
+        Time: O(logn)
+
+        Returns:
+            The item removed.
+        """
+        i = self._index(i)
+        left, rest = self._split(self.root, i)
+        node, right = self._split(rest, 1)
+        self.root = self._join(left, right)
+        return node.value
+
+    def cut(self, i: int, j: int) -> 'ImplicitTreap':
+        """
+        Removes the items in positions [i, j), and returns them as a
+        treap of their own.
+
+        Time: O(logn)
+        """
+        i, j = self._range(i, j)
+        left, rest = self._split(self.root, i)
+        middle, right = self._split(rest, j - i)
+        self.root = self._join(left, right)
+        res = ImplicitTreap(aggregates=self.aggregates)
+        res.root = middle
+        return res
+
+    def slice(self, i: int, j: int) -> 'ImplicitTreap':
+        """
+        A copy of the items in positions [i, j), as a new treap.
+
+        Time: O(logn + k) for k items
+        """
+        i, j = self._range(i, j)
+        left, rest = self._split(self.root, i)
+        middle, right = self._split(rest, j - i)
+        res = ImplicitTreap(aggregates=self.aggregates)
+        res.root = middle
+        copy = ImplicitTreap(res, self.aggregates)
+        self.root = self._join(self._join(left, middle), right)
+        return copy
+
+    def concat(self, other: 'ImplicitTreap') -> None:
+        """
+        Appends the items of other, leaving other empty.
+
+        Time: O(logn)
+        """
+        if other.aggregates != self.aggregates:
+            raise ValueError("both treaps must keep the same aggregates")
+        self.root = self._join(self.root, other.root)
+        other.root = None
+
+    def reverse(self, i: int = 0, j: int | None = None) -> None:
+        """
+        Reverses the items in positions [i, j), lazily.
+
+        Time: O(logn)
+        """
+        i, j = self._range(i, len(self) if j is None else j)
+        left, rest = self._split(self.root, i)
+        middle, right = self._split(rest, j - i)
+        if middle:
+            middle.rev = not middle.rev
+        self.root = self._join(self._join(left, middle), right)
+
+    def _aggregate(self, i: int, j: int, field: str) -> Any:
+        if not self.aggregates:
+            raise TypeError("treap doesn't keep aggregates")
+        i, j = self._range(i, j)
+        if i == j:
+            raise ValueError("empty range")
+        left, rest = self._split(self.root, i)
+        middle, right = self._split(rest, j - i)
+        res = getattr(middle, field)
+        self.root = self._join(self._join(left, middle), right)
+        return res
+
+    def sum(self, i: int = 0, j: int | None = None) -> Any:
+        """
+        The sum of the items in positions [i, j).
+
+        Time: O(logn)
+        """
+        return self._aggregate(i, len(self) if j is None else j, "sum")
+
+    def min(self, i: int = 0, j: int | None = None) -> Any:
+        """
+        The least item in positions [i, j).
+
+        Time: O(logn)
+        """
+        return self._aggregate(i, len(self) if j is None else j, "min")
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the heap invariant over the priorities, and the sizes and
+        aggregates of every node.
+        """
+        for node in self._nodes():
+            for child in (node.left, node.right):
+                if child:
+                    assert not child.prio < node.prio
+            size = 1 + sum(c.size for c in (node.left, node.right) if c)
+            assert node.size == size
+            if self.aggregates:
+                values = [node.value] + [c.sum for c in (node.left, node.right)
+                                         if c]
+                mins = [node.value] + [c.min for c in (node.left, node.right)
+                                       if c]
+                assert node.sum == sum(values) and node.min == min(mins)
+
+    def _nodes(self) -> Iterator[ImplicitTreapNode]:
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node
+            stack += [c for c in (node.left, node.right) if c]
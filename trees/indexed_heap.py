@@ -0,0 +1,192 @@
+from typing import Any, Dict, Generic, Hashable, List, Tuple, TypeVar
+
+
+T = TypeVar("T", bound=Hashable)
+
+
+class IndexedHeap(Generic[T]):
+    """
+    An addressable binary Min-heap of items, each with a key, which keeps
+    track of where every item is in the heap, so that keys can be
+    changed and items removed without searching for them:
+        * push
+        * pop
+        * peek
+        * decrease_key
+        * increase_key
+        * remove
+        * contains
+
+    Items must be hashable and unique within the heap. The handle of an
+    item is the item itself, e.g. a vertex. Keys and items are kept in
+    parallel lists, so sifting moves them without building tuples, and
+    items themselves are never compared.
+    """
+
+    def __init__(self):
+        self.keys: List[Any] = []
+        self.items: List[T] = []
+        self.pos: Dict[T, int] = {}  # item -> index in the heap
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self.pos
+
+    def contains(self, item: T) -> bool:
+        """
+        Whether item is in the heap.
+
+        Time: O(1)
+        """
+        return item in self.pos
+
+    def key(self, item: T) -> Any:
+        """
+        The current key of item.
+
+        Time: O(1)
+        """
+        return self.keys[self.pos[item]]
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the correctness of the heap invariant and of the index.
+        """
+        n = len(self.items)
+        for i in range(n):
+            assert self.pos[self.items[i]] == i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n:
+                    assert not self.keys[child] < self.keys[i]
+        assert len(self.pos) == n
+
+    def push(self, item: T, key: Any) -> T:
+        """
+        Adds item to the heap with the given key.
+
+        Time: O(logn)
+
+        Returns:
+            The handle of item, which is item itself.
+        """
+        if item in self.pos:
+            raise ValueError(f"{item!r} is already in the heap")
+        self.keys.append(key)
+        self.items.append(item)
+        self.pos[item] = len(self.items) - 1
+        self.rise(len(self.items) - 1)
+        return item
+
+    def peek(self) -> Tuple[Any, T]:
+        """
+        Returns the minimum (key, item) without removing it.
+
+        Time: O(1)
+        """
+        return self.keys[0], self.items[0]
+
+    def pop(self) -> Tuple[Any, T]:
+        """
+        Pops the item with the minimum key off of the heap.
+
+        Time: O(logn)
+
+        Returns:
+            (key, item)
+        """
+        key, item = self.keys[0], self.items[0]
+        self.remove(item)
+        return key, item
+
+    def decrease_key(self, item: T, key: Any) -> None:
+        """
+        Lowers the key of item, which must not be greater than its
+        current key.
+
+        Time: O(logn)
+        """
+        idx = self.pos[item]
+        if self.keys[idx] < key:
+            raise ValueError("new key is greater than the current key")
+        self.keys[idx] = key
+        self.rise(idx)
+
+    def increase_key(self, item: T, key: Any) -> None:
+        """
+        Raises the key of item, which must not be less than its current
+        key.
+
+        Time: O(logn)
+        """
+        idx = self.pos[item]
+        if key < self.keys[idx]:
+            raise ValueError("new key is less than the current key")
+        self.keys[idx] = key
+        self.sink(idx)
+
+    def remove(self, item: T) -> Any:
+        """
+        Removes item from the heap, wherever it is.
+
+        Time: O(logn)
+
+        Returns:
+            The key item had.
+        """
+        idx = self.pos.pop(item)
+        key = self.keys[idx]
+
+        # move the last element into the hole, then restore the heap
+        last_key, last_item = self.keys.pop(), self.items.pop()
+        if idx < len(self.items):
+            self.keys[idx], self.items[idx] = last_key, last_item
+            self.pos[last_item] = idx
+            if last_key < key:
+                self.rise(idx)
+            else:
+                self.sink(idx)
+        return key
+
+    def rise(self, idx: int) -> None:
+        """
+        Moves the element at idx up until the heap invariant is restored.
+
+        Time: O(logn)
+        """
+        keys, items, pos = self.keys, self.items, self.pos
+        key, item = keys[idx], items[idx]
+        while idx > 0:
+            par = (idx - 1) // 2
+            if not key < keys[par]:
+                break
+            keys[idx], items[idx] = keys[par], items[par]
+            pos[items[idx]] = idx
+            idx = par
+        keys[idx], items[idx] = key, item
+        pos[item] = idx
+
+    def sink(self, idx: int) -> None:
+        """
+        Moves the element at idx down, swapping it with its lowest child,
+        until the heap invariant is restored.
+
+        Time: O(logn)
+        """
+        keys, items, pos = self.keys, self.items, self.pos
+        n = len(keys)
+        key, item = keys[idx], items[idx]
+        child = 2 * idx + 1
+        while child < n:
+            right = child + 1
+            if right < n and keys[right] < keys[child]:
+                child = right
+            if not keys[child] < key:
+                break
+            keys[idx], items[idx] = keys[child], items[child]
+            pos[items[idx]] = idx
+            idx = child
+            child = 2 * idx + 1
+        keys[idx], items[idx] = key, item
+        pos[item] = idx
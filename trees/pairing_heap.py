@@ -0,0 +1,210 @@
+from typing import Any, Tuple
+
+
+class Node():
+    """
+    A node of a pairing heap, and the handle of its item. The children
+    of a node form a linked list from its child, through sibling; prev
+    points to the left sibling, or to the parent for the first child.
+    """
+    __slots__ = ("key", "item", "child", "sibling", "prev")
+
+    def __init__(self, key: Any, item: Any = None) -> None:
+        self.key = key
+        self.item = item
+        self.child: Node = None
+        self.sibling: Node = None
+        self.prev: Node = None
+
+
+class PairingHeap():
+    """
+    A pairing Min-heap: a heap-ordered tree with any number of children
+    per node, which is only restructured when the minimum is popped.
+        * push: O(1)
+        * meld: O(1)
+        * peek: O(1)
+        * pop: O(logn) amortized
+        * decrease_key: O(logn) amortized, and o(logn) in practice
+        * remove: O(logn) amortized
+
+    push returns the node of the item, which is its handle for
+    decrease_key and remove. Only the keys are compared.
+    """
+
+    def __init__(self) -> None:
+        self.root: Node = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def link(a: Node, b: Node) -> Node:
+        """
+        Links two trees, making the root with the greater key the first
+        child of the other.
+
+        Time: O(1)
+        """
+        if b.key < a.key:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    def push(self, item: Any, key: Any) -> Node:
+        """
+        Adds item to the heap with the given key.
+
+        Time: O(1)
+
+        Returns:
+            The handle of item, for decrease_key and remove.
+        """
+        node = Node(key, item)
+        self.root = node if self.root is None else self.link(self.root, node)
+        self.size += 1
+        return node
+
+    def meld(self, other: 'PairingHeap') -> None:
+        """
+        Moves every item of other into this heap, emptying other.
+
+        Time: O(1)
+        """
+        if other is self or other.root is None:
+            return
+        if self.root is None:
+            self.root = other.root
+        else:
+            self.root = self.link(self.root, other.root)
+        self.size += other.size
+        other.root, other.size = None, 0
+
+    def peek(self) -> Tuple[Any, Any]:
+        """
+        Returns the minimum (key, item) without removing it.
+
+        Time: O(1)
+        """
+        return self.root.key, self.root.item
+
+    def pop(self) -> Tuple[Any, Any]:
+        """
+        Pops the item with the minimum key off of the heap, and merges the
+        children of the root in two passes: linking them in pairs from
+        left to right, then linking the pairs from right to left.
+
+        Time: O(logn) amortized
+
+        Returns:
+            (key, item)
+        """
+        if self.root is None:
+            raise IndexError("pop from an empty heap")
+        root = self.root
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        self.size -= 1
+        return root.key, root.item
+
+    def decrease_key(self, node: Node, key: Any) -> None:
+        """
+        Lowers the key of the item of node, which must not be greater than
+        its current key, by cutting its subtree out and linking it back
+        to the root.
+
+        Time: O(logn) amortized
+        """
+        if node.key < key:
+            raise ValueError("new key is greater than the current key")
+        node.key = key
+        if node is self.root:
+            return
+        self._cut(node)
+        self.root = self.link(self.root, node)
+
+    def remove(self, node: Node) -> None:
+        """
+        Removes the item of node from the heap.
+
+        Time: O(logn) amortized
+        """
+        if node is not self.root:
+            self._cut(node)
+            node.sibling = None
+            children = self._merge_pairs(node.child)
+            node.child = None
+            if children is not None:
+                self.root = self.link(self.root, children)
+            self.size -= 1
+        else:
+            self.pop()
+
+    def _cut(self, node: Node) -> None:
+        """
+        Detaches the subtree of node from its parent and siblings.
+        """
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _merge_pairs(self, first: Node) -> Node:
+        """
+        Merges a list of siblings into one tree with the two-pass
+        pairing, without recursion.
+
+        Returns:
+            The root of the merged tree, or None.
+        """
+        if first is None:
+            return None
+
+        # first pass: link pairs, left to right
+        pairs = []
+        node = first
+        while node is not None:
+            a, b = node, node.sibling
+            if b is None:
+                node = None
+            else:
+                node = b.sibling
+                b.prev = b.sibling = None
+            a.prev = a.sibling = None
+            pairs += [a if b is None else self.link(a, b)]
+
+        # second pass: link the pairs, right to left
+        root = pairs.pop()
+        while pairs:
+            root = self.link(pairs.pop(), root)
+        return root
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the heap invariant, the links between nodes and the size.
+        """
+        if self.root is None:
+            assert self.size == 0
+            return
+        assert self.root.prev is None and self.root.sibling is None
+        size = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            size += 1
+            prev = node
+            child = node.child
+            while child is not None:
+                assert child.prev is prev
+                assert not child.key < node.key
+                stack += [child]
+                prev, child = child, child.sibling
+        assert size == self.size
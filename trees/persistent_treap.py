@@ -0,0 +1,254 @@
+import random
+from typing import Any, Iterable, Iterator, List, Tuple
+
+
+class PersistentTreapNode:
+    """
+    A node of a persistent treap. Nodes are never changed once they are
+    part of a treap, as any number of versions may share them: updates
+    copy the nodes they would have changed instead.
+    """
+    __slots__ = ("key", "prio", "left", "right", "size")
+
+    def __init__(self, key: Any, prio: float,
+                 left: 'PersistentTreapNode | None' = None,
+                 right: 'PersistentTreapNode | None' = None) -> None:
+        self.key = key
+        self.prio = prio
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left else 0) \
+            + (right.size if right else 0)
+
+
+class PersistentTreap:
+    """
+    A persistent (immutable) randomized treap over a set of keys. Every
+    update returns a new treap and leaves the old one as it was. Only
+    the nodes on the path an update walks are copied (path copying),
+    and every other subtree is shared between the old and new versions,
+    so keeping a version is free and each update costs O(logn) nodes:
+        * snapshot: O(1), the treap itself is one
+        * insert, delete, split, join: O(logn) time and memory
+        * contains: O(logn)
+
+    Nothing recurses: paths are walked with loops, and the copies are
+    built from the bottom of the path up.
+    """
+
+    def __init__(self, root: PersistentTreapNode | None = None) -> None:
+        self.root = root
+
+    def __len__(self) -> int:
+        return self.root.size if self.root else 0
+
+    def __contains__(self, key: Any) -> bool:
+        return self.contains(key)
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any]) -> 'PersistentTreap':
+        """
+        Builds a treap from keys in strictly increasing order, as a
+        Cartesian tree on random priorities.
+
+        Time: O(n)
+        """
+        spine: List[PersistentTreapNode] = []
+        prev = None
+        for key in keys:
+            if spine and not prev < key:
+                raise ValueError("keys must be strictly increasing")
+            prev = key
+
+            # the nodes aren't shared with anything yet, so they can
+            # still be changed in place
+            node = PersistentTreapNode(key, random.random())
+            last = None
+            while spine and spine[-1].prio > node.prio:
+                last = spine.pop()
+                cls._resize(last)
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine += [node]
+        for node in reversed(spine):
+            cls._resize(node)
+        return cls(spine[0] if spine else None)
+
+    @staticmethod
+    def _resize(node: PersistentTreapNode) -> None:
+        node.size = 1 + (node.left.size if node.left else 0) \
+            + (node.right.size if node.right else 0)
+
+    def contains(self, key: Any) -> bool:
+        """
+        Whether key is in the treap.
+
+        Time: O(logn)
+        """
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the keys in order, with an explicit stack.
+
+        Time: O(n)
+        """
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    @staticmethod
+    def _rebuild(path: List[Tuple[PersistentTreapNode, bool]],
+                 sub: PersistentTreapNode | None
+                 ) -> PersistentTreapNode | None:
+        """
+        Copies the nodes of path, from the bottom up, replacing the child
+        each one was left by (its left child if the flag is set) with the
+        new subtree below it.
+
+        Returns:
+            The new root.
+        """
+        for node, went_left in reversed(path):
+            if went_left:
+                sub = PersistentTreapNode(node.key, node.prio, sub, node.right)
+            else:
+                sub = PersistentTreapNode(node.key, node.prio, node.left, sub)
+        return sub
+
+    @staticmethod
+    def _split(node: PersistentTreapNode | None, key: Any) -> Tuple:
+        """
+        Splits a sub-treap into new sub-treaps of the keys less than key,
+        and the rest, copying only the nodes on the search path for key.
+
+        Time: O(logn)
+        """
+        path = []
+        while node:
+            path.append(node)
+            node = node.right if node.key < key else node.left
+
+        left = right = None
+        for node in reversed(path):
+            if node.key < key:
+                left = PersistentTreapNode(node.key, node.prio,
+                                           node.left, left)
+            else:
+                right = PersistentTreapNode(node.key, node.prio,
+                                            right, node.right)
+        return left, right
+
+    @staticmethod
+    def _join(a: PersistentTreapNode | None,
+              b: PersistentTreapNode | None) -> PersistentTreapNode | None:
+        """
+        Joins two sub-treaps, where every key in a is less than every key
+        in b, copying only the nodes on the right spine of a and the left
+        spine of b which are merged.
+
+        Time: O(logn)
+        """
+        merged = []
+        while a and b:
+            if a.prio < b.prio:
+                merged.append((a, False))
+                a = a.right
+            else:
+                merged.append((b, True))
+                b = b.left
+        return PersistentTreap._rebuild(merged, a or b)
+
+    def insert(self, key: Any) -> 'PersistentTreap':
+        """
+        Returns a treap with key added. The new node goes where its
+        priority puts it on the search path, and the subtree it lands on
+        is split around it.
+
+        Time: O(logn)
+        """
+        if self.contains(key):
+            return self
+        prio = random.random()
+        path = []
+        node = self.root
+        while node and node.prio < prio:
+            went_left = key < node.key
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+
+        left, right = self._split(node, key)
+        node = PersistentTreapNode(key, prio, left, right)
+        return PersistentTreap(self._rebuild(path, node))
+
+    def delete(self, key: Any) -> 'PersistentTreap':
+        """
+        Returns a treap without key. The node of key is replaced by the
+        join of its subtrees.
+
+        Time: O(logn)
+        """
+        path = []
+        node = self.root
+        while node and node.key != key:
+            went_left = key < node.key
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        if node is None:
+            return self
+        return PersistentTreap(
+            self._rebuild(path, self._join(node.left, node.right)))
+
+    def split(self, key: Any) -> Tuple['PersistentTreap', 'PersistentTreap']:
+        """
+        Returns treaps of the keys less than key, and of the rest.
+
+        Time: O(logn)
+        """
+        left, right = self._split(self.root, key)
+        return PersistentTreap(left), PersistentTreap(right)
+
+    @staticmethod
+    def join(left: 'PersistentTreap',
+             right: 'PersistentTreap') -> 'PersistentTreap':
+        """
+        Returns a treap of the keys of both, where every key in left is
+        less than every key in right.
+
+        Time: O(logn)
+        """
+        return PersistentTreap(PersistentTreap._join(left.root, right.root))
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts the search tree order, the heap invariant over the
+        priorities, and the sizes.
+        """
+        stack = [(self.root, None, None)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node is None:
+                continue
+            assert lo is None or lo < node.key
+            assert hi is None or node.key < hi
+            for child in (node.left, node.right):
+                if child:
+                    assert not child.prio < node.prio
+            assert node.size == 1 + (node.left.size if node.left else 0) \
+                + (node.right.size if node.right else 0)
+            stack += [(node.left, lo, node.key), (node.right, node.key, hi)]
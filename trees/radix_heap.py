@@ -0,0 +1,116 @@
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class RadixHeap():
+    """
+    A monotone radix heap: a Min-heap of non-negative integer keys, for
+    when no key pushed is ever less than the last key popped, as in
+    Dijkstra's algorithm. Entries are kept in buckets by the highest bit
+    in which their key differs from the last key popped, so a pop takes
+    from bucket 0, and only refills it, by redistributing the lowest
+    non-empty bucket into lower ones, when it runs dry. Each entry moves
+    down at most once per bit, and keys are never compared in a sift:
+        * push: O(1)
+        * pop: O(logC) amortized, where C is the largest key
+        * decrease_key: O(1)
+
+    Items must be hashable and unique within the heap, and the handle of
+    an item is the item itself. decrease_key pushes the item again with
+    its new key, and the old entry is skipped once it is reached.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: List[List[Tuple[int, Any]]] = [[]]
+        self.last = 0  # the last key popped
+        self.key_of: Dict[Hashable, int] = {}  # item -> current key
+
+    def __len__(self) -> int:
+        return len(self.key_of)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.key_of
+
+    def key(self, item: Hashable) -> int:
+        """
+        The current key of item.
+
+        Time: O(1)
+        """
+        return self.key_of[item]
+
+    def _add(self, item: Hashable, key: int) -> None:
+        if key < self.last:
+            raise ValueError(
+                f"key {key} is less than the last key popped ({self.last})")
+        self.key_of[item] = key
+        b = (key ^ self.last).bit_length()
+        while len(self.buckets) <= b:
+            self.buckets.append([])
+        self.buckets[b].append((key, item))
+
+    def push(self, item: Hashable, key: int) -> Hashable:
+        """
+        Adds item to the heap with the given key, which must not be less
+        than the last key popped.
+
+        Time: O(1)
+
+        Returns:
+            The handle of item, which is item itself.
+        """
+        if item in self.key_of:
+            raise ValueError(f"{item!r} is already in the heap")
+        self._add(item, key)
+        return item
+
+    def decrease_key(self, item: Hashable, key: int) -> None:
+        """
+        Lowers the key of item, to no less than the last key popped.
+
+        Time: O(1)
+        """
+        if self.key_of[item] < key:
+            raise ValueError("new key is greater than the current key")
+        self._add(item, key)
+
+    def pop(self) -> Tuple[int, Any]:
+        """
+        Pops the item with the minimum key off of the heap.
+
+        Time: O(logC) amortized
+
+        Returns:
+            (key, item)
+        """
+        if not self.key_of:
+            raise IndexError("pop from an empty heap")
+
+        key_of = self.key_of
+        buckets = self.buckets
+        while True:
+            if not buckets[0]:
+                self._refill()
+            key, item = buckets[0].pop()
+            if key_of.get(item) == key:
+                del key_of[item]
+                return key, item
+
+    def _refill(self) -> None:
+        """
+        Redistributes the lowest non-empty bucket around its minimum key,
+        which becomes the last key popped. Every entry lands in a lower
+        bucket, with those with the minimum key in bucket 0. Outdated
+        entries are dropped along the way.
+        """
+        key_of = self.key_of
+        buckets = self.buckets
+        for i in range(1, len(buckets)):
+            live = [(k, x) for k, x in buckets[i] if key_of.get(x) == k]
+            buckets[i] = []
+            if live:
+                break
+
+        last = min(k for k, _ in live)
+        self.last = last
+        for k, x in live:
+            buckets[(k ^ last).bit_length()].append((k, x))
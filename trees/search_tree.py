@@ -0,0 +1,88 @@
+"""
+Ordered traversal and neighbour queries over any of the binary search
+trees in this package, by the names of their child attributes
+(`left`/`right` for the treap and AVL tree, `left_child`/`right_child`
+for the BST). Nothing recurses, so degenerate trees are fine.
+"""
+
+from operator import attrgetter
+from typing import Any, Iterator
+
+
+def iter_nodes(root: Any, lo: Any = None, hi: Any = None,
+               reverse: bool = False, left: str = "left",
+               right: str = "right") -> Iterator[Any]:
+    """
+    Yields the nodes of a search tree in key order (or reverse order),
+    skipping keys outside [lo, hi]. None means unbounded. Subtrees which
+    are entirely out of bounds are never entered, and the stack holds at
+    most one path, so the nodes come lazily, one at a time.
+
+    Time: O(logn + k) for k nodes, on a balanced tree
+    Space: O(logn)
+    """
+    get_left, get_right = attrgetter(left), attrgetter(right)
+    if reverse:
+        lo, hi = hi, lo
+        get_left, get_right = get_right, get_left
+
+    stack = []
+    node = root
+    while True:
+        # go down towards the first key in bounds, keeping the nodes
+        # still to be yielded on the stack
+        while node is not None:
+            if lo is not None and (lo < node.key if reverse
+                                   else node.key < lo):
+                node = get_right(node)
+            else:
+                stack.append(node)
+                node = get_left(node)
+        if not stack:
+            return
+
+        node = stack.pop()
+        if hi is not None and (node.key < hi if reverse else hi < node.key):
+            return
+        yield node
+        node = get_right(node)
+
+
+def floor(root: Any, key: Any, strict: bool = False, left: str = "left",
+          right: str = "right") -> Any:
+    """
+    The node with the greatest key less than or equal to key (or less
+    than it, if strict), or None.
+
+    Time: O(logn) on a balanced tree
+    """
+    get_left, get_right = attrgetter(left), attrgetter(right)
+    best = None
+    node = root
+    while node is not None:
+        if node.key < key or not strict and node.key == key:
+            best = node
+            node = get_right(node)
+        else:
+            node = get_left(node)
+    return best
+
+
+def ceiling(root: Any, key: Any, strict: bool = False, left: str = "left",
+            right: str = "right") -> Any:
+    """
+    The node with the least key greater than or equal to key (or greater
+    than it, if strict), or None.
+
+    Time: O(logn) on a balanced tree
+    """
+    get_left, get_right = attrgetter(left), attrgetter(right)
+    best = None
+    node = root
+    while node is not None:
+        if key < node.key or not strict and node.key == key:
+            best = node
+            node = get_left(node)
+        else:
+            node = get_right(node)
+    return best
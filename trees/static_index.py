@@ -0,0 +1,187 @@
+from array import array
+from itertools import islice
+from operator import lt
+from typing import Any, Iterable, Iterator, List
+
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# ints beyond this are rounded when stored as a double
+FLOAT_EXACT_MAX = 1 << 53
+
+
+class StaticIndex:
+    """
+    A frozen sorted set of keys for read-mostly workloads, with the
+    following operations:
+        * contains
+        * lower_bound
+        * contains_many, lower_bound_many (batches of sorted queries)
+
+    The keys live in one typed `array` in Eytzinger order: the order of
+    a breadth-first walk of a complete binary search tree, with the root
+    at index 1 and the children of k at 2k and 2k + 1. A search is then
+    index arithmetic rather than pointer chasing, the top levels of the
+    tree share a few cache lines, and each step adds the result of the
+    comparison to the index instead of branching on it.
+
+    Args:
+        keys: Strictly increasing keys, e.g. any of the search trees in
+            this package, which iterate in order.
+        typecode: The `array` typecode of the keys, e.g. "d" for float
+            keys or "q" for 64-bit int ones. By default, "q" if the keys
+            are all ints, and "d" otherwise.
+    """
+
+    def __init__(self, keys: Iterable[Any] = (),
+                 typecode: str | None = None) -> None:
+        if typecode is None:
+            keys = list(keys)
+            typecode = self._typecode(keys)
+        src = array(typecode, keys)
+        if not all(map(lt, src, islice(src, 1, None))):
+            raise ValueError("keys must be strictly increasing")
+
+        self.n = len(src)
+        self.keys = array(typecode, [0]) * (self.n + 1)  # index 0 unused
+        for k, key in zip(self._order(), src):
+            self.keys[k] = key
+
+    @staticmethod
+    def _typecode(keys: List[Any]) -> str:
+        """
+        "q" for int keys, which must then fit in 64 bits, and "d"
+        otherwise, as long as no int key is too large for a float to
+        hold exactly.
+        """
+        ints = [k for k in keys if type(k) is int]
+        if len(ints) == len(keys):
+            if ints and not INT64_MIN <= min(ints) <= max(ints) <= INT64_MAX:
+                raise ValueError("int keys must fit in 64 bits")
+            return "q"
+        if ints and not (-FLOAT_EXACT_MAX <= min(ints)
+                         <= max(ints) <= FLOAT_EXACT_MAX):
+            raise ValueError("int keys mixed with floats must be at most "
+                             "2**53 in magnitude")
+        return "d"
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, key: Any) -> bool:
+        return self.contains(key)
+
+    def _order(self) -> Iterator[int]:
+        """
+        Yields the Eytzinger indices in key order (an in-order walk of
+        the implicit tree), with an explicit stack.
+        """
+        n = self.n
+        stack = []
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            yield k
+            k = 2 * k + 1
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yields the keys in order.
+
+        Time: O(n)
+        """
+        keys = self.keys
+        for k in self._order():
+            yield keys[k]
+
+    def _search(self, key: Any) -> int:
+        """
+        The Eytzinger index of the least key greater than or equal to
+        key, or 0 if there is none. The walk always goes down to a leaf;
+        the answer is the last node it went left at, which is found by
+        dropping the trailing right turns (1 bits) and the left turn
+        before them from the index.
+
+        Time: O(logn)
+        """
+        keys, n = self.keys, self.n
+        k = 1
+        while k <= n:
+            k += k + (keys[k] < key)
+        return k >> (~k & (k + 1)).bit_length()
+
+    def contains(self, key: Any) -> bool:
+        """
+        Whether key is in the index.
+
+        Time: O(logn)
+        """
+        k = self._search(key)
+        return k != 0 and not key < self.keys[k]
+
+    def lower_bound(self, key: Any) -> Any:
+        """
+        The least key greater than or equal to key, or None.
+
+        Time: O(logn)
+        """
+        k = self._search(key)
+        return self.keys[k] if k else None
+
+    def lower_bound_many(self, queries: Iterable[Any]) -> List[Any]:
+        """
+        lower_bound for every one of queries, which must be sorted, in a
+        single merged walk. The stack holds the nodes the last search
+        went left at, so its top is the last answer, and the keys after
+        it are its right subtree, then the next node down the stack and
+        its right subtree, and so on. A larger query pops the nodes
+        whose keys fall below it and searches only the right subtrees
+        it passes, so no node is entered twice across the batch.
+
+        Time: O(m log(n/m) + m) for m queries, so never more than O(n + m)
+        """
+        keys, n = self.keys, self.n
+        res = []
+        stack = []
+        k = 1
+        prev = None
+        for q in queries:
+            if prev is not None and q < prev:
+                raise ValueError("queries must be sorted")
+            prev = q
+            while True:
+                while k <= n:
+                    if keys[k] < q:
+                        k += k + 1
+                    else:
+                        stack.append(k)
+                        k += k
+                if not stack or not keys[stack[-1]] < q:
+                    break
+                k = 2 * stack.pop() + 1
+            res.append(keys[stack[-1]] if stack else None)
+        return res
+
+    def contains_many(self, queries: Iterable[Any]) -> List[bool]:
+        """
+        contains for every one of queries, which must be sorted, as a
+        batch like lower_bound_many.
+
+        Time: O(m log(n/m) + m) for m queries
+        """
+        queries = list(queries)
+        return [key is not None and not q < key
+                for q, key in zip(queries, self.lower_bound_many(queries))]
+
+    def assert_correctness(self) -> None:
+        """
+        Asserts that the keys come out of the Eytzinger layout in
+        strictly increasing order.
+        """
+        keys = list(self)
+        assert len(keys) == self.n
+        assert all(map(lt, keys, keys[1:]))
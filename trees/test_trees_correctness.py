@@ -0,0 +1,689 @@
+import bisect
+import math
+import pytest
+import random
+from trees.heap import Heap
+from trees.indexed_heap import IndexedHeap
+from trees.dary_heap import DaryHeap
+from trees.binomial_heap import BinomialHeap
+from trees.pairing_heap import PairingHeap
+from trees.radix_heap import RadixHeap
+from trees.avl_tree import AVLTree
+from trees.bst import BinarySearchTree
+from trees.treap import RandomizedTreap
+from trees.implicit_treap import ImplicitTreap
+from trees.persistent_treap import PersistentTreap
+from trees.static_index import StaticIndex
+
+
+def test_heap_heapify():
+    lst = [random.randint(-100, 100) for _ in range(1000)]
+    heap = Heap(lst)
+    heap.assert_correctness()
+    result = [heap.pop() for _ in range(len(heap))]
+    assert result == sorted(lst)
+
+
+def test_heap_default_not_shared():
+    a, b = Heap(), Heap()
+    a.insert(1)
+    assert len(b) == 0
+
+
+def test_heap_invariant():
+    lst = [random.randint(-100, 100) for _ in range(500)]
+    heap = Heap(lst, lambda a, b: a > b)
+    heap.assert_correctness()
+    result = [heap.pop() for _ in range(len(heap))]
+    assert result == sorted(lst, reverse=True)
+
+
+@pytest.mark.parametrize("batch", [3, 2000])
+def test_heap_extend(batch):
+    lst = [random.randint(-100, 100) for _ in range(500)]
+    more = [random.randint(-100, 100) for _ in range(batch)]
+    heap = Heap(lst)
+    heap.extend(more)
+    heap.assert_correctness()
+    result = [heap.pop() for _ in range(len(heap))]
+    assert result == sorted(lst + more)
+
+
+def test_heap_pushpop_replace_peek():
+    heap = Heap([5, 3, 8])
+    assert heap.peek() == 3
+    assert heap.pushpop(1) == 1
+    assert heap.pushpop(6) == 3
+    assert heap.replace(0) == 5
+    heap.assert_correctness()
+    assert [heap.pop() for _ in range(len(heap))] == [0, 6, 8]
+    assert Heap().pushpop(4) == 4
+
+
+@pytest.mark.parametrize("lst", [[], [2, 1]])
+def test_heap_copies_input(lst):
+    heap = Heap(lst)
+    before = list(lst)
+    heap.insert(0)
+    heap.pop()
+    assert lst == before
+    assert Heap(iter(lst)).heap == sorted(lst)
+
+
+def test_heap_nsmallest():
+    lst = [random.randint(-100, 100) for _ in range(1000)]
+    heap = Heap(lst)
+    assert heap.nsmallest(10) == sorted(lst)[:10]
+    assert heap.nsmallest(2000) == sorted(lst)
+    assert len(heap) == 1000
+
+    heap = Heap(lst, lambda a, b: a > b)
+    assert heap.nsmallest(10) == sorted(lst, reverse=True)[:10]
+
+
+def test_heap_key():
+    calls = []
+
+    def key(x):
+        calls.append(x)
+        return x["cost"]
+
+    lst = [{"cost": random.randint(0, 20), "id": i} for i in range(300)]
+    heap = Heap(lst, key=key)
+    heap.insert({"cost": -1, "id": -1})
+    heap.assert_correctness()
+    assert heap.peek()["id"] == -1
+    result = [heap.pop() for _ in range(len(heap))]
+    # stable among equal keys, and each key computed once
+    assert result[1:] == sorted(lst, key=lambda x: x["cost"])
+    assert len(calls) == 301
+
+
+def test_heap_key_and_invariant():
+    with pytest.raises(ValueError):
+        Heap([1], lambda a, b: a > b, key=abs)
+
+
+def test_indexed_heap():
+    heap = IndexedHeap()
+    keys = {}
+    for item in range(500):
+        keys[item] = random.randint(0, 1000)
+        assert heap.push(item, keys[item]) == item
+    for item in random.sample(range(500), 200):
+        keys[item] -= random.randint(0, 100)
+        heap.decrease_key(item, keys[item])
+    for item in random.sample(range(500), 100):
+        keys[item] += random.randint(0, 100)
+        heap.increase_key(item, keys[item])
+    for item in random.sample(range(500), 100):
+        assert heap.remove(item) == keys.pop(item)
+        assert not heap.contains(item)
+    heap.assert_correctness()
+    assert len(heap) == 400
+
+    result = [heap.pop() for _ in range(len(heap))]
+    assert [k for k, _ in result] == sorted(keys.values())
+    assert {item: k for k, item in result} == keys
+
+
+def test_indexed_heap_errors():
+    heap = IndexedHeap()
+    heap.push("a", 5)
+    with pytest.raises(ValueError):
+        heap.push("a", 1)
+    with pytest.raises(ValueError):
+        heap.decrease_key("a", 6)
+    with pytest.raises(ValueError):
+        heap.increase_key("a", 4)
+    with pytest.raises(KeyError):
+        heap.remove("b")
+
+
+@pytest.mark.parametrize("arity", [2, 3, 4, 8])
+def test_dary_heap(arity):
+    lst = [random.random() for _ in range(1000)]
+    heap = DaryHeap(arity, items=[(x, i) for i, x in enumerate(lst[:500])])
+    heap.assert_correctness()
+    for i, x in enumerate(lst[500:], 500):
+        heap.push(i, x)
+    heap.assert_correctness()
+    result = [heap.pop() for _ in range(len(heap))]
+    assert [k for k, _ in result] == sorted(lst)
+    assert all(lst[i] == k for k, i in result)
+
+
+@pytest.mark.parametrize("arity", [2, 4, 8])
+def test_dary_heap_decrease_key(arity):
+    heap = DaryHeap(arity, "q", indexed=True)
+    keys = {}
+    for item in range(500):
+        keys[item] = random.randint(0, 1000)
+        heap.push(item, keys[item])
+    for item in random.sample(range(500), 200):
+        keys[item] -= random.randint(0, 100)
+        heap.decrease_key(item, keys[item])
+        assert heap.key(item) == keys[item]
+    heap.assert_correctness()
+    result = [heap.pop() for _ in range(len(heap))]
+    assert [k for k, _ in result] == sorted(keys.values())
+    assert {item: k for k, item in result} == keys
+    assert 0 not in heap
+
+
+def test_dary_heap_errors():
+    with pytest.raises(ValueError):
+        DaryHeap(1)
+    with pytest.raises(TypeError):
+        DaryHeap().decrease_key(0, 0)
+    heap = DaryHeap(indexed=True)
+    heap.push("a", 1.0)
+    with pytest.raises(ValueError):
+        heap.push("a", 2.0)
+    with pytest.raises(ValueError):
+        heap.decrease_key("a", 3.0)
+
+
+def test_binomial_heap():
+    lst = [random.randint(-100, 100) for _ in range(1000)]
+    heap = BinomialHeap()
+    for x in lst[:10]:
+        heap.insert(x)
+    assert heap.min() == min(lst[:10])
+    assert heap.extractMin() == min(lst[:10])
+    for x in lst[10:]:
+        heap.insert(x)
+    heap.assert_correctness()
+    lst.remove(min(lst[:10]))
+    result = []
+    while heap:
+        result += [heap.extractMin()]
+        if len(heap) % 100 == 0:
+            heap.assert_correctness()
+    assert result == sorted(lst)
+
+
+def test_binomial_heap_merge():
+    a, b = BinomialHeap(), BinomialHeap()
+    lst = [random.random() for _ in range(1000)]
+    for x in lst[:600]:
+        a.insert(x)
+    a.extractMin()
+    for x in lst[600:]:
+        b.insert(x)
+    b.extractMin()
+    heap = BinomialHeap.merge(a, b)
+    assert len(a) == len(b) == 0
+    heap.assert_correctness()
+    expected = sorted(lst[:600])[1:] + sorted(lst[600:])[1:]
+    assert [heap.extractMin() for _ in range(len(heap))] == sorted(expected)
+
+
+def test_binomial_heap_decrease_key_delete():
+    heap = BinomialHeap()
+    entries = [heap.insert(random.randint(0, 1000), i) for i in range(500)]
+    heap.extractMin()
+    entries = [e for e in entries if e.node is not None]
+    for e in random.sample(entries, 200):
+        heap.decreaseKey(e, e.key - random.randint(0, 500))
+    heap.assert_correctness()
+    deleted = random.sample(entries, 100)
+    for e in deleted:
+        heap.delete(e)
+    heap.assert_correctness()
+    kept = [e for e in entries if e not in deleted]
+    result = [heap.extractMinEntry() for _ in range(len(heap))]
+    assert [e.key for e in result] == sorted(e.key for e in kept)
+    assert {e.item for e in result} == {e.item for e in kept}
+    entry = heap.insert(1)
+    with pytest.raises(ValueError):
+        heap.decreaseKey(entry, 2)
+    heap.delete(entry)
+    with pytest.raises(KeyError):
+        heap.delete(entry)
+    with pytest.raises(KeyError):
+        heap.decreaseKey(entry, 0)
+    stale = heap.insert(-1)
+    assert heap.extractMinEntry() is stale
+    with pytest.raises(KeyError):
+        heap.delete(stale)
+    with pytest.raises(IndexError):
+        BinomialHeap().extractMin()
+
+
+def test_pairing_heap():
+    lst = [random.randint(-100, 100) for _ in range(1000)]
+    heap = PairingHeap()
+    nodes = [heap.push(i, x) for i, x in enumerate(lst)]
+    assert heap.peek()[0] == min(lst)
+    for node in random.sample(nodes, 300):
+        lst[node.item] -= random.randint(0, 50)
+        heap.decrease_key(node, lst[node.item])
+    heap.assert_correctness()
+    removed = random.sample(nodes, 100)
+    for node in removed:
+        heap.remove(node)
+    heap.assert_correctness()
+    result = []
+    while heap:
+        result += [heap.pop()]
+        if len(heap) % 100 == 0:
+            heap.assert_correctness()
+    removed = {node.item for node in removed}
+    expected = [x for i, x in enumerate(lst) if i not in removed]
+    assert [k for k, _ in result] == sorted(expected)
+    assert all(lst[i] == k for k, i in result)
+    with pytest.raises(IndexError):
+        heap.pop()
+
+
+def test_pairing_heap_meld():
+    a, b = PairingHeap(), PairingHeap()
+    lst = [random.random() for _ in range(1000)]
+    for x in lst[:400]:
+        a.push(None, x)
+    for x in lst[400:]:
+        b.push(None, x)
+    a.pop()
+    a.meld(b)
+    assert len(b) == 0
+    a.assert_correctness()
+    result = [a.pop()[0] for _ in range(len(a))]
+    assert result == sorted(sorted(lst[:400])[1:] + lst[400:])
+    node = a.push("x", 1.0)
+    with pytest.raises(ValueError):
+        a.decrease_key(node, 2.0)
+
+
+def test_radix_heap():
+    heap = RadixHeap()
+    keys = {}
+    result = []
+    for step in range(2000):
+        if heap and random.random() < 0.3:
+            result += [heap.pop()]
+            assert keys.pop(result[-1][1]) == result[-1][0]
+        last = result[-1][0] if result else 0
+        item = step
+        keys[item] = last + random.randint(0, 2**20)
+        assert heap.push(item, keys[item]) == item
+        for x in random.sample(list(keys), min(3, len(keys))):
+            keys[x] = random.randint(last, keys[x])
+            heap.decrease_key(x, keys[x])
+            assert heap.key(x) == keys[x]
+        assert len(heap) == len(keys)
+    while heap:
+        result += [heap.pop()]
+        assert keys.pop(result[-1][1]) == result[-1][0]
+    assert [k for k, _ in result] == sorted(k for k, _ in result)
+    assert len(result) == 2000
+
+
+def test_radix_heap_errors():
+    heap = RadixHeap()
+    heap.push("a", 5)
+    heap.push("b", 7)
+    with pytest.raises(ValueError):
+        heap.push("a", 6)
+    with pytest.raises(ValueError):
+        heap.decrease_key("b", 8)
+    assert heap.pop() == (5, "a")
+    with pytest.raises(ValueError):
+        heap.decrease_key("b", 4)
+    with pytest.raises(ValueError):
+        heap.push("c", 4)
+    assert heap.pop() == (7, "b")
+    with pytest.raises(IndexError):
+        heap.pop()
+
+
+def test_bst_insert_once():
+    bst = BinarySearchTree()
+    bst.insert(5)
+    bst.insert(3)
+    assert bst.head.right_child is None
+    assert bst.search(5) and bst.search(3) and not bst.search(4)
+
+
+@pytest.mark.parametrize("keys", [
+    list(range(2000)),
+    list(range(2000, 0, -1)),
+    random.sample(range(10000), 2000)
+])
+def test_avl_tree(keys):
+    tree = AVLTree()
+    for k in keys:
+        tree.insert(k, str(k))
+    tree.assert_correctness()
+    assert len(tree) == len(keys)
+    assert tree.root.height <= 1.45 * len(keys).bit_length()
+    assert all(tree.search(k) for k in keys)
+    assert tree.get(k, "missing") == str(k)
+    assert -1 not in tree and tree.get(-1, "missing") == "missing"
+
+    tree.insert(keys[0], "new")
+    assert tree.get(keys[0]) == "new" and len(tree) == len(keys)
+
+    deleted = keys[::3]
+    for k in deleted:
+        tree.delete(k)
+    tree.delete(-1)
+    tree.assert_correctness()
+    assert len(tree) == len(keys) - len(deleted)
+    assert not any(tree.search(k) for k in deleted)
+    assert all(tree.search(k) for k in set(keys) - set(deleted))
+
+
+def test_avl_tree_from_sorted():
+    for n in range(20):
+        tree = AVLTree.from_sorted((k, -k) for k in range(n))
+        tree.assert_correctness()
+        assert all(tree.get(k) == -k for k in range(n))
+    tree.insert(100)
+    tree.delete(0)
+    tree.assert_correctness()
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([(1, None), (1, None)])
+
+
+def treap_keys(treap):
+    keys, stack, node = [], [], treap.root
+    while stack or node:
+        while node:
+            stack += [node]
+            node = node.left
+        node = stack.pop()
+        keys += [node.key]
+        node = node.right
+    return keys
+
+
+def test_treap_from_sorted():
+    keys = sorted(random.sample(range(10000), 2000))
+    treap = RandomizedTreap.from_sorted(keys)
+    treap._assert_correctness()
+    assert treap_keys(treap) == keys
+    assert RandomizedTreap.from_sorted([]).root is None
+    with pytest.raises(ValueError):
+        RandomizedTreap.from_sorted([2, 1])
+
+
+def test_treap_split_join():
+    keys = sorted(random.sample(range(10000), 1000))
+    treap = RandomizedTreap.from_sorted(keys)
+    left, right = treap.split(5000)
+    assert treap.root is None
+    left._assert_correctness()
+    right._assert_correctness()
+    assert treap_keys(left) == [k for k in keys if k < 5000]
+    assert treap_keys(right) == [k for k in keys if k >= 5000]
+
+    joined = RandomizedTreap.join(left, right)
+    joined._assert_correctness()
+    assert treap_keys(joined) == keys
+    assert left.root is None and right.root is None
+
+    joined.delete_range(2000, 7000)
+    joined._assert_correctness()
+    assert treap_keys(joined) == [k for k in keys if not 2000 <= k <= 7000]
+
+
+@pytest.mark.parametrize("sizes", [(1000, 1000), (2000, 20), (20, 2000)])
+def test_treap_set_operations(sizes):
+    a = set(random.sample(range(5000), sizes[0]))
+    b = set(random.sample(range(5000), sizes[1]))
+    for op, expected in [("union", a | b), ("intersection", a & b),
+                         ("difference", a - b)]:
+        ta = RandomizedTreap.from_sorted(sorted(a))
+        tb = RandomizedTreap.from_sorted(sorted(b))
+        getattr(ta, op)(tb)
+        ta._assert_correctness()
+        assert tb.root is None
+        assert treap_keys(ta) == sorted(expected)
+
+
+def test_treap_update():
+    treap = RandomizedTreap()
+    for k in [5, 1, 9]:
+        treap.insert(k)
+    treap.update(random.sample(range(100), 50) + [5])
+    treap._assert_correctness()
+    keys = treap_keys(treap)
+    assert keys == sorted(set(keys)) and {1, 5, 9} <= set(keys)
+    treap.delete(5)
+    treap.insert(200)
+    treap._assert_correctness()
+
+
+def test_treap_order_statistics():
+    treap = RandomizedTreap()
+    keys = random.sample(range(10000), 1000)
+    for k in keys:
+        treap.insert(k)
+    for k in keys[:300]:
+        treap.delete(k)
+    treap.update(range(20000, 20100))
+    left, right = treap.split(20050)
+    treap = RandomizedTreap.join(left, right)
+    treap._assert_correctness()
+
+    keys = sorted(keys[300:] + list(range(20000, 20100)))
+    assert len(treap) == len(keys)
+    for i in random.sample(range(len(keys)), 100):
+        assert treap.select(i) == keys[i]
+        assert treap.rank(keys[i]) == i
+        assert treap.rank(keys[i], inclusive=True) == i + 1
+    for _ in range(100):
+        lo, hi = sorted(random.sample(range(21000), 2))
+        assert treap.count_range(lo, hi) == \
+            sum(1 for k in keys if lo <= k <= hi)
+    assert treap.count_range(5, 4) == 0
+    for p in [0, 1, 25, 50, 99.9, 100]:
+        i = max(0, math.ceil(p / 100 * len(keys)) - 1)
+        assert treap.percentile(p) == keys[i]
+    with pytest.raises(IndexError):
+        treap.select(len(keys))
+    with pytest.raises(ValueError):
+        treap.percentile(101)
+
+
+def build_trees(keys):
+    bst, avl, treap = BinarySearchTree(), AVLTree(), RandomizedTreap()
+    for k in keys:
+        bst.insert(k)
+        avl.insert(k, -k)
+        treap.insert(k)
+    return [bst, avl, treap]
+
+
+@pytest.mark.parametrize("tree", range(3))
+def test_tree_iteration(tree):
+    keys = random.sample(range(0, 2000, 2), 500)
+    t = build_trees(keys)[tree]
+    keys.sort()
+    assert list(t) == keys
+    assert list(reversed(t)) == keys[::-1]
+    for lo, hi in [(None, 500), (500, None), (101, 899), (100, 900),
+                   (900, 100), (-10, -1), (5000, 6000)]:
+        expected = [k for k in keys
+                    if (lo is None or lo <= k) and (hi is None or k <= hi)]
+        assert list(t.iter_range(lo, hi)) == expected
+        assert list(t.iter_range(lo, hi, reverse=True)) == expected[::-1]
+
+    # lazy: stopping early doesn't walk the rest
+    it = t.iter_range(lo=keys[10])
+    assert [next(it) for _ in range(3)] == keys[10:13]
+
+
+@pytest.mark.parametrize("tree", range(3))
+def test_tree_neighbours(tree):
+    keys = random.sample(range(0, 2000, 2), 500)
+    t = build_trees(keys)[tree]
+    keys.sort()
+    for q in [-5, 0, 1, 2, 999, 1000, 1998, 1999, 2500]:
+        le = [k for k in keys if k <= q]
+        ge = [k for k in keys if k >= q]
+        lt = [k for k in keys if k < q]
+        gt = [k for k in keys if k > q]
+        assert t.floor(q) == (le[-1] if le else None)
+        assert t.ceiling(q) == (ge[0] if ge else None)
+        assert t.predecessor(q) == (lt[-1] if lt else None)
+        assert t.successor(q) == (gt[0] if gt else None)
+
+
+def test_avl_tree_items():
+    avl = AVLTree.from_sorted((k, str(k)) for k in range(100))
+    assert list(avl.items(10, 12)) == [(10, "10"), (11, "11"), (12, "12")]
+    assert list(avl.items(97, reverse=True)) == [(99, "99"), (98, "98"),
+                                                 (97, "97")]
+
+
+def test_sorted_bst_iteration():
+    # a degenerate BST, deeper than the recursion limit
+    bst = BinarySearchTree()
+    node = None
+    for k in range(5000):
+        if node is None:
+            bst.insert(k)
+            node = bst.head
+        else:
+            node.right_child = type(node)(k)
+            node = node.right_child
+    assert list(bst) == list(range(5000))
+    assert bst.floor(10**6) == 4999
+
+
+def test_implicit_treap():
+    lst = list(range(300))
+    seq = ImplicitTreap(lst, aggregates=True)
+    for _ in range(500):
+        op = random.randrange(4)
+        i = random.randint(0, len(lst))
+        j = random.randint(0, len(lst))
+        if op == 0:
+            x = random.randint(-1000, 1000)
+            lst.insert(i, x)
+            seq.insert_at(i, x)
+        elif op == 1 and lst:
+            i = min(i, len(lst) - 1)
+            assert seq.delete_at(i) == lst.pop(i)
+        elif op == 2:
+            lst[i:j] = lst[i:j][::-1]
+            seq.reverse(i, j)
+        elif i < j:
+            assert seq.sum(i, j) == sum(lst[i:j])
+            assert seq.min(i, j) == min(lst[i:j])
+    seq.assert_correctness()
+    assert list(seq) == lst
+    assert len(seq) == len(lst)
+    assert seq[0] == lst[0] and seq[-1] == lst[-1]
+    assert list(seq.slice(10, 50)) == lst[10:50]
+    assert list(seq.slice(-5, None)) == lst[-5:]
+    assert list(seq) == lst
+
+
+def test_implicit_treap_cut_concat():
+    seq = ImplicitTreap(range(100))
+    part = seq.cut(20, 40)
+    assert list(part) == list(range(20, 40))
+    part.reverse()
+    seq.concat(part)
+    seq.append(-1)
+    assert len(part) == 0
+    assert list(seq) == list(range(20)) + list(range(40, 100)) \
+        + list(range(39, 19, -1)) + [-1]
+    seq.assert_correctness()
+    with pytest.raises(IndexError):
+        seq[101]
+    with pytest.raises(TypeError):
+        seq.sum(0, 10)
+
+
+def test_persistent_treap():
+    keys = set()
+    versions = [(PersistentTreap(), set())]
+    treap = versions[0][0]
+    for _ in range(1000):
+        key = random.randint(0, 300)
+        if random.random() < 0.6:
+            treap = treap.insert(key)
+            keys.add(key)
+        else:
+            treap = treap.delete(key)
+            keys.discard(key)
+        versions.append((treap, set(keys)))
+    for treap, keys in versions[::50]:
+        treap.assert_correctness()
+        assert list(treap) == sorted(keys)
+        assert len(treap) == len(keys)
+    treap, keys = versions[-1]
+    assert all((k in treap) == (k in keys) for k in range(-1, 302))
+
+
+def test_persistent_treap_split_join():
+    with pytest.raises(ValueError):
+        PersistentTreap.from_sorted([1, 3, 3])
+    treap = PersistentTreap.from_sorted(range(0, 1000, 2))
+    treap.assert_correctness()
+    left, right = treap.split(501)
+    assert list(left) == list(range(0, 501, 2))
+    assert list(right) == list(range(502, 1000, 2))
+    joined = PersistentTreap.join(left.insert(-1), right)
+    joined.assert_correctness()
+    assert list(joined) == [-1] + list(range(0, 1000, 2))
+    # the originals are untouched
+    assert list(treap) == list(range(0, 1000, 2))
+    assert list(left) == list(range(0, 501, 2))
+    assert treap.insert(4) is treap and treap.delete(5) is treap
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 8, 100, 1000])
+def test_static_index(n):
+    keys = sorted(random.sample(range(10 * n + 10), n))
+    index = StaticIndex(keys, "q")
+    index.assert_correctness()
+    assert list(index) == keys and len(index) == n
+    queries = range(-1, 10 * n + 12)
+    for q in queries:
+        i = bisect.bisect_left(keys, q)
+        assert index.lower_bound(q) == (keys[i] if i < n else None)
+        assert (q in index) == (i < n and keys[i] == q)
+    assert index.lower_bound_many(queries) \
+        == [index.lower_bound(q) for q in queries]
+
+
+def test_static_index_batches():
+    keys = sorted(random.sample(range(100000), 10000))
+    index = StaticIndex(keys)
+    for m in [1, 10, 5000, 50000]:
+        queries = sorted(random.randint(-5, 100005) for _ in range(m))
+        assert index.lower_bound_many(queries) \
+            == [index.lower_bound(q) for q in queries]
+        assert index.contains_many(queries) == [q in index for q in queries]
+    with pytest.raises(ValueError):
+        index.contains_many([3, 2])
+    with pytest.raises(ValueError):
+        StaticIndex([1, 2, 2])
+
+
+def test_static_index_typecode():
+    keys = [2**53 + i for i in range(0, 1000, 3)] + [2**63 - 1]
+    index = StaticIndex(keys)
+    assert index.keys.typecode == "q"
+    assert list(index) == keys
+    assert all(k in index for k in keys)
+    assert 2**53 + 1 not in index
+    assert index.lower_bound(2**53 + 1) == 2**53 + 3
+
+    assert StaticIndex([0.5, 1, 2]).keys.typecode == "d"
+    with pytest.raises(ValueError):
+        StaticIndex([0, 2**63])
+    with pytest.raises(ValueError):
+        StaticIndex([0.5, 2**53 + 1])
+
+
+def test_static_index_from_tree():
+    keys = random.sample(range(1000), 300)
+    trees = build_trees(keys) + [PersistentTreap.from_sorted(sorted(keys))]
+    for tree in trees:
+        assert list(StaticIndex(tree)) == sorted(keys)
@@ -0,0 +1,407 @@
+"""
+Trees and heaps benchmark suite.
+
+    python -m trees.test_trees_performance
+    python -m trees.test_trees_performance --sizes 1000 100000 --arity
+    python -m trees.test_trees_performance --meld --meld-size 1000000
+    python -m trees.test_trees_performance --sorted --sorted-sizes 10000000
+    python -m trees.test_trees_performance --sequence --sequence-size 1000000
+    python -m trees.test_trees_performance --persistent --versions 10000
+    python -m trees.test_trees_performance --static --static-size 1000000
+"""
+
+import argparse
+import bisect
+import random
+import sys
+import timeit
+import tracemalloc
+from trees.avl_tree import AVLTree
+from trees.binomial_heap import BinomialHeap
+from trees.bst import BinarySearchTree
+from trees.dary_heap import DaryHeap
+from trees.heap import Heap
+from trees.implicit_treap import ImplicitTreap
+from trees.indexed_heap import IndexedHeap
+from trees.persistent_treap import PersistentTreap, PersistentTreapNode
+from trees.static_index import StaticIndex
+from trees.treap import RandomizedTreap
+
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5]
+DEFAULT_MELD_SIZE = 10**6
+DEFAULT_SORTED_SIZES = [10**3, 10**4, 10**5, 10**6]
+DEFAULT_SEQUENCE_SIZE = 10**6
+SEQUENCE_EDITS = 10**4
+DEFAULT_PERSISTENT_SIZE = 10**5
+DEFAULT_VERSIONS = 10**4
+DEFAULT_STATIC_SIZE = 10**6
+STATIC_QUERIES = 10**5
+
+ARITIES = [2, 4, 8]
+
+
+def best_time(f, repeat=3):
+    return min(timeit.repeat(f, number=1, repeat=repeat))
+
+
+def random_graph(v, e):
+    """
+    A random directed graph with v vertices and about e edges, as
+    adjacency lists of (vertex, weight), with a path through every vertex
+    so that all of them are reachable from 0.
+    """
+    adj = [[] for _ in range(v)]
+    for u in range(v - 1):
+        adj[u] += [(u + 1, random.uniform(1, 100))]
+    for _ in range(e - (v - 1)):
+        adj[random.randrange(v)] += [(random.randrange(v),
+                                      random.uniform(1, 100))]
+    return adj
+
+
+def heap_sort_workload(make_heap, arr):
+    """
+    Pushes every item of arr, then pops them all.
+    """
+    heap = make_heap()
+    for x in arr:
+        heap.push(None, x)
+    while heap:
+        heap.pop()
+
+
+def dijkstra_workload(make_heap, adj):
+    """
+    Dijkstra's algorithm over adjacency lists with a decrease-key queue.
+    """
+    Q = make_heap()
+    Q.push(0, 0.0)
+    fin = {}
+    while Q:
+        uc, u = Q.pop()
+        fin[u] = uc
+        for v, w in adj[u]:
+            if v in fin:
+                continue
+            dv = uc + w
+            if v not in Q:
+                Q.push(v, dv)
+            elif dv < Q.key(v):
+                Q.decrease_key(v, dv)
+    return fin
+
+
+def lazy_dijkstra_workload(adj):
+    """
+    Dijkstra's algorithm with trees.heap.Heap, which can't decrease keys,
+    so a vertex is pushed again every time its cost improves.
+    """
+    Q = Heap([(0.0, 0)])
+    fin = {}
+    while Q:
+        uc, u = Q.pop()
+        if u in fin:
+            continue
+        fin[u] = uc
+        for v, w in adj[u]:
+            if v not in fin:
+                Q.insert((uc + w, v))
+    return fin
+
+
+def run_arity(sizes):
+    print("\nBegin heap arity test (best time of three)")
+
+    print("\nHeapsort workload: n pushes, then n pops\n")
+    print("Heap".ljust(25), "Size".ljust(10), "Time (s)")
+    for n in sizes:
+        arr = [random.random() for _ in range(n)]
+
+        def heap_baseline():
+            heap = Heap()
+            for x in arr:
+                heap.insert(x)
+            while heap:
+                heap.pop()
+
+        ti = best_time(heap_baseline)
+        print("trees.heap.Heap".ljust(25), str(n).ljust(10), round(ti, 6))
+        for d in ARITIES:
+            ti = best_time(lambda: heap_sort_workload(
+                lambda: DaryHeap(d), arr))
+            print(f"DaryHeap (d={d})".ljust(25), str(n).ljust(10),
+                  round(ti, 6))
+
+    print("\nDijkstra workload: n vertices, 8n edges\n")
+    print("Heap".ljust(25), "Vertices".ljust(10), "Time (s)")
+    for n in sizes:
+        adj = random_graph(n, 8 * n)
+        ti = best_time(lambda: lazy_dijkstra_workload(adj))
+        print("trees.heap.Heap (lazy)".ljust(25), str(n).ljust(10),
+              round(ti, 6))
+        ti = best_time(lambda: dijkstra_workload(IndexedHeap, adj))
+        print("IndexedHeap".ljust(25), str(n).ljust(10), round(ti, 6))
+        for d in ARITIES:
+            ti = best_time(lambda: dijkstra_workload(
+                lambda: DaryHeap(d, indexed=True), adj))
+            print(f"DaryHeap (d={d})".ljust(25), str(n).ljust(10),
+                  round(ti, 6))
+
+
+def run_meld(n):
+    print("\nBegin meld test (best time of three)")
+    print(f"Heap sizes: {n} + {n}\n")
+
+    a = [random.random() for _ in range(n)]
+    b = [random.random() for _ in range(n)]
+
+    # melding empties its inputs, so time each meld on fresh heaps
+    times = []
+    for _ in range(3):
+        ha, hb = BinomialHeap(), BinomialHeap()
+        for x in a:
+            ha.insert(x)
+        for x in b:
+            hb.insert(x)
+        times += [timeit.timeit(lambda: ha.meld(hb), number=1)]
+    print("Heap".ljust(40), "Time (s)")
+    print("BinomialHeap.meld".ljust(40), round(min(times), 6))
+
+    times = []
+    for _ in range(3):
+        ha, hb = Heap(a), Heap(b)
+        times += [timeit.timeit(lambda: ha.extend(hb.heap), number=1)]
+    print("trees.heap.Heap (concatenate, heapify)".ljust(40),
+          round(min(times), 6))
+
+    # the first extract after a meld pays for the consolidation
+    times = []
+    for _ in range(3):
+        ha, hb = BinomialHeap(), BinomialHeap()
+        for x in a:
+            ha.insert(x)
+        for x in b:
+            hb.insert(x)
+        ha.extractMin()
+        hb.extractMin()
+        times += [timeit.timeit(lambda: (ha.meld(hb), ha.extractMin()),
+                                number=1)]
+    print("BinomialHeap.meld + extractMin".ljust(40), round(min(times), 6))
+
+
+def run_sorted(sizes):
+    """
+    The worst case for an unbalanced search tree: keys inserted in
+    increasing order, which turns it into a linked list.
+    """
+    print("\nBegin sorted input test (one run each)\n")
+    print("Tree".ljust(30), "Size".ljust(10), "Insert (s)".ljust(14),
+          "Search (s)".ljust(14), "Height")
+    trees = [
+        ("BinarySearchTree", BinarySearchTree),
+        ("AVLTree", AVLTree)
+    ]
+    failed = set()
+    for n in sizes:
+        for name, make_tree in trees:
+            if name in failed:
+                continue
+            tree = make_tree()
+            try:
+                ti = timeit.timeit(lambda: [tree.insert(k) for k in range(n)],
+                                   number=1)
+                ts = timeit.timeit(lambda: [tree.search(k) for k in range(n)],
+                                   number=1)
+            except RecursionError:
+                print(name.ljust(30), str(n).ljust(10), "RecursionError")
+                failed.add(name)
+                continue
+            height = tree.root.height if isinstance(tree, AVLTree) else "-"
+            print(name.ljust(30), str(n).ljust(10), str(round(ti, 6)).ljust(14),
+                  str(round(ts, 6)).ljust(14), height)
+
+        ti = timeit.timeit(
+            lambda: AVLTree.from_sorted((k, None) for k in range(n)), number=1)
+        print("AVLTree.from_sorted".ljust(30), str(n).ljust(10),
+              round(ti, 6))
+
+
+def run_sequence(n, edits=SEQUENCE_EDITS):
+    print("\nBegin sequence edit test (one run each)")
+    print(f"Sequence length: {n}")
+    print(f"Edits: {edits} at random positions\n")
+
+    positions = [random.randrange(n) for _ in range(edits)]
+    ranges = [sorted(random.sample(range(n), 2)) for _ in range(edits // 10)]
+
+    lst = list(range(n))
+    ti = timeit.timeit(lambda: ImplicitTreap(range(n)), number=1)
+    seq = ImplicitTreap(range(n))
+    print("Operation".ljust(30), "list (s)".ljust(14), "ImplicitTreap (s)")
+    print("build".ljust(30), "-".ljust(14), round(ti, 6))
+
+    def list_insert():
+        for i in positions:
+            lst.insert(i, -1)
+
+    def list_delete():
+        for i in positions:
+            del lst[i]
+
+    def list_reverse():
+        for i, j in ranges:
+            lst[i:j] = lst[i:j][::-1]
+
+    def seq_insert():
+        for i in positions:
+            seq.insert_at(i, -1)
+
+    def seq_delete():
+        for i in positions:
+            seq.delete_at(i)
+
+    def seq_reverse():
+        for i, j in ranges:
+            seq.reverse(i, j)
+
+    ops = [
+        ("insert", list_insert, seq_insert),
+        ("delete", list_delete, seq_delete),
+        (f"reverse ({len(ranges)} ranges)", list_reverse, seq_reverse)
+    ]
+    for name, f, g in ops:
+        tl = timeit.timeit(f, number=1)
+        ts = timeit.timeit(g, number=1)
+        print(name.ljust(30), str(round(tl, 6)).ljust(14), round(ts, 6))
+
+
+def run_persistent(n, versions):
+    """
+    Keeps every version of a persistent treap over a series of random
+    inserts and deletes, and measures the memory they take between them
+    against keeping a full copy per version.
+    """
+    print("\nBegin persistent treap memory test")
+    print(f"Keys: {n}")
+    print(f"Versions: {versions}, each one insert or delete\n")
+
+    tracemalloc.start()
+    base = PersistentTreap.from_sorted(range(0, 2 * n, 2))
+    base_bytes = tracemalloc.get_traced_memory()[0]
+
+    history = [base]
+    treap = base
+    ti = timeit.default_timer()
+    for _ in range(versions):
+        key = random.randrange(2 * n)
+        treap = treap.delete(key) if key in treap else treap.insert(key)
+        history.append(treap)
+    ti = timeit.default_timer() - ti
+    total_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    node_bytes = sys.getsizeof(PersistentTreapNode(0, 0.0))
+    per_version = (total_bytes - base_bytes) / versions
+    print("Base treap (MB)".ljust(30), round(base_bytes / 2**20, 2))
+    print("All versions kept (MB)".ljust(30), round(total_bytes / 2**20, 2))
+    print("Full copies instead (MB)".ljust(30),
+          round(base_bytes * (versions + 1) / 2**20, 2))
+    print("Bytes per version".ljust(30), round(per_version))
+    print("Nodes copied per version".ljust(30),
+          round(per_version / node_bytes, 1))
+    print("Time per version (s)".ljust(30), round(ti / versions, 8))
+
+
+def run_static(n, m=STATIC_QUERIES):
+    """
+    Lookups in a set built once: the pointer-based trees against the
+    Eytzinger array of StaticIndex, one query at a time and as a sorted
+    batch, with bisect on a sorted list (a search in C) as the baseline.
+    """
+    print("\nBegin static index lookup test (best time of three)")
+    print(f"Keys: {n}")
+    print(f"Queries: {m}, half of them present\n")
+
+    keys = sorted(random.sample(range(2 * n), n))
+    queries = [random.choice(keys) if random.random() < 0.5
+               else random.randrange(2 * n) for _ in range(m)]
+    sorted_queries = sorted(queries)
+
+    avl = AVLTree.from_sorted((k, None) for k in keys)
+    treap = RandomizedTreap.from_sorted(keys)
+    ti = best_time(lambda: StaticIndex(avl, "q"))
+    index = StaticIndex(avl, "q")
+    print("StaticIndex build from AVLTree".ljust(40), round(ti, 6))
+
+    def sorted_list():
+        for q in queries:
+            i = bisect.bisect_left(keys, q)
+            i < n and keys[i] == q
+
+    lookups = [
+        ("RandomizedTreap.search", lambda: [treap.search(q) for q in queries]),
+        ("AVLTree.search", lambda: [avl.search(q) for q in queries]),
+        ("StaticIndex.contains", lambda: [index.contains(q) for q in queries]),
+        ("StaticIndex.contains_many (sorted)",
+         lambda: index.contains_many(sorted_queries)),
+        ("bisect on a sorted list", sorted_list)
+    ]
+    print("Lookup".ljust(40), "Time (s)")
+    for name, f in lookups:
+        print(name.ljust(40), round(best_time(f), 6))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trees benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="input sizes to run")
+    parser.add_argument("--arity", action="store_true",
+                        help="run the d-ary heap arity test")
+    parser.add_argument("--meld", action="store_true",
+                        help="run the binomial heap meld test")
+    parser.add_argument("--meld-size", type=int, default=DEFAULT_MELD_SIZE,
+                        help="size of each of the heaps melded")
+    parser.add_argument("--sorted", action="store_true",
+                        help="run the sorted input (worst case) tree test")
+    parser.add_argument("--sorted-sizes", type=int, nargs="+",
+                        default=DEFAULT_SORTED_SIZES,
+                        help="input sizes for the sorted input test")
+    parser.add_argument("--sequence", action="store_true",
+                        help="run the implicit treap sequence edit test")
+    parser.add_argument("--sequence-size", type=int,
+                        default=DEFAULT_SEQUENCE_SIZE,
+                        help="length of the sequence edited")
+    parser.add_argument("--persistent", action="store_true",
+                        help="run the persistent treap memory test")
+    parser.add_argument("--persistent-size", type=int,
+                        default=DEFAULT_PERSISTENT_SIZE,
+                        help="number of keys in the persistent treap")
+    parser.add_argument("--versions", type=int, default=DEFAULT_VERSIONS,
+                        help="number of persistent treap versions kept")
+    parser.add_argument("--static", action="store_true",
+                        help="run the static index lookup test")
+    parser.add_argument("--static-size", type=int,
+                        default=DEFAULT_STATIC_SIZE,
+                        help="number of keys in the static index test")
+    args = parser.parse_args(argv)
+
+    run_all = not (args.arity or args.meld or args.sorted or args.sequence
+                   or args.persistent or args.static)
+    if args.arity or run_all:
+        run_arity(args.sizes)
+    if args.meld or run_all:
+        run_meld(args.meld_size)
+    if args.sorted or run_all:
+        run_sorted(args.sorted_sizes)
+    if args.sequence or run_all:
+        run_sequence(args.sequence_size)
+    if args.persistent or run_all:
+        run_persistent(args.persistent_size, args.versions)
+    if args.static or run_all:
+        run_static(args.static_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
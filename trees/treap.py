@@ -1,5 +1,7 @@
+import math
 import random
-from typing import Union
+from typing import Any, Iterable, Iterator, Tuple, Union
+from trees.search_tree import ceiling, floor, iter_nodes
 
 
 class RandomizedTreapNode:
@@ -13,11 +15,21 @@ class RandomizedTreapNode:
         a continuous, uniform distribution over the range (0, 1).
         """
         self.key = key
-        self.prio: float = random.random() if not prio else prio
+        self.prio: float = random.random() if prio is None else prio
 
         self.parent: 'RandomizedTreapNode' | None = None
         self.left: 'RandomizedTreapNode' | None = None
         self.right: 'RandomizedTreapNode' | None = None
+        self.size = 1  # number of nodes in the sub-treap rooted here
+
+    def update_size(self) -> None:
+        """
+        Recomputes the size of this node's sub-treap from its children's.
+
+        Time: O(1)
+        """
+        self.size = 1 + (self.left.size if self.left else 0) \
+            + (self.right.size if self.right else 0)
 
     def _assert_correctness(self) -> None:
         """
@@ -25,9 +37,12 @@ class RandomizedTreapNode:
             - Its children have a priority greater than its own;
             - Its left child has a search key less than its own;
             - Its right child has a search key greater than its own;
-            - The pointers are correct between parent and child; and
+            - The pointers are correct between parent and child;
+            - Its size counts the nodes of its subtree; and
             - Its left and right subtrees have a correct structure.
         """
+        assert self.size == 1 + (self.left.size if self.left else 0) \
+            + (self.right.size if self.right else 0)
         if self.left:
             assert self.left.parent == self
             assert self.left.prio >= self.prio
@@ -44,6 +59,7 @@ class RandomizedTreapNode:
         Inserts a new node (n_node) into the sub-treap rooted at this node.
         """
         n_key = n_node.key
+        self.size += 1
         if n_key < self.key or n_key == self.key:
             if not self.left:
                 self.left = n_node
@@ -90,6 +106,52 @@ class RandomizedTreap:
         """
         self.root: RandomizedTreapNode | None = None
 
+    @staticmethod
+    def _from_root(root: RandomizedTreapNode | None) -> 'RandomizedTreap':
+        """
+        Wraps a detached sub-treap in a treap of its own.
+        """
+        treap = RandomizedTreap()
+        treap.root = root
+        if root:
+            root.parent = None
+        return treap
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[int]) -> 'RandomizedTreap':
+        """
+        Builds a treap from keys in non-decreasing order, without any
+        searches or rotations. Each new node goes at the bottom of the
+        right spine, then climbs it past every node with a greater
+        priority, which become its left subtree (a Cartesian tree).
+        Every node is pushed onto and popped off of the spine once.
+
+        Time: O(n)
+        """
+        spine = []  # the right spine of the treap, from the root down
+        prev = None
+        for key in keys:
+            if prev is not None and key < prev:
+                raise ValueError("keys must be in non-decreasing order")
+            prev = key
+
+            node = RandomizedTreapNode(key)
+            last = None
+            while spine and spine[-1].prio > node.prio:
+                last = spine.pop()
+                last.update_size()
+            node.left = last
+            if last:
+                last.parent = node
+            if spine:
+                spine[-1].right = node
+                node.parent = spine[-1]
+            spine += [node]
+
+        for node in reversed(spine):
+            node.update_size()
+        return cls._from_root(spine[0] if spine else None)
+
     def _assert_correctness(self) -> None:
         """
         Asserts the correctness of the treap's properties, i.e:
@@ -126,6 +188,123 @@ class RandomizedTreap:
             return self.root.search(s_key)
         return None
 
+    def __len__(self) -> int:
+        return self.root.size if self.root else 0
+
+    def iter_range(self, lo: Any = None, hi: Any = None,
+                   reverse: bool = False) -> Iterator[Any]:
+        """
+        Yields the keys in [lo, hi] in order, or in reverse order. None
+        means unbounded. Keys are produced lazily, with an explicit stack.
+
+        Time: O(logn + k) for k keys expected
+        """
+        for node in iter_nodes(self.root, lo, hi, reverse):
+            yield node.key
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_range()
+
+    def __reversed__(self) -> Iterator[Any]:
+        return self.iter_range(reverse=True)
+
+    def floor(self, key: Any) -> Any:
+        """
+        The greatest key less than or equal to key, or None.
+
+        Time: O(logn) expected
+        """
+        node = floor(self.root, key)
+        return node.key if node else None
+
+    def ceiling(self, key: Any) -> Any:
+        """
+        The least key greater than or equal to key, or None.
+
+        Time: O(logn) expected
+        """
+        node = ceiling(self.root, key)
+        return node.key if node else None
+
+    def predecessor(self, key: Any) -> Any:
+        """
+        The greatest key less than key, or None.
+
+        Time: O(logn) expected
+        """
+        node = floor(self.root, key, strict=True)
+        return node.key if node else None
+
+    def successor(self, key: Any) -> Any:
+        """
+        The least key greater than key, or None.
+
+        Time: O(logn) expected
+        """
+        node = ceiling(self.root, key, strict=True)
+        return node.key if node else None
+
+    def rank(self, key: int, inclusive: bool = False) -> int:
+        """
+        Counts the keys less than key (or equal to it, if inclusive), by
+        adding up the sizes of the left subtrees passed on the way down.
+
+        Time: O(logn)
+        """
+        count = 0
+        node = self.root
+        while node:
+            if node.key < key or inclusive and node.key == key:
+                count += 1 + (node.left.size if node.left else 0)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, k: int) -> int:
+        """
+        Returns the k-th smallest key (counting from 0).
+
+        Time: O(logn)
+        """
+        if not 0 <= k < len(self):
+            raise IndexError("k out of range")
+        node = self.root
+        while True:
+            left = node.left.size if node.left else 0
+            if k < left:
+                node = node.left
+            elif k == left:
+                return node.key
+            else:
+                k -= left + 1
+                node = node.right
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Counts the keys in [lo, hi].
+
+        Time: O(logn)
+        """
+        if hi < lo:
+            return 0
+        return self.rank(hi, inclusive=True) - self.rank(lo)
+
+    def percentile(self, p: float) -> int:
+        """
+        Returns the p-th percentile of the keys, for p in [0, 100], with
+        the nearest-rank method: the smallest key which is greater than
+        or equal to p percent of the keys.
+
+        Time: O(logn)
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("p must be in [0, 100]")
+        n = len(self)
+        if n == 0:
+            raise IndexError("percentile of an empty treap")
+        return self.select(max(0, math.ceil(p / 100 * n) - 1))
+
     def delete(self, d_key: int) -> None:
         """
         Deletes a search key (d_key) from the treap if found.
@@ -212,6 +391,8 @@ class RandomizedTreap:
         r_node.left.right = temp
         if temp:
             temp.parent = r_node.left
+        r_node.left.update_size()
+        r_node.update_size()
         return r_node
 
     def rotate_right(self, r_node: RandomizedTreapNode) -> RandomizedTreapNode:
@@ -226,6 +407,8 @@ class RandomizedTreap:
         r_node.right.left = temp
         if temp:
             temp.parent = r_node.right
+        r_node.right.update_size()
+        r_node.update_size()
         return r_node
 
     def delete_leaf(self, d_node: RandomizedTreapNode) -> None:
@@ -239,4 +422,254 @@ class RandomizedTreap:
             d_node.parent.left = None
         else:
             d_node.parent.right = None
+
+        ancestor = d_node.parent
+        while ancestor:
+            ancestor.size -= 1
+            ancestor = ancestor.parent
         del d_node
+
+    @staticmethod
+    def _split(node: RandomizedTreapNode | None, key: int,
+               inclusive: bool = False) -> Tuple:
+        """
+        Splits the sub-treap rooted at node into the nodes with keys less
+        than key (or equal to it, if inclusive), and the rest. Walks down
+        a single path, hanging the nodes it passes onto the right spine
+        of the left part or the left spine of the right part.
+
+        Time: O(logn)
+
+        Returns:
+            The roots of the two parts, which may be None.
+        """
+        # dummy heads, whose right (left) child is the left (right) part
+        left_head = RandomizedTreapNode(key, 0.0)
+        right_head = RandomizedTreapNode(key, 0.0)
+        left_tail, right_tail = left_head, right_head
+        path = []
+        while node:
+            path += [node]
+            if node.key < key or inclusive and node.key == key:
+                left_tail.right = node
+                node.parent = left_tail
+                left_tail = node
+                node = node.right
+            else:
+                right_tail.left = node
+                node.parent = right_tail
+                right_tail = node
+                node = node.left
+        left_tail.right = None
+        right_tail.left = None
+        for node in reversed(path):
+            node.update_size()
+
+        left, right = left_head.right, right_head.left
+        if left:
+            left.parent = None
+        if right:
+            right.parent = None
+        return left, right
+
+    @staticmethod
+    def _join(a: RandomizedTreapNode | None,
+              b: RandomizedTreapNode | None) -> RandomizedTreapNode | None:
+        """
+        Joins two sub-treaps, where every key in a is no greater than
+        every key in b, by merging the right spine of a with the left
+        spine of b in priority order.
+
+        Time: O(logn)
+
+        Returns:
+            The root of the joined treap.
+        """
+        head = RandomizedTreapNode(None, 0.0)
+        # the dummy head's right child is the root; attach at the tail,
+        # on its right while taking from a, and its left from b
+        tail, from_a = head, True
+        path = []
+        while a and b:
+            if a.prio < b.prio:
+                child, a, next_from_a = a, a.right, True
+            else:
+                child, b, next_from_a = b, b.left, False
+            if from_a:
+                tail.right = child
+            else:
+                tail.left = child
+            child.parent = tail
+            tail, from_a = child, next_from_a
+            path += [child]
+
+        rest = a or b
+        if from_a:
+            tail.right = rest
+        else:
+            tail.left = rest
+        if rest:
+            rest.parent = tail
+        for node in reversed(path):
+            node.update_size()
+
+        root = head.right
+        if root:
+            root.parent = None
+        return root
+
+    @staticmethod
+    def _split3(node: RandomizedTreapNode | None, key: int) -> Tuple:
+        """
+        Splits the sub-treap rooted at node into the keys less than key,
+        equal to it, and greater than it.
+
+        Time: O(logn)
+        """
+        less, rest = RandomizedTreap._split(node, key)
+        equal, greater = RandomizedTreap._split(rest, key, inclusive=True)
+        return less, equal, greater
+
+    @staticmethod
+    def _attach(node: RandomizedTreapNode,
+                left: RandomizedTreapNode | None,
+                right: RandomizedTreapNode | None) -> RandomizedTreapNode:
+        """
+        Sets the children of node, and their parent pointers.
+        """
+        node.left, node.right = left, right
+        if left:
+            left.parent = node
+        if right:
+            right.parent = node
+        node.update_size()
+        return node
+
+    @staticmethod
+    def _union(a: RandomizedTreapNode | None,
+               b: RandomizedTreapNode | None) -> RandomizedTreapNode | None:
+        """
+        The union of two sub-treaps. The root with the smaller priority
+        stays the root, and the other treap is split around its key, then
+        each side is united with the matching subtree of the root.
+        """
+        if not a or not b:
+            return a or b
+        if b.prio < a.prio:
+            a, b = b, a
+        less, _, greater = RandomizedTreap._split3(b, a.key)
+        return RandomizedTreap._attach(a, RandomizedTreap._union(a.left, less),
+                                       RandomizedTreap._union(a.right, greater))
+
+    @staticmethod
+    def _intersection(a: RandomizedTreapNode | None,
+                      b: RandomizedTreapNode | None) -> RandomizedTreapNode | None:
+        """
+        The intersection of two sub-treaps: split b around the key of the
+        root of a, and intersect the subtrees on each side.
+        """
+        if not a or not b:
+            return None
+        if b.prio < a.prio:
+            a, b = b, a
+        less, equal, greater = RandomizedTreap._split3(b, a.key)
+        left = RandomizedTreap._intersection(a.left, less)
+        right = RandomizedTreap._intersection(a.right, greater)
+        if equal:
+            return RandomizedTreap._attach(a, left, right)
+        return RandomizedTreap._join(left, right)
+
+    @staticmethod
+    def _difference(a: RandomizedTreapNode | None,
+                    b: RandomizedTreapNode | None) -> RandomizedTreapNode | None:
+        """
+        The keys of sub-treap a which aren't in sub-treap b.
+        """
+        if not a or not b:
+            return a
+        less, equal, greater = RandomizedTreap._split3(b, a.key)
+        left = RandomizedTreap._difference(a.left, less)
+        right = RandomizedTreap._difference(a.right, greater)
+        if equal:
+            return RandomizedTreap._join(left, right)
+        return RandomizedTreap._attach(a, left, right)
+
+    def split(self, key: int) -> Tuple['RandomizedTreap', 'RandomizedTreap']:
+        """
+        Splits the treap into the keys less than key, and the rest. This
+        treap is left empty.
+
+        Time: O(logn)
+        """
+        left, right = self._split(self.root, key)
+        self.root = None
+        return self._from_root(left), self._from_root(right)
+
+    @staticmethod
+    def join(left: 'RandomizedTreap',
+             right: 'RandomizedTreap') -> 'RandomizedTreap':
+        """
+        Joins two treaps, where no key in left is greater than any key in
+        right, into a new one. Both treaps are left empty.
+
+        Time: O(logn)
+        """
+        root = RandomizedTreap._join(left.root, right.root)
+        left.root = right.root = None
+        return RandomizedTreap._from_root(root)
+
+    def union(self, other: 'RandomizedTreap') -> None:
+        """
+        Adds the keys of other to this treap, treating both as sets, and
+        leaves other empty.
+
+        Time: O(mlog(n/m)), where m <= n are the sizes of the treaps
+        """
+        self.root = self._union(self.root, other.root)
+        other.root = None
+        if self.root:
+            self.root.parent = None
+
+    def intersection(self, other: 'RandomizedTreap') -> None:
+        """
+        Keeps only the keys of this treap which are also in other,
+        treating both as sets, and leaves other empty.
+
+        Time: O(mlog(n/m)), where m <= n are the sizes of the treaps
+        """
+        self.root = self._intersection(self.root, other.root)
+        other.root = None
+        if self.root:
+            self.root.parent = None
+
+    def difference(self, other: 'RandomizedTreap') -> None:
+        """
+        Removes the keys of other from this treap, treating both as sets,
+        and leaves other empty.
+
+        Time: O(mlog(n/m)), where m <= n are the sizes of the treaps
+        """
+        self.root = self._difference(self.root, other.root)
+        other.root = None
+        if self.root:
+            self.root.parent = None
+
+    def update(self, keys: Iterable[int]) -> None:
+        """
+        Adds many keys at once, as a set union with a treap built from
+        them in sorted order.
+
+        Time: O(klogk + klog(n/k)), where k is the number of keys
+        """
+        self.union(self.from_sorted(sorted(set(keys))))
+
+    def delete_range(self, lo: int, hi: int) -> None:
+        """
+        Deletes every key in [lo, hi], by splitting them out and joining
+        what is left.
+
+        Time: O(logn)
+        """
+        less, rest = self._split(self.root, lo)
+        _, greater = self._split(rest, hi, inclusive=True)
+        self.root = self._join(less, greater)